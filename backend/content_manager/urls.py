@@ -9,4 +9,5 @@ urlpatterns = [
     path('carousel/', views.carousel_manager, name='carousel_manager'),
     path('blog/', views.blog_manager, name='blog_manager'),
     path('build/', views.build_static_content, name='build_static_content'),
+    path('jobs/<uuid:pk>/', views.job_status, name='job_status'),
 ]
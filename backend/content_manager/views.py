@@ -1,13 +1,17 @@
-from django.shortcuts import render, redirect
+from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from django.http import JsonResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 import json
 import os
 import yaml
 from datetime import datetime
 from django.conf import settings
+from core.fileutils import atomic_write
+from core.jobs import enqueue
+from core.models import Job
 
 
 @staff_member_required
@@ -29,9 +33,8 @@ def team_manager(request):
             # Ensure directory exists
             os.makedirs(os.path.dirname(team_file), exist_ok=True)
             
-            # Write YAML file
-            with open(team_file, 'w', encoding='utf-8') as f:
-                yaml.dump(team_data, f, default_flow_style=False, allow_unicode=True)
+            # Write YAML file atomically, leaving it untouched if unchanged
+            atomic_write(team_file, yaml.dump(team_data, default_flow_style=False, allow_unicode=True))
             
             return JsonResponse({'success': True, 'message': 'Team data saved successfully'})
         except Exception as e:
@@ -62,9 +65,8 @@ def carousel_manager(request):
             # Ensure directory exists
             os.makedirs(os.path.dirname(carousel_file), exist_ok=True)
             
-            # Write YAML file
-            with open(carousel_file, 'w', encoding='utf-8') as f:
-                yaml.dump(carousel_data, f, default_flow_style=False, allow_unicode=True)
+            # Write YAML file atomically, leaving it untouched if unchanged
+            atomic_write(carousel_file, yaml.dump(carousel_data, default_flow_style=False, allow_unicode=True))
             
             return JsonResponse({'success': True, 'message': 'Carousel data saved successfully'})
         except Exception as e:
@@ -116,9 +118,8 @@ def blog_manager(request):
             
             content = f"---\n{yaml.dump(frontmatter, default_flow_style=False)}---\n\n{blog_data.get('content', '')}"
             
-            # Write markdown file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write markdown file atomically, leaving it untouched if unchanged
+            atomic_write(filepath, content)
             
             return JsonResponse({'success': True, 'message': f'Blog post saved as {filename}'})
         except Exception as e:
@@ -137,22 +138,36 @@ def blog_manager(request):
 @staff_member_required
 @csrf_exempt
 def build_static_content(request):
-    """Trigger static content build"""
+    """Queue a static content build for the run_jobs worker"""
     if request.method == 'POST':
-        try:
-            # Import management commands
-            from django.core.management import call_command
-            
-            # Run import commands
-            call_command('import_markdown_blogs')
-            call_command('import_team_data')
-            call_command('import_config_data')
-            
-            # Export static content
-            call_command('export_static_content')
-            
-            return JsonResponse({'success': True, 'message': 'Static content built successfully'})
-        except Exception as e:
-            return JsonResponse({'success': False, 'error': str(e)})
-    
+        # Clicking again while a build is waiting returns the same job
+        job = enqueue('build_static_content')
+        return JsonResponse({
+            'success': True,
+            'message': 'Static content build queued',
+            'job': job_data(job),
+            'status_url': reverse('content_manager:job_status', args=[job.pk]),
+        }, status=202)
+
     return JsonResponse({'success': False, 'error': 'POST method required'})
+
+
+def job_data(job):
+    return {
+        'id': job.pk,
+        'task': job.task,
+        'status': job.status,
+        'progress': job.progress,
+        'message': job.message,
+        'attempts': job.attempts,
+        'error': job.error.strip().splitlines()[-1] if job.error else '',
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
+
+
+@staff_member_required
+def job_status(request, pk):
+    """Progress of a queued job, polled by the dashboard"""
+    job = get_object_or_404(Job, pk=pk)
+    return JsonResponse({'success': True, 'job': job_data(job)})
@@ -3,7 +3,8 @@ from django.utils.html import format_html
 from markdownx.admin import MarkdownxModelAdmin
 from .models import (
     Category, Tag, BlogPost, Event, Gallery, Image, Newsletter,
-    Contact, Submission, Internship, TeamMember, Leadership, Announcement, CarouselImage, NewsletterArchive
+    Contact, Submission, Internship, TeamMember, Leadership, Announcement, CarouselImage, NewsletterArchive, Job,
+    StagedUpload,
 )
 
 @admin.register(Category)
@@ -89,10 +90,7 @@ class GalleryAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
     inlines = [ImageInline]
     list_editable = ['published']
-
-    def image_count(self, obj):
-        return obj.images.count()
-    image_count.short_description = 'Images'
+    list_select_related = ['author']
 
 @admin.register(Image)
 class ImageAdmin(admin.ModelAdmin):
@@ -254,6 +252,28 @@ class NewsletterArchiveAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['task', 'status', 'progress', 'message', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status', 'task', 'queue']
+    readonly_fields = [
+        'task', 'queue', 'arguments', 'dedup_key', 'progress', 'message', 'log', 'error', 'attempts',
+        'started_at', 'finished_at', 'worker',
+    ]
+    fields = ['status', 'max_attempts', 'run_after'] + readonly_fields
+
+
+@admin.register(StagedUpload)
+class StagedUploadAdmin(admin.ModelAdmin):
+    """Files waiting to be stored; ones whose job failed are purged by the worker after a week"""
+    list_display = ['name', 'size', 'created_at']
+    readonly_fields = ['name', 'size', 'created_at']
+    fields = readonly_fields
+
+    def has_add_permission(self, request):
+        return False
+
+
 # Customize admin site
 admin.site.site_header = "GCADR Administration"
 admin.site.site_title = "GCADR Admin"
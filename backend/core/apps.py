@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from core import autobuild, response_cache, signals, uploads  # noqa: F401
+        from core.search import signals  # noqa: F401
@@ -0,0 +1,238 @@
+"""
+Async variants of the public read endpoints, served under ASGI.
+
+``core.urls`` routes the read endpoints here when ``settings.ASYNC_API`` is
+on (``gcadr_backend/asgi.py`` turns it on). The deploy configs serve WSGI;
+run ``uvicorn gcadr_backend.asgi:application`` to opt in.
+
+Each list and detail view wraps the DRF view of the same name and reuses its
+queryset, filters, serializer, pagination and cache settings, so the JSON is
+byte-identical; only the I/O changes. Queries go through the async ORM, so a
+slow client or query parks a coroutine instead of holding a worker thread.
+They don't run in parallel: Django sends async ORM calls to one
+thread-sensitive executor, so the sections of the aggregated endpoints are
+awaited one after another.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+from . import views
+from .conditional import aconditional_get
+from .home import FEATURED_MODELS, HOME_MODELS, abuild_home, featured_blogs, featured_events, instance_section
+from .images import apreload_variants
+from .models import Announcement, BlogPost, Category, Event, NewsletterArchive, Tag
+from .pagination import apaginate_queryset
+from .response_cache import acached_data
+from .search.backends import get_search_backend
+from .serializers import (
+    AnnouncementSerializer, BlogPostListSerializer, EventListSerializer, NewsletterArchiveSerializer
+)
+
+
+def render(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+class AsyncAPIView(View):
+    """GET-only async view with conditional GET and the response cache; subclasses implement ``get_data()``"""
+    http_method_names = ['get', 'head', 'options']
+    cache_models = ()
+    uncached_params = ()
+
+    def get_validator_querysets(self):
+        return []
+
+    async def get_data(self):
+        raise NotImplementedError
+
+    async def get(self, request, *args, **kwargs):
+        return await aconditional_get(
+            self.respond, request, self.cache_models, self.get_validator_querysets, self.uncached_params
+        )
+
+    async def respond(self, request):
+        try:
+            data = await acached_data(request, self.cache_models, self.get_data, self.uncached_params)
+        except (APIException, Http404) as exc:
+            # DRF's own handler, for the same error bodies as the sync views
+            response = exception_handler(exc, {'view': self, 'request': request})
+            return render(response.data, response.status_code)
+        return render(data)
+
+
+class AsyncGenericView(AsyncAPIView):
+    """Async twin of the DRF generic view ``view_class``"""
+    view_class = None
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.api_view = self.view_class(request=Request(request), args=args, kwargs=kwargs, format_kwarg=None)
+        self.cache_models = self.view_class.cache_models
+        self.uncached_params = self.view_class.uncached_params
+
+    def get_validator_querysets(self):
+        return self.api_view.get_validator_querysets()
+
+    def get_queryset(self):
+        return self.api_view.filter_queryset(self.api_view.get_queryset())
+
+    async def serialize(self, instances, many):
+        serializer = self.api_view.get_serializer(instances, many=many)
+        await apreload_variants(serializer, instances if many else [instances])
+        return serializer.data
+
+
+class AsyncListView(AsyncGenericView):
+    async def get_data(self):
+        api_view = self.api_view
+        queryset = self.get_queryset()
+        fast_serializer_class = getattr(api_view, 'fast_serializer_class', None)
+        if fast_serializer_class is not None:
+            # As FastListMixin.list()
+            fast_serializer = fast_serializer_class(context=api_view.get_serializer_context())
+            ordering = getattr(api_view.paginator, 'ordering', None)
+            queryset = fast_serializer.values(queryset, *([ordering.lstrip('-')] if ordering else []))
+
+        page = None
+        if api_view.paginator is not None:
+            page = await apaginate_queryset(api_view.paginator, queryset, api_view.request)
+        rows = page if page is not None else [row async for row in queryset]
+
+        if fast_serializer_class is not None:
+            data = await fast_serializer.aserialize(rows)
+        else:
+            data = await self.serialize(rows, many=True)
+        return api_view.get_paginated_response(data).data if page is not None else data
+
+
+class AsyncRetrieveView(AsyncGenericView):
+    async def get_data(self):
+        api_view = self.api_view
+        queryset = self.get_queryset()
+        lookup_url_kwarg = api_view.lookup_url_kwarg or api_view.lookup_field
+        try:
+            instance = await queryset.aget(**{api_view.lookup_field: api_view.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        return await self.serialize(instance, many=False)
+
+
+class BlogPostListView(AsyncListView):
+    view_class = views.BlogPostListView
+
+
+class BlogPostDetailView(AsyncRetrieveView):
+    view_class = views.BlogPostDetailView
+
+
+class EventListView(AsyncListView):
+    view_class = views.EventListView
+
+
+class EventDetailView(AsyncRetrieveView):
+    view_class = views.EventDetailView
+
+
+class GalleryListView(AsyncListView):
+    view_class = views.GalleryListView
+
+
+class GalleryDetailView(AsyncRetrieveView):
+    view_class = views.GalleryDetailView
+
+
+class TeamMemberListView(AsyncListView):
+    view_class = views.TeamMemberListView
+
+
+class LeadershipListView(AsyncListView):
+    view_class = views.LeadershipListView
+
+
+class AnnouncementListView(AsyncListView):
+    view_class = views.AnnouncementListView
+
+
+class CarouselImageListView(AsyncListView):
+    view_class = views.CarouselImageListView
+
+
+class NewsletterArchiveListView(AsyncListView):
+    view_class = views.NewsletterArchiveListView
+
+
+class CategoryListView(AsyncListView):
+    view_class = views.CategoryListView
+
+
+class TagListView(AsyncListView):
+    view_class = views.TagListView
+
+
+class FeaturedContentView(AsyncAPIView):
+    cache_models = FEATURED_MODELS
+
+    def get_validator_querysets(self):
+        return views.featured_querysets()
+
+    async def get_data(self):
+        return {
+            'featured_blogs': await instance_section(BlogPostListSerializer, featured_blogs(), {}),
+            'featured_events': await instance_section(EventListSerializer, featured_events(), {}),
+        }
+
+
+class HomeView(AsyncAPIView):
+    cache_models = HOME_MODELS
+
+    def get_validator_querysets(self):
+        return views.home_querysets()
+
+    async def get_data(self):
+        return await abuild_home({'request': Request(self.request)})
+
+
+async def ranked(queryset, object_ids):
+    """``views.ranked`` on the async ORM"""
+    objects = await queryset.ain_bulk(object_ids)
+    return [objects[pk] for pk in object_ids if pk in objects]
+
+
+class SearchView(View):
+    """Not cached, like the sync view: results follow the search index, not the models"""
+    http_method_names = ['get', 'head', 'options']
+    # (response key, queryset of visible rows, document type, serializer)
+    sections = [
+        ('blogs', lambda: BlogPost.objects.filter(published=True).select_related('author', 'category')
+            .prefetch_related('tags'), 'blog', BlogPostListSerializer),
+        ('events', lambda: Event.objects.filter(published=True).select_related('author'), 'event', EventListSerializer),
+        ('announcements', lambda: Announcement.objects.filter(is_active=True), 'announcement', AnnouncementSerializer),
+        ('newsletters', lambda: NewsletterArchive.objects.all(), 'newsletter', NewsletterArchiveSerializer),
+    ]
+
+    async def get(self, request):
+        query = request.GET.get('q', '')
+        if not query:
+            return render({'results': []})
+
+        search = sync_to_async(get_search_backend().search)
+        results = {}
+        for key, queryset, document_type, serializer_class in self.sections:
+            results[key] = await self.section(queryset(), await search(query, document_type), serializer_class)
+        return render(results)
+
+    async def section(self, queryset, object_ids, serializer_class):
+        instances = await ranked(queryset, object_ids)
+        serializer = serializer_class(instances, many=True)
+        await apreload_variants(serializer, instances)
+        return serializer.data
+
+
+featured_content = FeaturedContentView.as_view()
+home = HomeView.as_view()
+search = SearchView.as_view()
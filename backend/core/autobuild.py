@@ -0,0 +1,96 @@
+"""
+Automatic static rebuilds after content edits.
+
+Saving or deleting a row that feeds the static export marks its model dirty.
+Dirty models are collected on a single pending ``rebuild_static_content``
+job whose start is pushed back on every edit, so a burst of admin changes
+ends in one incremental export of just the affected files, run by the
+``run_jobs`` worker once edits have been quiet for
+``settings.AUTO_REBUILD_DELAY`` seconds (but never later than
+``AUTO_REBUILD_MAX_DELAY`` after the first edit).
+"""
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+from .jobs import dedup_key, task
+from .management.commands.export_static_content import EXPORTS
+from .models import BlogPost, Job, Tag
+
+REBUILD_TASK = 'rebuild_static_content'
+
+# Every model some export reads from
+WATCHED_MODELS = {model for _name, _method, models in EXPORTS for model in models}
+
+_state = threading.local()
+
+
+@contextmanager
+def paused():
+    """Don't schedule rebuilds for changes made inside the block (it exports itself)"""
+    previous = getattr(_state, 'paused', False)
+    _state.paused = True
+    try:
+        yield
+    finally:
+        _state.paused = previous
+
+
+def mark_dirty(*models):
+    """Schedule a rebuild of the exports fed by ``models`` once the transaction commits"""
+    if not settings.AUTO_REBUILD_STATIC_CONTENT or getattr(_state, 'paused', False):
+        return
+    labels = {model._meta.label_lower for model in models}
+    transaction.on_commit(lambda: schedule_rebuild(labels))
+
+
+def schedule_rebuild(labels):
+    """Add ``labels`` to the pending rebuild job, or queue one; returns the job"""
+    key = dedup_key(REBUILD_TASK, {})
+    now = timezone.now()
+    run_after = now + timedelta(seconds=settings.AUTO_REBUILD_DELAY)
+    with transaction.atomic():
+        job = Job.objects.select_for_update().filter(dedup_key=key, status='pending').first()
+        if job is None:
+            try:
+                with transaction.atomic():
+                    return Job.objects.create(
+                        task=REBUILD_TASK, arguments={'models': sorted(labels)}, dedup_key=key, run_after=run_after
+                    )
+            except IntegrityError:
+                # Another process queued it first; merge into theirs
+                job = Job.objects.select_for_update().get(dedup_key=key, status='pending')
+
+        job.arguments = {'models': sorted(set(job.arguments.get('models', [])) | set(labels))}
+        # Debounce, but keep a steady stream of edits from postponing it forever
+        deadline = job.created_at + timedelta(seconds=settings.AUTO_REBUILD_MAX_DELAY)
+        job.run_after = max(job.run_after, min(run_after, deadline))
+        job.save(update_fields=['arguments', 'run_after', 'updated_at'])
+        return job
+
+
+@task(REBUILD_TASK)
+def rebuild_static_content(job, models):
+    job.report(10, f'Exporting changes to {", ".join(models)}')
+    job.call_command('export_static_content', incremental=True, changed_models=models)
+
+
+# Signal handlers
+
+def model_changed(sender, raw=False, **kwargs):
+    if not raw:
+        mark_dirty(sender)
+
+
+def blog_tags_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        mark_dirty(BlogPost, Tag)
+
+
+for model in WATCHED_MODELS:
+    post_save.connect(model_changed, sender=model, dispatch_uid=f'autobuild_save_{model.__name__}')
+    post_delete.connect(model_changed, sender=model, dispatch_uid=f'autobuild_delete_{model.__name__}')
+m2m_changed.connect(blog_tags_changed, sender=BlogPost.tags.through, dispatch_uid='autobuild_blog_tags')
@@ -0,0 +1,202 @@
+"""
+Conditional GET (ETag / 304) for the public read endpoints.
+
+Validators come from one aggregate over the rows a response is built from:
+the newest ``updated_at`` and the row count, combined with the query
+parameters and the response cache generations of the related models. A
+matching ``If-None-Match`` is answered with 304 before anything is
+serialized. There is no ``Last-Modified``: the newest ``updated_at`` doesn't
+move when a row is deleted or a related row renamed, so ``If-Modified-Since``
+would confirm stale copies.
+
+Generations are only comparable across processes with a shared cache
+(``settings.SHARED_CACHE``). Without one every process seeds its own, so
+they are left out of the ETag and the related models are checked in the
+database instead, one query each.
+"""
+import functools
+import hashlib
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from .response_cache import aresponse_cache_key, cache_timeout, get_cache, make_cache_key, response_cache_key
+
+
+def compute_validators(querysets, models=()):
+    """Digest of the given querysets, one query each, and of the rows of ``models``"""
+    parts = [queryset_version(queryset) for queryset in querysets]
+    return combine_validators(parts + [model_version(model) for model in dependencies(models)])
+
+
+async def acompute_validators(querysets, models=()):
+    """``compute_validators`` on the async ORM"""
+    parts = [await aqueryset_version(queryset) for queryset in querysets]
+    return combine_validators(parts + [await amodel_version(model) for model in dependencies(models)])
+
+
+def queryset_version(queryset):
+    """
+    The newest ``updated_at`` and the count of ``queryset``; a sliced one
+    (a keyset page) is short, so its ids and timestamps are used as they are
+    """
+    if queryset.query.is_sliced:
+        return list(queryset.values_list('pk', 'updated_at'))
+    return queryset.aggregate(newest=Max('updated_at'), count=Count('pk'))
+
+
+async def aqueryset_version(queryset):
+    if queryset.query.is_sliced:
+        return [row async for row in queryset.values_list('pk', 'updated_at')]
+    return await queryset.aaggregate(newest=Max('updated_at'), count=Count('pk'))
+
+
+def combine_validators(parts):
+    return '|'.join(str(part) for part in parts)
+
+
+def dependencies(models):
+    """``models`` and their many-to-many tables, whose changes bump a generation too"""
+    found = {}
+    for model in models:
+        found[model] = None
+        for field in model._meta.local_many_to_many:
+            if field.remote_field.through._meta.auto_created:
+                found[field.remote_field.through] = None
+    return list(found)
+
+
+def version_fields(model):
+    # Logging in only touches last_login, which no endpoint exposes
+    return [field.attname for field in model._meta.concrete_fields if field.attname not in ('password', 'last_login')]
+
+
+def model_version(model):
+    """
+    Something that changes whenever a row of ``model`` is added, edited or
+    deleted: the newest ``updated_at`` and the count, for many-to-many
+    tables (rows are only inserted and deleted) the highest id and the
+    count, otherwise a hash of the rows
+    """
+    manager = model._default_manager.order_by()
+    if model._meta.auto_created:
+        return manager.aggregate(newest=Max('pk'), count=Count('pk'))
+    if 'updated_at' in {field.name for field in model._meta.concrete_fields}:
+        return manager.aggregate(newest=Max('updated_at'), count=Count('pk'))
+    rows = manager.order_by('pk').values_list(*version_fields(model))
+    return hashlib.md5(str(list(rows)).encode()).hexdigest()
+
+
+async def amodel_version(model):
+    """``model_version`` on the async ORM"""
+    manager = model._default_manager.order_by()
+    if model._meta.auto_created:
+        return await manager.aaggregate(newest=Max('pk'), count=Count('pk'))
+    if 'updated_at' in {field.name for field in model._meta.concrete_fields}:
+        return await manager.aaggregate(newest=Max('updated_at'), count=Count('pk'))
+    rows = manager.order_by('pk').values_list(*version_fields(model))
+    return hashlib.md5(str([row async for row in rows]).encode()).hexdigest()
+
+
+def get_validators(request, models, get_querysets, uncached_params=()):
+    if not settings.SHARED_CACHE:
+        return make_etag(make_cache_key(request, []), compute_validators(get_querysets(), models))
+    key = response_cache_key(request, models)
+    timeout = cache_timeout(request, uncached_params)
+    if not timeout:
+        digest = compute_validators(get_querysets())
+    else:
+        # Stored next to the response, so it is recomputed whenever a
+        # generation changes and repeat requests cost no queries at all
+        cache = get_cache()
+        digest = cache.get(f'{key}:digest')
+        if digest is None:
+            digest = compute_validators(get_querysets())
+            cache.set(f'{key}:digest', digest, timeout)
+    return make_etag(key, digest)
+
+
+async def aget_validators(request, models, get_querysets, uncached_params=()):
+    if not settings.SHARED_CACHE:
+        return make_etag(make_cache_key(request, []), await acompute_validators(get_querysets(), models))
+    key = await aresponse_cache_key(request, models)
+    timeout = cache_timeout(request, uncached_params)
+    cache = get_cache()
+    digest = await cache.aget(f'{key}:digest') if timeout else None
+    if digest is None:
+        digest = await acompute_validators(get_querysets())
+        if timeout:
+            await cache.aset(f'{key}:digest', digest, timeout)
+    return make_etag(key, digest)
+
+
+def make_etag(key, digest):
+    """The ETag for a response; the cache key covers the path, query parameters and generations"""
+    return '"%s"' % hashlib.md5(f'{key}|{digest}'.encode()).hexdigest()
+
+
+def add_cache_headers(response, etag):
+    response['ETag'] = etag
+    patch_cache_control(
+        response, public=True, max_age=settings.API_CACHE_MAX_AGE,
+        stale_while_revalidate=settings.API_STALE_WHILE_REVALIDATE,
+    )
+    return response
+
+
+def conditional_get(view_func, request, models, get_querysets, uncached_params=()):
+    """Answer with 304 when the client's copy is current, else call ``view_func``"""
+    etag = get_validators(request, models, get_querysets, uncached_params)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = view_func(request)
+        if response.status_code != 200:
+            return response
+    return add_cache_headers(response, etag)
+
+
+async def aconditional_get(view_func, request, models, get_querysets, uncached_params=()):
+    """``conditional_get`` for async views; ``view_func`` is awaited"""
+    etag = await aget_validators(request, models, get_querysets, uncached_params)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = await view_func(request)
+        if response.status_code != 200:
+            return response
+    return add_cache_headers(response, etag)
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for generic views, validated against their filtered
+    queryset, or only the requested page when the paginator can narrow it
+    """
+
+    def get_validator_querysets(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            return [queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})]
+        if hasattr(self.paginator, 'get_validator_queryset'):
+            queryset = self.paginator.get_validator_queryset(queryset, self.request)
+        return [queryset]
+
+    def get(self, request, *args, **kwargs):
+        parent = super().get
+        return conditional_get(
+            lambda request: parent(request, *args, **kwargs), request,
+            self.cache_models, self.get_validator_querysets, getattr(self, 'uncached_params', ()),
+        )
+
+
+def conditional_response(get_querysets, *models):
+    """Decorator for ``api_view`` functions; ``get_querysets()`` lists the rows used"""
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view_func(request, *args, **kwargs)
+            return conditional_get(
+                lambda request: view_func(request, *args, **kwargs), request, models, get_querysets
+            )
+        return wrapper
+    return decorator
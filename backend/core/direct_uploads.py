@@ -0,0 +1,215 @@
+"""
+Direct-to-storage uploads for the contact and internship forms.
+
+The browser asks ``presign_upload`` where to put a file, POSTs it there
+itself as a multipart form (the returned ``fields``, then the file as
+``file``), then posts the form to a ``*_finalize`` endpoint with the
+returned token in place of the file. Django signs the key and, on
+finalize, checks the stored object's size and leading bytes; the file
+itself never passes through it.
+
+With S3 media storage the upload URL is a presigned POST whose policy
+caps the size at ``UPLOAD_MAX_SIZE``. Otherwise ``LocalUploadBackend``
+points the browser at ``local_upload``, which takes the same POST and
+writes to the default storage, so the whole flow runs against the
+filesystem in development and tests.
+
+Presigning is open to anyone, so it is rate limited
+(``DIRECT_UPLOAD_RATE``), and files uploaded but never finalized are
+removed by ``sweep_unfinalized_uploads``, which the job worker runs every
+hour.
+"""
+import os
+import posixpath
+import re
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.throttling import UserRateThrottle
+from .models import Contact, Internship
+from .uploads import ATTACHMENT_TYPES, DOCUMENT_TYPES, file_type, megabytes
+
+SALT = 'core.direct_uploads'
+
+# Seconds between presigning an upload and finalizing the form with it
+FINALIZE_WITHIN = 24 * 60 * 60
+
+# Upload target: (model, file field, accepted types)
+TARGETS = {
+    'internship.cv': (Internship, 'cv', DOCUMENT_TYPES),
+    'internship.writing_sample': (Internship, 'writing_sample', DOCUMENT_TYPES),
+    'contact.attachment': (Contact, 'attachment', ATTACHMENT_TYPES),
+}
+
+
+class LocalUploadBackend:
+    """Uploads go to this app's ``local_upload`` view, for storages without presigned URLs"""
+
+    def __init__(self, storage=None):
+        self.storage = storage or default_storage
+
+    def upload_request(self, request, token, key, content_type):
+        url = request.build_absolute_uri(reverse('local-upload', args=[token]))
+        return {'method': 'POST', 'url': url, 'fields': {}}
+
+    def read_head(self, key, length=16):
+        with self.storage.open(key, 'rb') as f:
+            return f.read(length)
+
+
+class S3UploadBackend:
+    """Presigned POSTs to the S3 bucket behind ``storages.backends.s3boto3.S3Boto3Storage``"""
+
+    def __init__(self, storage=None):
+        self.storage = storage or default_storage
+        self.client = self.storage.connection.meta.client
+
+    def object_key(self, key):
+        return posixpath.join(self.storage.location, key) if self.storage.location else key
+
+    def upload_request(self, request, token, key, content_type):
+        # A presigned PUT can't limit the size; a POST policy can
+        post = self.client.generate_presigned_post(
+            self.storage.bucket_name, self.object_key(key),
+            Fields={'Content-Type': content_type},
+            Conditions=[{'Content-Type': content_type}, ['content-length-range', 1, settings.UPLOAD_MAX_SIZE]],
+            ExpiresIn=settings.DIRECT_UPLOAD_EXPIRY,
+        )
+        return {'method': 'POST', 'url': post['url'], 'fields': post['fields']}
+
+    def read_head(self, key, length=16):
+        # A ranged GET; storage.open() would download the whole object
+        response = self.client.get_object(
+            Bucket=self.storage.bucket_name, Key=self.object_key(key), Range=f'bytes=0-{length - 1}'
+        )
+        return response['Body'].read()
+
+
+def get_upload_backend():
+    """
+    The backend named by ``settings.DIRECT_UPLOAD_BACKEND`` (a dotted path),
+    or the one matching the default storage.
+    """
+    path = getattr(settings, 'DIRECT_UPLOAD_BACKEND', '')
+    if path:
+        return import_string(path)()
+    if hasattr(default_storage, 'bucket_name'):
+        return S3UploadBackend()
+    return LocalUploadBackend()
+
+
+def upload_directory(target):
+    """The directory a target's uploads are stored under, one subdirectory per upload"""
+    model, field_name, _kinds = TARGETS[target]
+    return posixpath.dirname(model._meta.get_field(field_name).generate_filename(None, 'upload'))
+
+
+def new_key(target, filename):
+    """A fresh storage key in the target field's upload directory"""
+    model, field_name, _kinds = TARGETS[target]
+    field = model._meta.get_field(field_name)
+    return field.generate_filename(None, f'{uuid.uuid4().hex}/{os.path.basename(filename) or "upload"}')
+
+
+def presign(request, target, filename, content_type, size):
+    key = new_key(target, filename)
+    token = signing.dumps({'target': target, 'key': key}, salt=SALT)
+    return {
+        'token': token,
+        'key': key,
+        'upload': get_upload_backend().upload_request(request, token, key, content_type),
+        'expires_in': settings.DIRECT_UPLOAD_EXPIRY,
+    }
+
+
+def load_token(token, max_age=FINALIZE_WITHIN):
+    """``{'target', 'key'}`` from a token; raises ``signing.BadSignature`` when forged or expired"""
+    return signing.loads(token, salt=SALT, max_age=max_age)
+
+
+def sweep_unfinalized_uploads(older_than=None):
+    """
+    Delete uploaded files no form was finalized with; returns how many.
+    Only files older than ``older_than`` go, by default the token lifetime,
+    after which they can't be finalized any more.
+    """
+    if older_than is None:
+        older_than = timedelta(seconds=FINALIZE_WITHIN)
+    cutoff = timezone.now() - older_than
+    removed = 0
+    for target, (model, field_name, _kinds) in TARGETS.items():
+        directory = upload_directory(target)
+        try:
+            subdirectories = default_storage.listdir(directory)[0]
+        except FileNotFoundError:
+            continue
+        # Files saved by the form endpoints and the admin sit directly in the directory
+        for subdirectory in filter(re.compile('[0-9a-f]{32}').fullmatch, subdirectories):
+            for filename in default_storage.listdir(posixpath.join(directory, subdirectory))[1]:
+                key = posixpath.join(directory, subdirectory, filename)
+                if default_storage.get_modified_time(key) >= cutoff:
+                    continue
+                if model.objects.filter(**{field_name: key}).exists():
+                    continue
+                default_storage.delete(key)
+                removed += 1
+    return removed
+
+
+class PresignRateThrottle(UserRateThrottle):
+    """``DIRECT_UPLOAD_RATE`` presigned uploads per user, or per client address for visitors"""
+    scope = 'presign_upload'
+
+    def get_rate(self):
+        return settings.DIRECT_UPLOAD_RATE
+
+
+class PresignUploadSerializer(serializers.Serializer):
+    target = serializers.ChoiceField(choices=sorted(TARGETS))
+    filename = serializers.CharField(max_length=100)
+    content_type = serializers.CharField(max_length=100, default='application/octet-stream')
+    size = serializers.IntegerField(min_value=1)
+
+    def validate_size(self, size):
+        if size > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f'File is larger than the {megabytes(settings.UPLOAD_MAX_SIZE)} limit.')
+        return size
+
+
+class UploadTokenField(serializers.CharField):
+    """A token from ``presign_upload`` whose file is in storage; validates to the storage key"""
+
+    def __init__(self, target, **kwargs):
+        self.target = target
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        token = super().to_internal_value(data)
+        try:
+            payload = load_token(token)
+        except signing.BadSignature:
+            raise serializers.ValidationError('Invalid or expired upload token.')
+        if payload['target'] != self.target:
+            raise serializers.ValidationError('Upload token is for another field.')
+
+        key = payload['key']
+        model, field_name, kinds = TARGETS[self.target]
+        if not default_storage.exists(key):
+            raise serializers.ValidationError('File has not been uploaded yet.')
+        if model.objects.filter(**{field_name: key}).exists():
+            raise serializers.ValidationError('File has already been submitted.')
+        # Storage can't check the type, and backends named in settings may not
+        # cap the size, so anything else is removed here
+        if default_storage.size(key) > settings.UPLOAD_MAX_SIZE:
+            default_storage.delete(key)
+            raise serializers.ValidationError(f'File is larger than the {megabytes(settings.UPLOAD_MAX_SIZE)} limit.')
+        if file_type(get_upload_backend().read_head(key)) not in kinds:
+            default_storage.delete(key)
+            raise serializers.ValidationError(f'Unsupported file type. Upload {", ".join(kinds)}.')
+        return key
@@ -0,0 +1,204 @@
+"""
+Read-only fast paths for the hot list serializers.
+
+Each ``FastSerializer`` mirrors a DRF ``ModelSerializer`` and produces the
+same data, but reads plain ``values()`` rows instead of model instances and
+walks a field plan compiled once per class, instead of going through DRF's
+per-row field lookup. Field conversion reuses the DRF fields' own
+``to_representation`` so the rendered JSON is byte-identical; only the
+computed fields (author names, choice labels, nested tags) are
+re-implemented here.
+"""
+from operator import itemgetter
+from rest_framework import serializers
+from rest_framework.response import Response
+from .images import ImageVariantsField, get_lookup, variants_data
+from .models import Tag, TeamMember
+from .serializers import BlogPostListSerializer, EventListSerializer, TagSerializer, TeamMemberSerializer
+
+# Returned by a computed getter to leave the field out, as DRF does when a
+# read-only source cannot be resolved (e.g. ``category.name`` without a category)
+SKIP = object()
+
+
+def author_name(fallback):
+    """``get_author_name()`` from the joined author columns"""
+    def getter(row):
+        if row['author_id'] is not None:
+            full_name = f"{row['author__first_name']} {row['author__last_name']}".strip()
+            return full_name or row['author__username']
+        return row['author_name'] or fallback
+    return getter
+
+
+AUTHOR_LOOKUPS = ('author_id', 'author__first_name', 'author__last_name', 'author__username', 'author_name')
+
+
+class FastSerializer:
+    serializer_class = None
+    # Output field -> (values() lookups it needs, getter(row) returning the final value)
+    computed = {}
+
+    def __init__(self, context=None):
+        self.context = context or {}
+
+    @classmethod
+    def compile(cls):
+        """Return ``(lookups, plan)``, built once per class"""
+        if '_compiled' in cls.__dict__:
+            return cls._compiled
+
+        lookups = ['id']
+        plan = []
+        for name, field in cls.serializer_class().fields.items():
+            if name in cls.computed:
+                names, getter = cls.computed[name]
+                lookups.extend(names)
+                plan.append((name, getter, None))
+                continue
+            lookups.append(field.source)
+            if isinstance(field, (serializers.FileField, ImageVariantsField)):
+                # Needs the storage and the request, bound per call in serialize()
+                plan.append((name, itemgetter(field.source), field))
+            else:
+                plan.append((name, itemgetter(field.source), field.to_representation))
+
+        cls._compiled = (list(dict.fromkeys(lookups)), plan)
+        return cls._compiled
+
+    def values(self, queryset, *extra):
+        lookups, plan = self.compile()
+        return queryset.prefetch_related(None).values(*dict.fromkeys([*lookups, *extra]))
+
+    def bind(self, field, rows):
+        """Converter for a file or image variants field, for this request and these rows"""
+        storage = field.parent.Meta.model._meta.get_field(field.source).storage
+        request = self.context.get('request')
+
+        if isinstance(field, ImageVariantsField):
+            lookup = get_lookup(self.context)
+            lookup.load(row[field.source] for row in rows)
+            return lambda name: variants_data(lookup.get(name), storage, request) if name else None
+
+        def to_representation(name):
+            if not name:
+                return None
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+        return to_representation
+
+    def prefetch(self, rows):
+        """Attach related rows needed by computed fields"""
+
+    async def aprefetch(self, rows):
+        """``prefetch()`` for ``aserialize()``, on the async ORM"""
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.prefetch(rows)
+        return self.convert(rows)
+
+    async def aserialize(self, rows):
+        """``serialize()`` for async views: every query is awaited before converting"""
+        rows = list(rows)
+        await self.aprefetch(rows)
+        lookups, plan = self.compile()
+        await get_lookup(self.context).aload(
+            row[convert.source] for name, getter, convert in plan
+            if isinstance(convert, ImageVariantsField) for row in rows
+        )
+        return self.convert(rows)
+
+    def convert(self, rows):
+        lookups, plan = self.compile()
+        plan = [
+            (name, getter, self.bind(convert, rows) if isinstance(convert, serializers.Field) else convert)
+            for name, getter, convert in plan
+        ]
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, getter, convert in plan:
+                value = getter(row)
+                if value is SKIP:
+                    continue
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+class TagFastSerializer(FastSerializer):
+    serializer_class = TagSerializer
+
+
+def category_name(row):
+    return SKIP if row['category_id'] is None else str(row['category__name'])
+
+
+class BlogPostListFastSerializer(FastSerializer):
+    serializer_class = BlogPostListSerializer
+    computed = {
+        'author_display_name': (AUTHOR_LOOKUPS, author_name('Anonymous')),
+        'category_name': (('category_id', 'category__name'), category_name),
+        'tags': ((), itemgetter('tags')),
+    }
+
+    def tag_rows(self, rows):
+        # Same join as prefetch_related('tags'), so tags come back in the same order
+        lookups, plan = TagFastSerializer.compile()
+        return Tag.objects.filter(blogpost__in=[row['id'] for row in rows]).values('blogpost', *lookups)
+
+    def prefetch(self, rows):
+        if rows:
+            self.attach_tags(rows, list(self.tag_rows(rows)))
+
+    async def aprefetch(self, rows):
+        if rows:
+            self.attach_tags(rows, [tag_row async for tag_row in self.tag_rows(rows)])
+
+    def attach_tags(self, rows, tag_rows):
+        tags = TagFastSerializer(self.context)
+        by_post = {row['id']: [] for row in rows}
+        for tag_row, data in zip(tag_rows, tags.serialize(tag_rows)):
+            by_post[tag_row['blogpost']].append(data)
+        for row in rows:
+            row['tags'] = by_post[row['id']]
+
+
+class EventListFastSerializer(FastSerializer):
+    serializer_class = EventListSerializer
+    computed = {
+        'author_display_name': (AUTHOR_LOOKUPS, author_name('GCADR')),
+    }
+
+
+ROLE_LABELS = dict(TeamMember.ROLES)
+
+
+def role_display(row):
+    return str(ROLE_LABELS.get(row['role'], row['role']))
+
+
+class TeamMemberFastSerializer(FastSerializer):
+    serializer_class = TeamMemberSerializer
+    computed = {
+        'role_display': (('role',), role_display),
+    }
+
+
+class FastListMixin:
+    """Serve ``list()`` through ``fast_serializer_class``; other actions keep the DRF serializer"""
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.fast_serializer_class(context=self.get_serializer_context())
+        # Keyset pagination reads its sort field from the rows
+        ordering = getattr(self.paginator, 'ordering', None)
+        extra = [ordering.lstrip('-')] if ordering else []
+        queryset = serializer.values(self.filter_queryset(self.get_queryset()), *extra)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
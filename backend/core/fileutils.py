@@ -0,0 +1,95 @@
+import filecmp
+import os
+import stat
+import tempfile
+
+
+def current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Mode open() gives a new file; mkstemp() always creates 0600
+NEW_FILE_MODE = 0o666 & ~current_umask()
+
+
+def make_temp_file(path):
+    """
+    Create a temporary file in the same directory as ``path`` so it can be
+    renamed over it atomically. Returns ``(fd, tmp_path)``.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    return tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+
+
+def fsync_directory(directory):
+    """Persist a rename by fsyncing its directory (no-op where unsupported)"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def replace_file(tmp_path, path):
+    """
+    Move a finished, fsynced temp file over ``path`` atomically, keeping the
+    mode of the file it replaces (or the umask default for a new one) so
+    other users, e.g. the web server, can still read it
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = NEW_FILE_MODE
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+    fsync_directory(os.path.dirname(path))
+
+
+def has_contents(path, data):
+    """True if the file at ``path`` already holds exactly ``data`` (bytes)"""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def same_file_contents(path, other_path):
+    """True if both files exist and hold identical bytes"""
+    try:
+        return filecmp.cmp(path, other_path, shallow=False)
+    except OSError:
+        return False
+
+
+def atomic_write(path, data):
+    """
+    Write ``data`` (bytes or str) to ``path`` so readers only ever see the
+    old or the new file: write a temp file in the same directory, fsync it
+    and rename it into place. Files that already hold the same bytes are
+    left untouched. Returns True if the file was written.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if has_contents(path, data):
+        return False
+
+    fd, tmp_path = make_temp_file(path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        replace_file(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
@@ -0,0 +1,79 @@
+"""
+Homepage bundle: every above-the-fold section in one payload.
+
+Served by ``/api/home/`` and written to ``home.json`` by
+``export_static_content``, so the homepage needs a single fetch instead of
+one per section.
+"""
+from django.contrib.auth.models import User
+from .fast_serializers import BlogPostListFastSerializer, EventListFastSerializer
+from .images import apreload_variants
+from .models import Announcement, BlogPost, CarouselImage, Category, Event, ImageDerivative, Leadership, Tag
+from .serializers import AnnouncementSerializer, CarouselImageSerializer, LeadershipSerializer
+
+FEATURED_LIMIT = 3
+# The homepage announcements strip; featured ones sort first
+ANNOUNCEMENT_LIMIT = 6
+
+HOME_MODELS = (CarouselImage, Announcement, BlogPost, Category, Tag, Event, Leadership, User, ImageDerivative)
+FEATURED_MODELS = (BlogPost, Category, Tag, Event, User, ImageDerivative)
+
+
+def featured_blogs():
+    return BlogPost.objects.filter(published=True, featured=True).select_related(
+        'author', 'category'
+    ).prefetch_related('tags')[:FEATURED_LIMIT]
+
+
+def featured_events():
+    return Event.objects.filter(published=True, featured=True).select_related('author')[:FEATURED_LIMIT]
+
+
+def home_querysets():
+    """The rows behind each section, in payload order"""
+    return [
+        CarouselImage.objects.filter(is_active=True),
+        Announcement.objects.filter(is_active=True)[:ANNOUNCEMENT_LIMIT],
+        featured_blogs(),
+        featured_events(),
+        Leadership.objects.all(),
+    ]
+
+
+def build_home(context=None):
+    """Assemble the bundle: one query per section, plus one for the blog tags"""
+    context = context or {}
+    carousel, announcements, blogs, events, leadership = home_querysets()
+    blog_serializer = BlogPostListFastSerializer(context)
+    event_serializer = EventListFastSerializer(context)
+    return {
+        'carousel': CarouselImageSerializer(carousel, many=True, context=context).data,
+        'announcements': AnnouncementSerializer(announcements, many=True, context=context).data,
+        'featured_blogs': blog_serializer.serialize(blog_serializer.values(blogs)),
+        'featured_events': event_serializer.serialize(event_serializer.values(events)),
+        'leadership': LeadershipSerializer(leadership, many=True, context=context).data,
+    }
+
+
+async def fast_section(serializer, queryset):
+    return await serializer.aserialize([row async for row in serializer.values(queryset).aiterator()])
+
+
+async def instance_section(serializer_class, queryset, context):
+    instances = [instance async for instance in queryset]
+    serializer = serializer_class(instances, many=True, context=context)
+    await apreload_variants(serializer, instances)
+    return serializer.data
+
+
+async def abuild_home(context=None):
+    """``build_home`` on the async ORM; the sections still run one after another"""
+    context = context or {}
+    carousel, announcements, blogs, events, leadership = home_querysets()
+    return {
+        'carousel': await instance_section(CarouselImageSerializer, carousel, context),
+        'announcements': await instance_section(AnnouncementSerializer, announcements, context),
+        'featured_blogs': await fast_section(BlogPostListFastSerializer(context), blogs),
+        'featured_events': await fast_section(EventListFastSerializer(context), events),
+        'leadership': await instance_section(LeadershipSerializer, leadership, context),
+    }
@@ -0,0 +1,221 @@
+"""
+Responsive image derivatives.
+
+Every uploaded image is re-encoded at the widths in
+``settings.IMAGE_DERIVATIVE_WIDTHS`` (never upscaled) as WebP plus a JPEG
+fallback, stored next to the original as ``<name>.<width>w.webp|jpg``,
+together with a tiny blurred placeholder. An ``ImageDerivative`` row records
+what was generated, and ``ImageVariantsField`` turns it into ``srcset``
+strings for the serializers and the static export.
+"""
+import base64
+import io
+import os
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models.manager import BaseManager
+from PIL import Image as PILImage, ImageFilter, ImageOps
+from rest_framework import serializers
+from .models import (
+    BlogPost, Event, Gallery, Image, CarouselImage, TeamMember, Leadership, ImageDerivative
+)
+
+# Image fields that get derivatives, by model
+RESPONSIVE_IMAGE_FIELDS = {
+    BlogPost: ['featured_image'],
+    Event: ['featured_image'],
+    Gallery: ['cover_image'],
+    Image: ['image'],
+    CarouselImage: ['image'],
+    TeamMember: ['image'],
+    Leadership: ['image'],
+}
+
+# (extension, Pillow format, save options); browsers pick the first type they support
+FORMATS = [
+    ('webp', 'WEBP', {'quality': 80, 'method': 6}),
+    ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+]
+
+PLACEHOLDER_SIZE = 16
+
+
+def derivative_name(source, width, extension):
+    root, _ = os.path.splitext(source)
+    return f'{root}.{width}w.{extension}'
+
+
+def flatten(image):
+    """RGB copy of ``image``, with transparency composited onto white"""
+    if image.mode == 'RGB':
+        return image
+    image = image.convert('RGBA')
+    background = PILImage.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def encode(image, pil_format, options):
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def placeholder_for(image):
+    thumb = flatten(image).copy()
+    thumb.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    thumb = thumb.filter(ImageFilter.GaussianBlur(1))
+    data = encode(thumb, 'JPEG', {'quality': 50})
+    return 'data:image/jpeg;base64,' + base64.b64encode(data).decode('ascii')
+
+
+def generate_derivatives(fieldfile, force=False):
+    """Create the variants of ``fieldfile`` unless they exist; returns the ``ImageDerivative``"""
+    source = fieldfile.name
+    if not source:
+        return None
+    if not force:
+        existing = ImageDerivative.objects.filter(source=source).first()
+        if existing:
+            return existing
+
+    storage = fieldfile.storage
+    with storage.open(source, 'rb') as f:
+        image = PILImage.open(f)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if image.mode in ('LA', 'PA', 'P') else 'RGB')
+
+    width, height = image.size
+    widths = sorted({min(bucket, width) for bucket in settings.IMAGE_DERIVATIVE_WIDTHS})
+    for variant_width in widths:
+        resized = image
+        if variant_width != width:
+            resized = image.resize((variant_width, max(1, round(height * variant_width / width))), PILImage.LANCZOS)
+        for extension, pil_format, options in FORMATS:
+            variant = resized if pil_format == 'WEBP' else flatten(resized)
+            name = derivative_name(source, variant_width, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(encode(variant, pil_format, options)))
+
+    derivative, _ = ImageDerivative.objects.update_or_create(source=source, defaults={
+        'width': width,
+        'height': height,
+        'widths': widths,
+        'placeholder': placeholder_for(image),
+    })
+    return derivative
+
+
+class DerivativeLookup:
+    """Batched ``source -> derivative row`` lookups for one response or export"""
+    fields = ('source', 'width', 'height', 'widths', 'placeholder')
+
+    def __init__(self):
+        self.found = {}
+        self.complete = False
+
+    @classmethod
+    def preload(cls):
+        """Load every derivative up front (static export); later lookups run no queries"""
+        lookup = cls()
+        lookup.found = {row['source']: row for row in ImageDerivative.objects.values(*cls.fields)}
+        lookup.complete = True
+        return lookup
+
+    def missing(self, sources):
+        return {source for source in sources if source and source not in self.found}
+
+    def load(self, sources):
+        missing = self.missing(sources)
+        if missing and not self.complete:
+            for row in ImageDerivative.objects.filter(source__in=missing).values(*self.fields):
+                self.found[row['source']] = row
+        for source in missing:
+            self.found.setdefault(source, None)
+
+    async def aload(self, sources):
+        """``load()`` on the async ORM; serializing afterwards runs no queries"""
+        missing = self.missing(sources)
+        if missing and not self.complete:
+            async for row in ImageDerivative.objects.filter(source__in=missing).values(*self.fields):
+                self.found[row['source']] = row
+        for source in missing:
+            self.found.setdefault(source, None)
+
+    def get(self, source):
+        self.load([source])
+        return self.found.get(source)
+
+
+def get_lookup(context):
+    return context.setdefault('image_derivatives', DerivativeLookup())
+
+
+def variant_sources(serializer, instances):
+    """Image names the variants fields of ``serializer`` (and its nested lists) will look up"""
+    for field in serializer.fields.values():
+        if isinstance(field, ImageVariantsField):
+            for instance in instances:
+                yield getattr(instance, field.source).name
+        elif isinstance(field, serializers.ListSerializer) and isinstance(field.child, serializers.Serializer):
+            # Nested relations are prefetched by the views, so .all() reads the cache
+            for instance in instances:
+                yield from variant_sources(field.child, getattr(instance, field.source).all())
+
+
+async def apreload_variants(serializer, instances):
+    """Load on the async ORM the derivatives ``serializer`` will read for ``instances``"""
+    child = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+    await get_lookup(serializer.context).aload(list(variant_sources(child, instances)))
+
+
+def variants_data(row, storage, request=None):
+    if row is None:
+        return None
+
+    def url(name):
+        location = storage.url(name)
+        return request.build_absolute_uri(location) if request is not None else location
+
+    return {
+        'width': row['width'],
+        'height': row['height'],
+        'placeholder': row['placeholder'],
+        'srcset': {
+            extension: ', '.join(
+                f'{url(derivative_name(row["source"], width, extension))} {width}w' for width in row['widths']
+            )
+            for extension, _format, _options in FORMATS
+        },
+    }
+
+
+class ImageVariantsField(serializers.Field):
+    """``srcset`` data for the image field named by ``source``, or None until generated"""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, fieldfile):
+        if not fieldfile:
+            return None
+        row = get_lookup(self.context).get(fieldfile.name)
+        return variants_data(row, fieldfile.storage, self.context.get('request'))
+
+
+class ImageVariantsListSerializer(serializers.ListSerializer):
+    """Loads the derivatives of a whole list in one query before serializing it"""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, BaseManager) else data)
+        variant_sources = [
+            field.source for field in self.child.fields.values() if isinstance(field, ImageVariantsField)
+        ]
+        get_lookup(self.context).load(
+            getattr(item, source).name for item in items for source in variant_sources
+        )
+        return super().to_representation(items)
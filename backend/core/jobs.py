@@ -0,0 +1,213 @@
+"""
+Database-backed background jobs.
+
+``enqueue()`` stores a ``Job`` row; the ``run_jobs`` management command
+claims due jobs one at a time and runs the registered task function. There
+is no broker: the jobs table is the queue, claims are conditional UPDATEs so
+several workers can share it, an identical pending job is reused instead of
+queued twice, and failures are retried with exponential backoff.
+"""
+import hashlib
+import io
+import json
+import os
+import socket
+import traceback
+from datetime import timedelta
+from django.apps import apps
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from PIL import UnidentifiedImageError
+from .images import RESPONSIVE_IMAGE_FIELDS, generate_derivatives
+from .models import Job
+
+TASKS = {}
+
+DEFAULT_QUEUE = 'default'
+
+# Seconds before a failed job is retried, doubled after every attempt
+RETRY_DELAY = 30
+
+
+def task(name):
+    """Register ``func(job, **arguments)`` as the task ``name``"""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def dedup_key(task_name, arguments, queue=DEFAULT_QUEUE):
+    raw = json.dumps([task_name, arguments, queue], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def enqueue(task_name, max_attempts=3, queue=DEFAULT_QUEUE, **arguments):
+    """Queue ``task_name``, or return the identical job that is already pending"""
+    if task_name not in TASKS:
+        raise ValueError(f'Unknown task: {task_name}')
+    key = dedup_key(task_name, arguments, queue)
+    existing = Job.objects.filter(dedup_key=key, status='pending').first()
+    if existing:
+        return existing
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                task=task_name, queue=queue, arguments=arguments, dedup_key=key, max_attempts=max_attempts
+            )
+    except IntegrityError:
+        # Lost a race with another request queueing the same job
+        return Job.objects.get(dedup_key=key, status='pending')
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_next(worker=None, queues=None):
+    """Mark the oldest due job in ``queues`` as running and return it, or None when idle"""
+    now = timezone.now()
+    queues = queues or [DEFAULT_QUEUE]
+    candidates = Job.objects.filter(
+        status='pending', queue__in=queues, run_after__lte=now
+    ).order_by('run_after', 'created_at')
+    for pk in candidates.values_list('pk', flat=True)[:10]:
+        # Only one worker's UPDATE can match while the job is still pending
+        claimed = Job.objects.filter(pk=pk, status='pending').update(
+            status='running', started_at=now, finished_at=None, worker=worker or worker_name(),
+            progress=0, message='Started',
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def requeue_stale(older_than):
+    """Put back jobs whose worker died mid-run; returns how many"""
+    cutoff = timezone.now() - older_than
+    return Job.objects.filter(status='running', started_at__lt=cutoff).update(
+        status='pending', message='Requeued after worker timeout', run_after=timezone.now()
+    )
+
+
+class JobContext:
+    """Handed to task functions to report progress and collect command output"""
+
+    def __init__(self, job):
+        self.job = job
+        self.output = io.StringIO()
+
+    def report(self, progress, message=''):
+        self.job.progress = max(0, min(100, int(progress)))
+        self.job.message = message[:255]
+        Job.objects.filter(pk=self.job.pk).update(progress=self.job.progress, message=self.job.message)
+
+    def call_command(self, name, *args, **options):
+        """Run a management command, keeping its output for the job log"""
+        self.output.write(f'$ {name}\n')
+        call_command(name, *args, stdout=self.output, stderr=self.output, **options)
+
+
+def run_job(job):
+    """Run a claimed job, then record success, a scheduled retry or failure"""
+    context = JobContext(job)
+    try:
+        TASKS[job.task](context, **job.arguments)
+    except Exception:
+        job.attempts += 1
+        job.error = traceback.format_exc()
+        job.log = context.output.getvalue()
+        if job.attempts < job.max_attempts:
+            job.status = 'pending'
+            job.run_after = timezone.now() + timedelta(seconds=RETRY_DELAY * 2 ** (job.attempts - 1))
+            job.message = f'Attempt {job.attempts} failed, retrying'
+        else:
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+            job.message = f'Failed after {job.attempts} attempts'
+        try:
+            with transaction.atomic():
+                job.save()
+        except IntegrityError:
+            # An identical job was queued meanwhile and will do the work
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+            job.message = 'Superseded by a newer identical job'
+            job.save()
+        return job
+
+    job.attempts += 1
+    job.status = 'succeeded'
+    job.progress = 100
+    job.message = 'Done'
+    job.error = ''
+    job.log = context.output.getvalue()
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def run_pending(worker=None, queues=None):
+    """Run due jobs until none are left; returns how many ran"""
+    count = 0
+    while True:
+        job = claim_next(worker, queues)
+        if job is None:
+            return count
+        run_job(job)
+        count += 1
+
+
+# Tasks
+
+@task('build_static_content')
+def build_static_content(job):
+    """Import content from the repository files, then export the static API"""
+    from .autobuild import paused
+
+    # The export below covers the imported changes, so they don't queue a rebuild
+    with paused():
+        job.report(5, 'Importing blog posts')
+        job.call_command('import_markdown_blogs')
+        job.report(30, 'Importing team data')
+        job.call_command('import_team_data')
+        job.report(45, 'Importing configuration')
+        job.call_command('import_config_data')
+    job.report(60, 'Exporting static content')
+    job.call_command('export_static_content', incremental=True)
+
+
+@task('export_static_content')
+def export_static_content(job, **options):
+    job.report(10, 'Exporting static content')
+    job.call_command('export_static_content', **options)
+
+
+@task('import_markdown_blogs')
+def import_markdown_blogs(job, **options):
+    job.report(10, 'Importing blog posts')
+    job.call_command('import_markdown_blogs', **options)
+
+
+@task('generate_image_derivatives')
+def generate_image_derivatives(job, model=None, pk=None):
+    """Variants for one saved object's images, or for every image when no object is given"""
+    if model is None:
+        job.call_command('generate_image_derivatives')
+        return
+    model_class = apps.get_model(model)
+    instance = model_class.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+    field_names = RESPONSIVE_IMAGE_FIELDS[model_class]
+    for i, field_name in enumerate(field_names):
+        job.report(100 * i // len(field_names), f'Resizing {field_name}')
+        fieldfile = getattr(instance, field_name)
+        if not fieldfile:
+            continue
+        try:
+            generate_derivatives(fieldfile)
+        except UnidentifiedImageError:
+            # Not an image: retrying will not help, the original keeps being served
+            job.output.write(f'Skipped {fieldfile.name}: not a readable image\n')
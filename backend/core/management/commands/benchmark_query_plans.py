@@ -0,0 +1,130 @@
+import time
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from core.models import (
+    BlogPost, Category, Event, Gallery, TeamMember, Announcement, CarouselImage
+)
+
+INDEXED_MODELS = [BlogPost, Event, Gallery, TeamMember, Announcement, CarouselImage]
+
+# Query shapes used by the public list views (first page of 20)
+QUERY_SHAPES = {
+    'blogs': lambda: BlogPost.objects.filter(published=True),
+    'blogs?featured': lambda: BlogPost.objects.filter(published=True, featured=True),
+    'blogs?category': lambda: BlogPost.objects.filter(published=True, category__slug='category-3'),
+    'events': lambda: Event.objects.filter(published=True),
+    'events?type': lambda: Event.objects.filter(published=True, event_type='workshop'),
+    'events?upcoming': lambda: Event.objects.filter(published=True, start_date__gte=timezone.now()),
+    'featured events': lambda: Event.objects.filter(published=True, featured=True),
+    'galleries': lambda: Gallery.objects.filter(published=True),
+    'team': lambda: TeamMember.objects.filter(active=True),
+    'announcements': lambda: Announcement.objects.filter(is_active=True),
+    'announcements?featured': lambda: Announcement.objects.filter(is_active=True, is_featured=True),
+    'carousel': lambda: CarouselImage.objects.filter(is_active=True),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Load synthetic rows and compare query plans and timings of the public '
+        'list queries with and without the list filter indexes (rolled back afterwards)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Rows to create per model')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--show-plans', action='store_true', help='Print the full query plans')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.stdout.write(f'Loading {options["rows"]} rows per model on {connection.vendor}...')
+        
+        with transaction.atomic():
+            self.populate(options['rows'])
+            self.analyze()
+            indexed = self.measure()
+            self.drop_indexes()
+            self.analyze()
+            unindexed = self.measure()
+            transaction.set_rollback(True)
+        
+        for name in QUERY_SHAPES:
+            plan, elapsed = indexed[name]
+            old_plan, old_elapsed = unindexed[name]
+            self.stdout.write(
+                f'{name:24} {self.summarize(old_plan):>10} {old_elapsed * 1000:8.2f} ms  ->  '
+                f'{self.summarize(plan):>10} {elapsed * 1000:8.2f} ms'
+            )
+            if options['show_plans']:
+                self.stdout.write(f'  without indexes:\n    {old_plan.replace(chr(10), chr(10) + "    ")}')
+                self.stdout.write(f'  with indexes:\n    {plan.replace(chr(10), chr(10) + "    ")}')
+        
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark finished (all rows rolled back)'))
+
+    def populate(self, rows):
+        now = timezone.now()
+        author = User.objects.create(username='benchmark-author')
+        categories = Category.objects.bulk_create([
+            Category(name=f'Benchmark {i}', slug=f'category-{i}') for i in range(20)
+        ])
+        batch = 5000
+        BlogPost.objects.bulk_create((
+            BlogPost(
+                title=f'Post {i}', slug=f'benchmark-post-{i}', content='Body', category=categories[i % 20],
+                published=i % 10 != 0, featured=i % 50 == 0,
+            ) for i in range(rows)
+        ), batch_size=batch)
+        Event.objects.bulk_create((
+            Event(
+                title=f'Event {i}', slug=f'benchmark-event-{i}', description='Description',
+                start_date=now + timedelta(hours=i - rows // 2), event_type=Event.EVENT_TYPES[i % 5][0],
+                published=i % 10 != 0, featured=i % 100 == 0,
+            ) for i in range(rows)
+        ), batch_size=batch)
+        Gallery.objects.bulk_create((
+            Gallery(title=f'Gallery {i}', slug=f'benchmark-gallery-{i}', author=author, published=i % 4 == 0)
+            for i in range(rows)
+        ), batch_size=batch)
+        TeamMember.objects.bulk_create((
+            TeamMember(name=f'Member {i}', role='student_member', batch='2024', active=i % 20 == 0, order=i % 100)
+            for i in range(rows)
+        ), batch_size=batch)
+        Announcement.objects.bulk_create((
+            Announcement(title=f'Announcement {i}', content='Content', is_active=i % 20 == 0, is_featured=i % 200 == 0)
+            for i in range(rows)
+        ), batch_size=batch)
+        CarouselImage.objects.bulk_create((
+            CarouselImage(title=f'Slide {i}', image='carousel_images/slide.jpg', is_active=i % 50 == 0, order=i % 10)
+            for i in range(rows)
+        ), batch_size=batch)
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def drop_indexes(self):
+        with connection.cursor() as cursor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+
+    def measure(self):
+        """Return ``{shape: (plan, seconds per first-page query)}``"""
+        results = {}
+        for name, queryset in QUERY_SHAPES.items():
+            page = queryset()[:20]
+            plan = page.explain()
+            start = time.perf_counter()
+            for _ in range(self.repeat):
+                list(queryset()[:20])
+            results[name] = (plan, (time.perf_counter() - start) / self.repeat)
+        return results
+
+    def summarize(self, plan):
+        """Condense a plan to how the main table is read"""
+        if 'Index Scan' in plan or 'Index Only Scan' in plan or 'Bitmap Index Scan' in plan or 'USING INDEX' in plan or 'USING COVERING INDEX' in plan:
+            return 'index scan'
+        return 'seq scan'
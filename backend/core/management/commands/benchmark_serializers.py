@@ -0,0 +1,104 @@
+import time
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from core.fast_serializers import BlogPostListFastSerializer, EventListFastSerializer, TeamMemberFastSerializer
+from core.models import BlogPost, Category, Tag, Event, TeamMember
+from core.serializers import BlogPostListSerializer, EventListSerializer, TeamMemberSerializer
+
+# name -> (queryset used by the list view, DRF serializer, fast serializer)
+ENDPOINTS = {
+    'blogs': (
+        lambda: BlogPost.objects.filter(published=True).select_related('author', 'category').prefetch_related('tags'),
+        BlogPostListSerializer, BlogPostListFastSerializer,
+    ),
+    'events': (
+        lambda: Event.objects.filter(published=True).select_related('author'),
+        EventListSerializer, EventListFastSerializer,
+    ),
+    'team': (
+        lambda: TeamMember.objects.filter(active=True),
+        TeamMemberSerializer, TeamMemberFastSerializer,
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the DRF list serializers with the values()-based fast serializers '
+        '(query + serialize + render) on synthetic rows, rolled back afterwards'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[20, 200, 2000], help='Page sizes to time')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per size')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.request = RequestFactory().get('/api/', HTTP_HOST='localhost')
+        renderer = JSONRenderer()
+
+        with transaction.atomic():
+            self.populate(max(options['rows']))
+            for name, (queryset, serializer_class, fast_class) in ENDPOINTS.items():
+                for rows in options['rows']:
+                    context = {'request': self.request}
+                    slow_body, slow = self.time(lambda: renderer.render(
+                        serializer_class(queryset()[:rows], many=True, context=context).data
+                    ))
+                    fast_serializer = fast_class(context)
+                    fast_body, fast = self.time(lambda: renderer.render(
+                        fast_serializer.serialize(fast_serializer.values(queryset()[:rows]))
+                    ))
+                    if slow_body != fast_body:
+                        raise CommandError(f'{name} at {rows} rows: fast serializer output differs')
+                    self.stdout.write(
+                        f'{name:8} {rows:6} rows  {slow * 1000:9.2f} ms  ->  {fast * 1000:8.2f} ms  '
+                        f'({slow / fast:4.1f}x)'
+                    )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark finished, output identical (all rows rolled back)'))
+
+    def time(self, func):
+        body = func()
+        start = time.perf_counter()
+        for _ in range(self.repeat):
+            func()
+        return body, (time.perf_counter() - start) / self.repeat
+
+    def populate(self, count):
+        now = timezone.now()
+        author = User.objects.create(username='benchmark-author', first_name='Bench', last_name='Mark')
+        categories = Category.objects.bulk_create([
+            Category(name=f'Benchmark {i}', slug=f'benchmark-{i}') for i in range(5)
+        ])
+        tags = Tag.objects.bulk_create([Tag(name=f'benchmark-{i}', slug=f'benchmark-{i}') for i in range(10)])
+        posts = BlogPost.objects.bulk_create([
+            BlogPost(
+                title=f'Post {i}', slug=f'benchmark-post-{i}', content='Body', excerpt='Excerpt',
+                published=True, author=author if i % 2 else None, author_name='Guest',
+                category=categories[i % 5] if i % 7 else None,
+                featured_image=f'blog_images/{i}.jpg' if i % 3 else '',
+            )
+            for i in range(count)
+        ])
+        through = BlogPost.tags.through
+        through.objects.bulk_create([
+            through(blogpost=post, tag=tags[(i + j) % 10]) for i, post in enumerate(posts) for j in range(3)
+        ])
+        Event.objects.bulk_create([
+            Event(
+                title=f'Event {i}', slug=f'benchmark-event-{i}', description='Description',
+                start_date=now + timedelta(days=i), event_type='workshop', published=True,
+                author=author if i % 2 else None,
+            )
+            for i in range(count)
+        ])
+        TeamMember.objects.bulk_create([
+            TeamMember(name=f'Member {i}', role='student_member', batch='2024', order=i) for i in range(count)
+        ])
@@ -1,17 +1,71 @@
-import json
 import os
-import shutil
-from django.core.management.base import BaseCommand
-from django.core.serializers.json import DjangoJSONEncoder
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import Count
 from django.conf import settings
+from django.contrib.auth.models import User
 from core.models import (
-    BlogPost, Event, TeamMember, Leadership, Announcement, 
-    CarouselImage, Gallery, Image, NewsletterArchive
+    BlogPost, Category, Tag, Event, TeamMember, Leadership, Announcement, 
+    CarouselImage, Gallery, Image, NewsletterArchive, ImageDerivative
 )
 from core.serializers import (
     BlogPostListSerializer, EventListSerializer, TeamMemberSerializer,
     LeadershipSerializer, AnnouncementSerializer, CarouselImageSerializer
 )
+from core.fileutils import atomic_write, same_file_contents
+from core.home import build_home, featured_blogs, featured_events
+from core.images import DerivativeLookup, get_lookup, variants_data
+from core.search.documents import blog_document, event_document
+from core.search.inverted_index import InvertedIndex
+from core.static_export.compression import compress_files, etag_for, needs_compression, remove_compressed
+from core.static_export.manifest import BuildManifest, content_hash, model_watermark
+from core.static_export.media_sync import sync_media
+from core.static_export.pagination import PageShardWriter
+from core.static_export.writers import StreamingJSONWriter, dump_json
+
+
+# Tag links and author names live in tables without updated_at; they are
+# listed so their rows are fingerprinted too
+BlogTag = BlogPost.tags.through
+
+# (export name, method, models whose rows feed the exported files)
+EXPORTS = [
+    ('blogs', 'export_blog_posts', (BlogPost, Category, Tag, BlogTag, User, ImageDerivative)),
+    ('events', 'export_events', (Event, User, ImageDerivative)),
+    ('featured', 'export_featured', (BlogPost, Category, Tag, BlogTag, Event, User, ImageDerivative)),
+    ('home', 'export_home', (CarouselImage, Announcement, BlogPost, Category, Tag, BlogTag, Event, Leadership, User, ImageDerivative)),
+    ('search', 'export_search_index', (BlogPost, Category, Tag, BlogTag, Event, User)),
+    ('team', 'export_team_members', (TeamMember, ImageDerivative)),
+    ('leadership', 'export_leadership', (Leadership, ImageDerivative)),
+    ('announcements', 'export_announcements', (Announcement,)),
+    ('carousel', 'export_carousel_images', (CarouselImage, ImageDerivative)),
+    ('galleries', 'export_galleries', (Gallery, Image, User, ImageDerivative)),
+    ('newsletters', 'export_newsletter_archives', (NewsletterArchive,)),
+]
+
+
+# Written by every run after the exports, for clients to find the other files
+INDEX_FILES = ('etags.json', 'manifest.json', 'status.json')
+
+
+@contextmanager
+def read_snapshot():
+    """
+    Run the queries inside against one consistent view of the database, so
+    counts taken up front agree with the rows iterated afterwards even while
+    editors are saving. SQLite transactions already read a snapshot;
+    Postgres needs REPEATABLE READ, which must be set before the first query.
+    """
+    starts_transaction = not connection.in_atomic_block
+    # Nothing is written, so an enclosing transaction needs no savepoint
+    with transaction.atomic(savepoint=False):
+        if starts_transaction and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        yield
 
 
 class Command(BaseCommand):
@@ -21,182 +75,523 @@ class Command(BaseCommand):
         parser.add_argument(
             '--output-dir',
             type=str,
-            default='../public/api',
-            help='Output directory for static files (relative to backend)'
+            default=settings.STATIC_EXPORT_DIR,
+            help='Output directory for static files (defaults to the STATIC_EXPORT_DIR setting, public/api)'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only regenerate files whose source rows changed since the last export'
+        )
+        parser.add_argument(
+            '--changed-model',
+            action='append',
+            dest='changed_models',
+            help='With --incremental, regenerate only the exports that read this model '
+                 '(app_label.model, repeatable) and leave the rest untouched'
+        )
+        parser.add_argument(
+            '--media-source',
+            action='append',
+            dest='media_sources',
+            help='Media directory to publish; repeat to merge several (later ones win). '
+                 'Defaults to the backend media directory'
+        )
+        parser.add_argument(
+            '--no-link-media',
+            action='store_false',
+            dest='link_media',
+            help='Always copy media bytes instead of hardlinking/reflinking them'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='Number of exports to run concurrently, each with its own DB connection'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Rows fetched and serialized at a time while streaming list files'
+        )
+        parser.add_argument(
+            '--compact',
+            action='store_true',
+            help='Write JSON without indentation to shrink the exported files'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=settings.REST_FRAMEWORK.get('PAGE_SIZE', 20),
+            help='Items per pages/N.json shard (defaults to the REST_FRAMEWORK PAGE_SIZE)'
+        )
+        parser.add_argument(
+            '--no-precompress',
+            action='store_false',
+            dest='precompress',
+            help='Skip writing the .gz and .br siblings that let changed JSON files be served precompressed '
+                 '(the siblings of changed files are then removed rather than left stale)'
         )
 
     def handle(self, *args, **options):
         output_dir = options['output_dir']
+        self.incremental = options['incremental']
+        self.chunk_size = options['chunk_size']
+        self.compact = options['compact']
+        self.page_size = options['page_size']
+        jobs = options['jobs']
+        if jobs < 1:
+            raise CommandError('--jobs must be at least 1')
+        if self.chunk_size < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        if self.page_size < 1:
+            raise CommandError('--page-size must be at least 1')
+        self.changed_models = set(options['changed_models'] or [])
+        if self.changed_models and not self.incremental:
+            raise CommandError('--changed-model requires --incremental')
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
         self.stdout.write(self.style.SUCCESS(f'Exporting content to {output_dir}...'))
         
+        # Full exports load the previous manifest too, so files it lists that
+        # are no longer produced get removed; only incremental runs trust its
+        # hashes to skip unchanged files
+        self.manifest = BuildManifest.load(output_dir)
+        self.manifest_lock = threading.Lock()
+        self.state = threading.local()
+        self.changed_files = set()
+        self.writer_pool = None
+        # Watermarks are taken once per run and shared by the exports reading
+        # the same model; image srcsets come from one lookup, preloaded by the
+        # first export that needs it
+        self.watermarks = {}
+        self.serializer_context = {}
+        self.lookup_lock = threading.Lock()
+        
         # Export all content types
-        self.export_blog_posts(output_dir)
-        self.export_events(output_dir)
-        self.export_team_members(output_dir)
-        self.export_leadership(output_dir)
-        self.export_announcements(output_dir)
-        self.export_carousel_images(output_dir)
-        self.export_galleries(output_dir)
-        self.export_newsletter_archives(output_dir)
-        
-        # Copy media files
-        self.copy_media_files(output_dir)
+        if jobs == 1:
+            for name, method, models in EXPORTS:
+                self.run_export(output_dir, name, method, models)
+        else:
+            self.run_exports_in_parallel(output_dir, jobs)
+        
+        self.write_etags(output_dir)
+        self.write_public_manifest(output_dir)
+        if options['precompress']:
+            self.precompress(output_dir, jobs)
+        else:
+            self.remove_stale_compressed(output_dir)
+        self.manifest.save()
+        
+        # Sync media files
+        self.copy_media_files(output_dir, options['media_sources'], options['link_media'])
         
         self.stdout.write(self.style.SUCCESS('✅ Static content export completed!'))
 
-    def export_blog_posts(self, output_dir):
-        """Export blog posts"""
-        posts = BlogPost.objects.filter(published=True)
+    def run_exports_in_parallel(self, output_dir, jobs):
+        """
+        Fan the exports out over a thread pool. Serialization runs in the
+        export workers while a second pool writes the encoded files, so
+        encoding and disk I/O overlap.
+        """
+        with ThreadPoolExecutor(jobs, thread_name_prefix='export') as pool, \
+                ThreadPoolExecutor(jobs, thread_name_prefix='export-write') as writer_pool:
+            self.writer_pool = writer_pool
+            futures = [
+                pool.submit(self.run_export_in_thread, output_dir, name, method, models)
+                for name, method, models in EXPORTS
+            ]
+            for future in futures:
+                future.result()
+        self.writer_pool = None
+
+    def run_export_in_thread(self, output_dir, name, method, models):
+        """Run an export on a worker thread, closing its DB connection afterwards"""
+        try:
+            self.run_export(output_dir, name, method, models)
+        finally:
+            connections.close_all()
+
+    def run_export(self, output_dir, name, method, models):
+        """Run a single export unless its source rows are unchanged"""
+        labels = {model._meta.label_lower for model in models}
+        if self.changed_models and not labels & self.changed_models:
+            self.stdout.write(f'⏭️ Skipped {name} (not affected)')
+            return
+        watermarks = {model._meta.label_lower: self.watermark(model) for model in models}
         
-        # List view
-        serializer = BlogPostListSerializer(posts, many=True)
-        self.write_json_file(f'{output_dir}/blogs.json', {
-            'results': serializer.data,
-            'count': posts.count()
-        })
+        # Models named as changed are re-exported even when the watermarks
+        # agree, since bulk writes don't always move updated_at
+        with self.manifest_lock:
+            is_current = (
+                self.incremental and not self.changed_models and self.manifest.is_current(name, watermarks)
+            )
+        if is_current:
+            self.stdout.write(f'⏭️ Skipped {name} (unchanged)')
+            return
         
-        # Individual posts
+        if ImageDerivative in models:
+            self.preload_derivatives()
+        self.state.written_files = []
+        self.state.pending_writes = []
+        # Shard counts are taken before the rows are iterated
+        with read_snapshot():
+            getattr(self, method)(output_dir)
+        
+        # Surface write errors before recording the export as done
+        for future in wait(self.state.pending_writes).done:
+            future.result()
+        
+        with self.manifest_lock:
+            removed = self.manifest.update_export(name, watermarks, self.state.written_files)
+        for rel in removed:
+            self.stdout.write(f'🗑️ Removed stale {rel}')
+
+    def watermark(self, model):
+        """``model_watermark`` for ``model``, computed once per run"""
+        label = model._meta.label_lower
+        with self.lookup_lock:
+            if label not in self.watermarks:
+                self.watermarks[label] = model_watermark(model)
+            return self.watermarks[label]
+
+    def preload_derivatives(self):
+        """Load every image derivative the first time an export shows images"""
+        with self.lookup_lock:
+            if 'image_derivatives' not in self.serializer_context:
+                self.serializer_context['image_derivatives'] = DerivativeLookup.preload()
+
+    def precompress(self, output_dir, jobs):
+        """Compress files written in this run, or whose siblings are missing"""
+        paths = [
+            path for path in self.manifest.file_paths()
+            if path in self.changed_files or needs_compression(path)
+        ]
+        # The index files are rewritten on every run
+        paths += [os.path.join(output_dir, name) for name in INDEX_FILES]
+        compress_files(paths, jobs)
+        self.stdout.write(f'🗜️ Precompressed {len(paths)} files')
+
+    def remove_stale_compressed(self, output_dir):
+        """Delete the .gz/.br siblings of files rewritten in this run, which still hold the old content"""
+        for path in self.changed_files | {os.path.join(output_dir, name) for name in INDEX_FILES}:
+            remove_compressed(path)
+
+    def write_etags(self, output_dir):
+        """Write etags.json mapping each exported file to its ETag"""
+        etags = {
+            rel: etag_for(entry['sha256'])
+            for rel, entry in sorted(self.manifest.data['files'].items())
+        }
+        atomic_write(f'{output_dir}/etags.json', dump_json(etags))
+
+    def write_public_manifest(self, output_dir):
+        """
+        Write manifest.json (per-file hash, size, record count and
+        last-modified watermark) and status.json for static clients
+        """
+        manifest = self.manifest.public_manifest()
+        atomic_write(f'{output_dir}/manifest.json', dump_json(manifest))
+        atomic_write(f'{output_dir}/status.json', dump_json({
+            'status': 'static',
+            'message': 'Using static content files',
+            'build_date': manifest['generated'],
+            'endpoints': [
+                f'/api/{rel}' for rel in manifest['files'] if '/' not in rel
+            ]
+        }))
+
+    def export_blog_posts(self, output_dir):
+        """Export blog posts, with paginated, per-category and per-tag shards"""
+        posts = BlogPost.objects.filter(published=True).select_related(
+            'author', 'category'
+        ).prefetch_related('tags')
         posts_dir = f'{output_dir}/blogs'
         os.makedirs(posts_dir, exist_ok=True)
         
-        for post in posts:
-            post_data = BlogPostListSerializer(post).data
-            self.write_json_file(f'{posts_dir}/{post.slug}.json', post_data)
+        # Shard totals up front so every page can carry its count
+        category_counts = dict(
+            posts.exclude(category=None).order_by()
+            .values_list('category__slug').annotate(total=Count('pk'))
+        )
+        tag_counts = dict(
+            BlogPost.tags.through.objects.filter(blogpost__published=True)
+            .values_list('tag__slug').annotate(total=Count('pk'))
+        )
+        pages = self.page_writer(output_dir, 'blogs', posts.count())
+        category_pages = {
+            slug: self.page_writer(output_dir, f'blogs/category/{slug}', total)
+            for slug, total in category_counts.items()
+        }
+        tag_pages = {
+            slug: self.page_writer(output_dir, f'blogs/tag/{slug}', total)
+            for slug, total in tag_counts.items()
+        }
+        
+        def items():
+            for post, data in self.serialize_pairs_in_chunks(posts, BlogPostListSerializer):
+                # Individual posts and shards reuse each serialized list item
+                self.write_json_file(f'{posts_dir}/{post.slug}.json', data)
+                pages.add(data)
+                if post.category_id:
+                    category_pages[post.category.slug].add(data)
+                for tag in post.tags.all():
+                    tag_pages[tag.slug].add(data)
+                yield data
         
-        self.stdout.write(f'📝 Exported {posts.count()} blog posts')
+        # List view
+        count = self.write_json_results(f'{output_dir}/blogs.json', items())
+        for writer in [pages, *category_pages.values(), *tag_pages.values()]:
+            writer.close()
+        
+        self.stdout.write(
+            f'📝 Exported {count} blog posts '
+            f'({len(category_pages)} categories, {len(tag_pages)} tags)'
+        )
 
     def export_events(self, output_dir):
-        """Export events"""
-        events = Event.objects.filter(published=True)
-        serializer = EventListSerializer(events, many=True)
+        """Export events, with paginated shards"""
+        events = Event.objects.filter(published=True).select_related('author')
+        pages = self.page_writer(output_dir, 'events', events.count())
         
-        self.write_json_file(f'{output_dir}/events.json', {
-            'results': serializer.data,
-            'count': events.count()
-        })
+        def items():
+            for data in self.serialize_in_chunks(events, EventListSerializer):
+                pages.add(data)
+                yield data
+        
+        count = self.write_json_results(f'{output_dir}/events.json', items())
+        pages.close()
+        
+        self.stdout.write(f'📅 Exported {count} events')
+
+    def export_featured(self, output_dir):
+        """Export featured content, mirroring the featured API endpoint"""
+        blog_data = BlogPostListSerializer(featured_blogs(), many=True, context=self.serializer_context).data
+        event_data = EventListSerializer(featured_events(), many=True, context=self.serializer_context).data
+        self.write_json_file(f'{output_dir}/featured.json', {
+            'featured_blogs': blog_data,
+            'featured_events': event_data
+        }, count=len(blog_data) + len(event_data))
+        
+        self.stdout.write('⭐ Exported featured content')
+
+    def export_home(self, output_dir):
+        """Export the homepage bundle, mirroring the home API endpoint"""
+        home = build_home(self.serializer_context)
+        self.write_json_file(f'{output_dir}/home.json', home, count=sum(len(section) for section in home.values()))
         
-        self.stdout.write(f'📅 Exported {events.count()} events')
+        self.stdout.write('🏠 Exported homepage bundle')
+
+    def export_search_index(self, output_dir):
+        """Export a sharded inverted index over published blog posts and events"""
+        posts = BlogPost.objects.filter(published=True).select_related(
+            'author', 'category'
+        ).prefetch_related('tags')
+        events = Event.objects.filter(published=True).select_related('author')
+        
+        def documents():
+            for post in posts.iterator(chunk_size=self.chunk_size):
+                text = blog_document(post)
+                yield 'blog', post.pk, post.slug, text['title'], text['body']
+            for event in events.iterator(chunk_size=self.chunk_size):
+                text = event_document(event)
+                yield 'event', event.pk, event.slug, text['title'], text['body']
+        
+        index = InvertedIndex.build(documents())
+        search_dir = f'{output_dir}/search'
+        os.makedirs(search_dir, exist_ok=True)
+        files = index.to_files()
+        meta = files.pop('meta.json')
+        for filename, data in files.items():
+            self.write_json_file(f'{search_dir}/{filename}', data, count=len(data))
+        # The search backend reloads when meta.json changes, so it goes last
+        wait(self.state.pending_writes)
+        self.write_json_file(f'{search_dir}/meta.json', meta, count=len(index.docs))
+        
+        self.stdout.write(f'🔎 Exported search index ({len(index.docs)} documents, {len(index.terms)} terms)')
+
+    def page_writer(self, output_dir, prefix, count):
+        os.makedirs(f'{output_dir}/{prefix}/pages', exist_ok=True)
+        return PageShardWriter(output_dir, prefix, self.page_size, count, self.write_json_file)
 
     def export_team_members(self, output_dir):
         """Export team members"""
         members = TeamMember.objects.filter(active=True)
-        serializer = TeamMemberSerializer(members, many=True)
-        
-        self.write_json_file(f'{output_dir}/team.json', {
-            'results': serializer.data,
-            'count': members.count()
-        })
+        count = self.write_json_results(
+            f'{output_dir}/team.json', self.serialize_in_chunks(members, TeamMemberSerializer)
+        )
         
-        self.stdout.write(f'👥 Exported {members.count()} team members')
+        self.stdout.write(f'👥 Exported {count} team members')
 
     def export_leadership(self, output_dir):
         """Export leadership"""
         leadership = Leadership.objects.all()
-        serializer = LeadershipSerializer(leadership, many=True)
-        
-        self.write_json_file(f'{output_dir}/leadership.json', {
-            'results': serializer.data,
-            'count': leadership.count()
-        })
+        count = self.write_json_results(
+            f'{output_dir}/leadership.json', self.serialize_in_chunks(leadership, LeadershipSerializer)
+        )
         
-        self.stdout.write(f'👔 Exported {leadership.count()} leadership members')
+        self.stdout.write(f'👔 Exported {count} leadership members')
 
     def export_announcements(self, output_dir):
         """Export announcements"""
         announcements = Announcement.objects.filter(is_active=True)
-        serializer = AnnouncementSerializer(announcements, many=True)
-        
-        self.write_json_file(f'{output_dir}/announcements.json', {
-            'results': serializer.data,
-            'count': announcements.count()
-        })
+        count = self.write_json_results(
+            f'{output_dir}/announcements.json',
+            self.serialize_in_chunks(announcements, AnnouncementSerializer)
+        )
         
-        self.stdout.write(f'📢 Exported {announcements.count()} announcements')
+        self.stdout.write(f'📢 Exported {count} announcements')
 
     def export_carousel_images(self, output_dir):
         """Export carousel images"""
         images = CarouselImage.objects.filter(is_active=True)
-        serializer = CarouselImageSerializer(images, many=True)
-        
-        self.write_json_file(f'{output_dir}/carousel.json', {
-            'results': serializer.data,
-            'count': images.count()
-        })
+        count = self.write_json_results(
+            f'{output_dir}/carousel.json', self.serialize_in_chunks(images, CarouselImageSerializer)
+        )
         
-        self.stdout.write(f'🖼️ Exported {images.count()} carousel images')
+        self.stdout.write(f'🖼️ Exported {count} carousel images')
 
     def export_galleries(self, output_dir):
         """Export galleries"""
-        galleries = Gallery.objects.filter(published=True)
-        gallery_data = []
-        
-        for gallery in galleries:
-            images = Image.objects.filter(gallery=gallery)
-            gallery_info = {
-                'id': gallery.id,
-                'title': gallery.title,
-                'slug': gallery.slug,
-                'description': gallery.description,
-                'cover_image': gallery.cover_image.url if gallery.cover_image else None,
-                'images': [
-                    {
-                        'id': img.id,
-                        'title': img.title,
-                        'image': img.image.url if img.image else None,
-                        'alt_text': img.alt_text,
-                        'caption': img.caption
-                    } for img in images
-                ]
-            }
-            gallery_data.append(gallery_info)
-        
-        self.write_json_file(f'{output_dir}/galleries.json', {
-            'results': gallery_data,
-            'count': len(gallery_data)
-        })
-        
-        self.stdout.write(f'🖼️ Exported {len(gallery_data)} galleries')
+        galleries = Gallery.objects.filter(published=True).prefetch_related('images')
+        count = self.write_json_results(
+            f'{output_dir}/galleries.json',
+            (self.gallery_info(gallery) for gallery in galleries.iterator(chunk_size=self.chunk_size))
+        )
+        
+        self.stdout.write(f'🖼️ Exported {count} galleries')
+
+    def gallery_info(self, gallery):
+        return {
+            'id': gallery.id,
+            'title': gallery.title,
+            'slug': gallery.slug,
+            'description': gallery.description,
+            'cover_image': gallery.cover_image.url if gallery.cover_image else None,
+            'cover_thumbnail': gallery.cover_thumbnail.url if gallery.cover_thumbnail else None,
+            'cover_thumbnail_variants': self.image_variants(gallery.cover_thumbnail),
+            'image_count': gallery.image_count,
+            'images': [
+                {
+                    'id': img.id,
+                    'title': img.title,
+                    'image': img.image.url if img.image else None,
+                    'image_variants': self.image_variants(img.image),
+                    'alt_text': img.alt_text,
+                    'caption': img.caption
+                } for img in gallery.images.all()
+            ]
+        }
+
+    def image_variants(self, fieldfile):
+        if not fieldfile:
+            return None
+        row = get_lookup(self.serializer_context).get(fieldfile.name)
+        return variants_data(row, fieldfile.storage)
 
     def export_newsletter_archives(self, output_dir):
         """Export newsletter archives"""
         newsletters = NewsletterArchive.objects.all()
-        newsletter_data = []
-        
-        for newsletter in newsletters:
-            newsletter_info = {
-                'id': newsletter.id,
-                'title': newsletter.title,
-                'description': newsletter.description,
-                'issue_number': newsletter.issue_number,
-                'published_date': newsletter.published_date.isoformat(),
-                'pdf_file': newsletter.pdf_file.url if newsletter.pdf_file else None,
-                'is_featured': newsletter.is_featured
-            }
-            newsletter_data.append(newsletter_info)
-        
-        self.write_json_file(f'{output_dir}/newsletters.json', {
-            'results': newsletter_data,
-            'count': len(newsletter_data)
-        })
-        
-        self.stdout.write(f'📰 Exported {len(newsletter_data)} newsletters')
-
-    def copy_media_files(self, output_dir):
-        """Copy media files to public directory"""
-        media_source = os.path.join(settings.BASE_DIR, 'media')
+        count = self.write_json_results(
+            f'{output_dir}/newsletters.json',
+            (self.newsletter_info(newsletter) for newsletter in newsletters.iterator(chunk_size=self.chunk_size))
+        )
+        
+        self.stdout.write(f'📰 Exported {count} newsletters')
+
+    def newsletter_info(self, newsletter):
+        return {
+            'id': newsletter.id,
+            'title': newsletter.title,
+            'description': newsletter.description,
+            'issue_number': newsletter.issue_number,
+            'published_date': newsletter.published_date.isoformat(),
+            'pdf_file': newsletter.pdf_file.url if newsletter.pdf_file else None,
+            'is_featured': newsletter.is_featured
+        }
+
+    def serialize_in_chunks(self, queryset, serializer_class):
+        """Yield serialized rows, fetching and serializing chunk_size rows at a time"""
+        for _obj, data in self.serialize_pairs_in_chunks(queryset, serializer_class):
+            yield data
+
+    def serialize_pairs_in_chunks(self, queryset, serializer_class):
+        """Like serialize_in_chunks, but yield ``(instance, data)`` pairs"""
+        chunk = []
+        for obj in queryset.iterator(chunk_size=self.chunk_size):
+            chunk.append(obj)
+            if len(chunk) == self.chunk_size:
+                yield from zip(chunk, serializer_class(chunk, many=True, context=self.serializer_context).data)
+                chunk = []
+        if chunk:
+            yield from zip(chunk, serializer_class(chunk, many=True, context=self.serializer_context).data)
+
+    def copy_media_files(self, output_dir, media_sources=None, link=True):
+        """Sync media files to public directory, transferring only changes"""
+        media_sources = media_sources or [os.path.join(settings.BASE_DIR, 'media')]
         media_dest = f'{output_dir}/../media'
         
-        if os.path.exists(media_source):
-            if os.path.exists(media_dest):
-                shutil.rmtree(media_dest)
-            shutil.copytree(media_source, media_dest)
-            self.stdout.write(f'📁 Copied media files to {media_dest}')
+        if any(os.path.exists(source) for source in media_sources):
+            stats = sync_media(media_sources, media_dest, link=link)
+            self.stdout.write(f'📁 Synced media files to {media_dest}: {stats}')
+
+    def write_json_results(self, filepath, items):
+        """
+        Stream ``{"results": [...], "count": N}`` to ``filepath`` item by
+        item. Returns the item count.
+        """
+        self.state.written_files.append(filepath)
+        
+        with StreamingJSONWriter(filepath, compact=self.compact) as writer:
+            for item in items:
+                writer.write(item)
+        
+        with self.manifest_lock:
+            previous_digest = self.manifest.file_hash(filepath)
+        if self.incremental and previous_digest == writer.digest and os.path.exists(filepath):
+            writer.discard()
+            return writer.count
+        
+        # Leave byte-identical files untouched so their mtime doesn't change
+        if same_file_contents(writer.tmp_path, filepath):
+            writer.discard()
+        else:
+            writer.commit()
+            self.changed_files.add(os.path.normpath(filepath))
+        with self.manifest_lock:
+            self.manifest.record_file(filepath, writer.digest, writer.size, writer.count)
+        return writer.count
+
+    def write_json_file(self, filepath, data, count=None):
+        """
+        Write data to JSON file, skipping it when the bytes are unchanged.
+        ``count`` is the record count reported in the manifest; it defaults
+        to the length of ``results`` or 1 for a single object.
+        """
+        encoded = dump_json(data, compact=self.compact)
+        digest = content_hash(encoded)
+        if count is None:
+            count = len(data['results']) if 'results' in data else 1
+        self.state.written_files.append(filepath)
+        
+        with self.manifest_lock:
+            previous_digest = self.manifest.file_hash(filepath)
+        if self.incremental and previous_digest == digest and os.path.exists(filepath):
+            return
+        
+        if self.writer_pool is None:
+            self.write_bytes(filepath, encoded, digest, count)
+        else:
+            self.state.pending_writes.append(
+                self.writer_pool.submit(self.write_bytes, filepath, encoded, digest, count)
+            )
 
-    def write_json_file(self, filepath, data):
-        """Write data to JSON file"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, cls=DjangoJSONEncoder, indent=2, ensure_ascii=False)
+    def write_bytes(self, filepath, encoded, digest, count):
+        """Write already-encoded JSON and record it in the manifest"""
+        if atomic_write(filepath, encoded):
+            self.changed_files.add(os.path.normpath(filepath))
+        with self.manifest_lock:
+            self.manifest.record_file(filepath, digest, len(encoded), count)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from PIL import UnidentifiedImageError
+from core.images import RESPONSIVE_IMAGE_FIELDS, generate_derivatives
+from core.models import ImageDerivative
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive WebP/JPEG variants and blur placeholders for uploaded images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants that already exist (e.g. after changing IMAGE_DERIVATIVE_WIDTHS)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Generating image derivatives...')
+
+        done = set(ImageDerivative.objects.values_list('source', flat=True))
+        generated = failed = 0
+        for model, field_names in RESPONSIVE_IMAGE_FIELDS.items():
+            for field_name in field_names:
+                for instance in model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True}).only(field_name):
+                    fieldfile = getattr(instance, field_name)
+                    if fieldfile.name in done and not options['force']:
+                        continue
+                    try:
+                        generate_derivatives(fieldfile, force=True)
+                    except (OSError, UnidentifiedImageError) as e:
+                        failed += 1
+                        self.stdout.write(self.style.WARNING(f'⚠️ Skipped {fieldfile.name}: {e}'))
+                        continue
+                    done.add(fieldfile.name)
+                    generated += 1
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Generated variants for {generated} images ({failed} failed)'))
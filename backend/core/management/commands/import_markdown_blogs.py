@@ -3,9 +3,15 @@ import re
 import yaml
 from datetime import datetime
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.text import slugify
 from django.contrib.auth.models import User
 from core.models import BlogPost, Category, Tag
+from core.autobuild import mark_dirty
+from core.response_cache import invalidate
+from core.search.documents import index_objects
 
 
 class Command(BaseCommand):
@@ -36,27 +42,32 @@ class Command(BaseCommand):
             defaults={'email': 'admin@gcadr.gnlu.ac.in'}
         )
         
-        imported_count = 0
-        
-        # Process all markdown files
-        for filename in os.listdir(content_dir):
+        # Parse every file first so the database work can be done in bulk
+        parsed_posts = {}
+        for filename in sorted(os.listdir(content_dir)):
             if filename.endswith('.md'):
                 filepath = os.path.join(content_dir, filename)
                 try:
-                    self.import_blog_post(filepath, default_author)
-                    imported_count += 1
-                    self.stdout.write(f'✅ Imported: {filename}')
+                    post = self.parse_blog_post(filepath)
+                    parsed_posts[post['slug']] = post
                 except Exception as e:
                     self.stdout.write(
                         self.style.ERROR(f'❌ Failed to import {filename}: {str(e)}')
                     )
         
+        created_count, updated_count = self.import_blog_posts(list(parsed_posts.values()), default_author)
+        for post in parsed_posts.values():
+            self.stdout.write(f'✅ Imported: {post["filename"]}')
+        
         self.stdout.write(
-            self.style.SUCCESS(f'🎉 Successfully imported {imported_count} blog posts!')
+            self.style.SUCCESS(
+                f'🎉 Successfully imported {len(parsed_posts)} blog posts '
+                f'({created_count} created, {updated_count} updated)!'
+            )
         )
 
-    def import_blog_post(self, filepath, default_author):
-        """Import a single markdown blog post"""
+    def parse_blog_post(self, filepath):
+        """Parse a single markdown blog post into field values"""
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
         
@@ -66,9 +77,6 @@ class Command(BaseCommand):
         # Extract metadata
         title = frontmatter.get('title', os.path.basename(filepath).replace('.md', ''))
         slug = frontmatter.get('slug', slugify(title))
-        published = frontmatter.get('published', True)
-        featured = frontmatter.get('featured', False)
-        excerpt = frontmatter.get('excerpt', self.generate_excerpt(markdown_content))
         
         # Handle date
         date_str = frontmatter.get('date')
@@ -80,53 +88,111 @@ class Command(BaseCommand):
         else:
             published_date = datetime.now()
         
-        # Handle author
-        author_name = frontmatter.get('author')
-        if author_name and author_name != 'admin':
-            author = None
-            author_name_field = author_name
-        else:
-            author = default_author
-            author_name_field = ''
-        
-        # Create or update blog post
-        blog_post, created = BlogPost.objects.update_or_create(
-            slug=slug,
-            defaults={
+        return {
+            'filename': os.path.basename(filepath),
+            'slug': slug,
+            'fields': {
                 'title': title,
                 'content': markdown_content,
-                'excerpt': excerpt,
-                'published': published,
-                'featured': featured,
-                'author': author,
-                'author_name': author_name_field,
+                'excerpt': frontmatter.get('excerpt', self.generate_excerpt(markdown_content)),
+                'published': frontmatter.get('published', True),
+                'featured': frontmatter.get('featured', False),
                 'published_date': published_date,
-            }
+            },
+            'author_name': frontmatter.get('author'),
+            'category': frontmatter.get('category'),
+            'tags': frontmatter.get('tags') or [],
+        }
+
+    @transaction.atomic
+    def import_blog_posts(self, parsed_posts, default_author):
+        """
+        Create or update all parsed posts with set-based queries: one lookup
+        of existing posts, bulk_create/bulk_update for the posts, bulk
+        resolution of categories and tags, and one delete plus one insert
+        on the tags through table. Returns ``(created, updated)`` counts.
+        """
+        categories = self.get_or_create_by_name(
+            Category, {post['category'] for post in parsed_posts if post['category']}
+        )
+        tags = self.get_or_create_by_name(
+            Tag, {name for post in parsed_posts for name in post['tags']}
         )
         
-        # Handle category
-        category_name = frontmatter.get('category')
-        if category_name:
-            category, _ = Category.objects.get_or_create(
-                name=category_name,
-                defaults={'slug': slugify(category_name)}
-            )
-            blog_post.category = category
-        
-        # Handle tags
-        tags = frontmatter.get('tags', [])
-        if tags:
-            blog_post.tags.clear()
-            for tag_name in tags:
-                tag, _ = Tag.objects.get_or_create(
-                    name=tag_name,
-                    defaults={'slug': slugify(tag_name)}
-                )
-                blog_post.tags.add(tag)
-        
-        blog_post.save()
-        
-        return blog_post
+        existing = BlogPost.objects.in_bulk([post['slug'] for post in parsed_posts], field_name='slug')
+        now = timezone.now()
+        to_create, to_update = [], []
+        
+        for post in parsed_posts:
+            blog_post = existing.get(post['slug']) or BlogPost(slug=post['slug'])
+            for field, value in post['fields'].items():
+                setattr(blog_post, field, value)
+            
+            # Handle author
+            author_name = post['author_name']
+            if author_name and author_name != 'admin':
+                blog_post.author = None
+                blog_post.author_name = author_name
+            else:
+                blog_post.author = default_author
+                blog_post.author_name = ''
+            
+            # Only touch the category when the frontmatter sets one
+            if post['category']:
+                blog_post.category = categories[post['category']]
+            
+            if post['slug'] in existing:
+                blog_post.updated_at = now
+                to_update.append(blog_post)
+            else:
+                to_create.append(blog_post)
+            post['instance'] = blog_post
+        
+        BlogPost.objects.bulk_create(to_create)
+        BlogPost.objects.bulk_update(to_update, [
+            'title', 'content', 'excerpt', 'published', 'featured', 'author', 'author_name',
+            'published_date', 'category', 'updated_at',
+        ])
+        
+        # Replace tags only for posts whose frontmatter lists some
+        tagged = [post for post in parsed_posts if post['tags']]
+        through = BlogPost.tags.through
+        through.objects.filter(blogpost__in=[post['instance'] for post in tagged]).delete()
+        through.objects.bulk_create([
+            through(blogpost=post['instance'], tag=tag)
+            for post in tagged for tag in dict.fromkeys(tags[name] for name in post['tags'])
+        ])
+        
+        # Bulk writes bypass the model signals, so refresh the search documents,
+        # retire cached responses and schedule the static rebuild here
+        index_objects(BlogPost, [post['instance'].pk for post in parsed_posts])
+        invalidate(BlogPost, Category, Tag)
+        mark_dirty(BlogPost, Category, Tag)
+        
+        return len(to_create), len(to_update)
+
+    def get_or_create_by_name(self, model, names):
+        """
+        Return ``{name: instance}``, bulk-creating the missing ones. Names
+        are matched on their slug too, so "ADR" reuses an existing "adr"
+        instead of colliding with its unique slug.
+        """
+        if not names:
+            return {}
+        slugs = {name: slugify(name) for name in names}
+        existing = list(model.objects.filter(Q(name__in=names) | Q(slug__in=set(slugs.values()))))
+        by_name = {obj.name: obj for obj in existing}
+        by_slug = {obj.slug: obj for obj in existing}
+        
+        found, missing = {}, {}
+        for name in sorted(names):
+            slug = slugs[name]
+            obj = by_name.get(name) or by_slug.get(slug) or missing.get(slug)
+            if obj is None:
+                obj = missing[slug] = model(name=name, slug=slug)
+            found[name] = obj
+        model.objects.bulk_create(missing.values())
+        return found
 
     def parse_frontmatter(self, content):
         """Parse YAML frontmatter from markdown content"""
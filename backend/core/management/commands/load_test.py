@@ -0,0 +1,149 @@
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# One process each, so the numbers are per-process capacity
+SERVERS = {
+    'wsgi': lambda port: [
+        sys.executable, '-m', 'gunicorn', 'core.management.commands.load_test:wsgi_application',
+        '--workers', '1', '--bind', f'127.0.0.1:{port}', '--log-level', 'warning',
+    ],
+    'asgi': lambda port: [
+        sys.executable, '-m', 'uvicorn', 'core.management.commands.load_test:asgi_application',
+        '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning',
+    ],
+}
+
+
+def add_simulated_latency(application):
+    """
+    Delay every query by LOAD_TEST_DB_LATENCY seconds, like a database on
+    another host, so requests spend their time waiting on I/O as they do in
+    production rather than on a local SQLite file
+    """
+    from django.db.backends.signals import connection_created
+
+    latency = float(os.environ.get('LOAD_TEST_DB_LATENCY', 0))
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def connected(sender, connection, **kwargs):
+        if latency:
+            connection.execute_wrappers.append(delay)
+
+    connection_created.connect(connected, weak=False)
+    return application
+
+
+def __getattr__(name):
+    # Imported by the servers started below, not by manage.py
+    if name == 'wsgi_application':
+        from gcadr_backend.wsgi import application
+        return add_simulated_latency(application)
+    if name == 'asgi_application':
+        from gcadr_backend.asgi import application
+        return add_simulated_latency(application)
+    raise AttributeError(name)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        'Start the app under gunicorn (WSGI, one sync worker) and uvicorn (ASGI, one process) and '
+        'compare how many requests per second each serves to concurrent clients, with the '
+        'response cache off and a simulated database round trip on every query'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=SERVERS, action='append', help='Server to test; repeatable (default: both)')
+        parser.add_argument('--path', default='/api/home/', help='Endpoint to request')
+        parser.add_argument('--concurrency', type=int, default=20, help='Clients sending requests at once')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per server')
+        parser.add_argument(
+            '--db-latency',
+            type=float,
+            default=0.005,
+            help='Seconds added to every query, the round trip to a database on another host'
+        )
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, RESPONSE_CACHE_TIMEOUT='0', LOAD_TEST_DB_LATENCY=str(options['db_latency']))
+        self.stdout.write(
+            f'{options["requests"]} x GET {options["path"]}, {options["concurrency"]} at a time, '
+            f'{options["db_latency"] * 1000:.0f} ms per query'
+        )
+
+        for name in options['server'] or list(SERVERS):
+            port = free_port()
+            try:
+                server = subprocess.Popen(SERVERS[name](port), cwd=settings.BASE_DIR, env=env)
+            except OSError as e:
+                raise CommandError(f'Could not start the {name} server: {e}')
+            try:
+                self.wait_for(port, server)
+                latencies, statuses, elapsed = asyncio.run(self.load(port, options))
+            finally:
+                server.terminate()
+                server.wait()
+
+            failed = sum(1 for status in statuses if status != 200)
+            latencies.sort()
+            self.stdout.write(
+                f'{name}: {len(latencies) / elapsed:7.1f} req/s  '
+                f'p50 {statistics.median(latencies) * 1000:6.0f} ms  '
+                f'p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:6.0f} ms  '
+                f'({failed} not 200)'
+            )
+
+        self.stdout.write(self.style.SUCCESS('✅ Load test finished'))
+
+    def wait_for(self, port, server, timeout=30):
+        """Wait until the server answers HTTP, so start-up isn't timed"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError('Server exited during startup (is it installed?)')
+            if asyncio.run(self.fetch(port, '/api/tags/'))[1]:
+                return
+            time.sleep(0.2)
+        raise CommandError(f'Server did not start on port {port}')
+
+    async def fetch(self, port, path):
+        """``(seconds, status)`` of one GET; status 0 when the connection failed"""
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            status = int(response.split(b' ', 2)[1])
+        except (OSError, IndexError, ValueError):
+            status = 0
+        return time.perf_counter() - start, status
+
+    async def load(self, port, options):
+        remaining = iter(range(options['requests']))
+        results = []
+
+        async def client():
+            for _ in remaining:
+                results.append(await self.fetch(port, options['path']))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+        elapsed = time.perf_counter() - start
+        return [latency for latency, _status in results], [status for _latency, status in results], elapsed
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.search.backends import get_backend_class, vendor_backend_class
+from core.search.documents import DOCUMENT_TYPES, index_objects
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild search documents and the full-text index for all searchable content, reinstalling "
+        "the database's own index if it is missing"
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding search index...')
+        
+        with transaction.atomic():
+            for model in DOCUMENT_TYPES:
+                count = index_objects(model)
+                self.stdout.write(f'🔎 Indexed {count} {model._meta.verbose_name_plural}')
+        
+        # The database's index is kept even when SEARCH_BACKEND points elsewhere,
+        # so switching back to it needs no migration
+        for backend in dict.fromkeys([vendor_backend_class(), get_backend_class()]):
+            backend.rebuild()
+        
+        self.stdout.write(self.style.SUCCESS('✅ Search index rebuilt!'))
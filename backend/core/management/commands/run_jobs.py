@@ -0,0 +1,82 @@
+import signal
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from core.jobs import DEFAULT_QUEUE, claim_next, requeue_stale, run_job, worker_name
+from core.direct_uploads import sweep_unfinalized_uploads
+from core.uploads import purge_staged_uploads
+
+# Seconds between sweeps for uploads nobody will store or finalize
+PURGE_INTERVAL = 60 * 60
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (static builds, image variants, uploads) from the database job table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue',
+            action='append',
+            help='Queue to take jobs from; repeatable (default: default)'
+        )
+        parser.add_argument('--once', action='store_true', help='Exit when no job is due instead of polling')
+        parser.add_argument('--poll-interval', type=float, default=2, help='Seconds to sleep when the queue is empty')
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=60 * 60,
+            help='Seconds after which a running job is assumed orphaned by a dead worker and requeued'
+        )
+        parser.add_argument(
+            '--purge-staged-after',
+            type=int,
+            default=7 * 24 * 60 * 60,
+            help='Seconds a staged upload whose store job failed is kept (for a retry from the admin) before it is deleted'
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        previous = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        worker = worker_name()
+        stale_after = timedelta(seconds=options['stale_after'])
+        purge_after = timedelta(seconds=options['purge_staged_after'])
+        queues = options['queue'] or [DEFAULT_QUEUE]
+        next_purge = 0
+        self.stdout.write(f'👷 Worker {worker} waiting for jobs on {", ".join(queues)}...')
+
+        while not self.stopping:
+            close_old_connections()
+            requeued = requeue_stale(stale_after)
+            if requeued:
+                self.stdout.write(self.style.WARNING(f'⚠️ Requeued {requeued} stale jobs'))
+            if time.monotonic() >= next_purge:
+                next_purge = time.monotonic() + PURGE_INTERVAL
+                purged = purge_staged_uploads(purge_after)
+                if purged:
+                    self.stdout.write(self.style.WARNING(f'🗑️ Purged {purged} staged uploads nobody will store'))
+                swept = sweep_unfinalized_uploads()
+                if swept:
+                    self.stdout.write(self.style.WARNING(f'🗑️ Removed {swept} direct uploads never finalized'))
+
+            job = claim_next(worker, queues)
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'▶️ {job.task} #{job.pk}')
+            job = run_job(job)
+            if job.status == 'succeeded':
+                self.stdout.write(self.style.SUCCESS(f'✅ {job.task} #{job.pk} finished'))
+            else:
+                self.stdout.write(self.style.ERROR(f'❌ {job.task} #{job.pk}: {job.message}'))
+
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        self.stdout.write('👋 Worker stopped')
+
+    def stop(self, signum, frame):
+        # Finish the current job, then exit
+        self.stopping = True
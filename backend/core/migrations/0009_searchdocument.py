@@ -0,0 +1,84 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:20
+
+from django.db import DatabaseError, migrations, models
+import uuid
+
+
+# The database's own index, not the SEARCH_BACKEND setting's: that can
+# change after migrating, and rebuild_search_index repairs a missing index.
+# The SQL is copied from core.search.backends as it stood for this
+# migration, so later changes to the app can't alter its history.
+INSTALL_SQL = {
+    'postgresql': [
+        "ALTER TABLE core_searchdocument ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED",
+        "CREATE INDEX IF NOT EXISTS core_searchdocument_search_vector_idx "
+        "ON core_searchdocument USING GIN (search_vector)",
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS core_searchdocument_fts USING fts5("
+        "title, body, content='core_searchdocument', content_rowid='rowid', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS core_searchdocument_ai AFTER INSERT ON core_searchdocument BEGIN "
+        "INSERT INTO core_searchdocument_fts(rowid, title, body) VALUES (new.rowid, new.title, new.body); END",
+        "CREATE TRIGGER IF NOT EXISTS core_searchdocument_ad AFTER DELETE ON core_searchdocument BEGIN "
+        "INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body) "
+        "VALUES ('delete', old.rowid, old.title, old.body); END",
+        "CREATE TRIGGER IF NOT EXISTS core_searchdocument_au AFTER UPDATE ON core_searchdocument BEGIN "
+        "INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body) "
+        "VALUES ('delete', old.rowid, old.title, old.body); "
+        "INSERT INTO core_searchdocument_fts(rowid, title, body) VALUES (new.rowid, new.title, new.body); END",
+    ],
+}
+
+# The Postgres column and index go away with the table
+UNINSTALL_SQL = {
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS core_searchdocument_ai",
+        "DROP TRIGGER IF EXISTS core_searchdocument_ad",
+        "DROP TRIGGER IF EXISTS core_searchdocument_au",
+        "DROP TABLE IF EXISTS core_searchdocument_fts",
+    ],
+}
+
+
+def install_search_index(apps, schema_editor):
+    try:
+        for statement in INSTALL_SQL.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    except DatabaseError:
+        # No FTS5 in this SQLite build; searches use the simple fallback
+        pass
+
+
+def uninstall_search_index(apps, schema_editor):
+    for statement in UNINSTALL_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_newsletterarchive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('document_type', models.CharField(choices=[('blog', 'Blog Post'), ('event', 'Event'), ('announcement', 'Announcement'), ('newsletter', 'Newsletter')], max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('title', models.CharField(max_length=200)),
+                ('body', models.TextField(blank=True)),
+                ('is_public', models.BooleanField(default=True)),
+            ],
+            options={
+                'unique_together': {('document_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-is_featured', '-published_date', 'order'], name='announcement_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-created_at'], name='blog_published_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('featured', True), ('published', True)), fields=['-created_at'], name='blog_featured_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('published', True)), fields=['category', '-created_at'], name='blog_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carouselimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', '-created_at'], name='carousel_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('published', True)), fields=['start_date'], name='event_published_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('featured', True), ('published', True)), fields=['start_date'], name='event_featured_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('published', True)), fields=['event_type', 'start_date'], name='event_type_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-created_at'], name='gallery_published_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(condition=models.Q(('active', True)), fields=['order', 'name'], name='team_active_order_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_published_start_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('published', True)), fields=['-published_date', '-id'], name='blog_published_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('published', True)), fields=['start_date', 'id'], name='event_published_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['-applied_at', '-id'], name='internship_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['status', '-applied_at', '-id'], name='internship_status_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['-submitted_at', '-id'], name='submission_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['status', '-submitted_at', '-id'], name='submission_status_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:32
+
+from django.db import migrations, models
+
+
+def backfill_gallery_stats(apps, schema_editor):
+    Gallery = apps.get_model('core', 'Gallery')
+    Image = apps.get_model('core', 'Image')
+    for gallery in Gallery.objects.all():
+        images = Image.objects.filter(gallery=gallery).order_by('-created_at')
+        newest = images.values_list('image', flat=True).first()
+        gallery.image_count = images.count()
+        gallery.cover_thumbnail = gallery.cover_image.name or newest or ''
+        gallery.save(update_fields=['image_count', 'cover_thumbnail'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gallery',
+            name='cover_thumbnail',
+            field=models.ImageField(blank=True, editable=False, help_text='Cover image, or the newest image when no cover is set', upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_gallery_stats, migrations.RunPython.noop),
+    ]
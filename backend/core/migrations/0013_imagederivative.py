@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:35
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_gallery_image_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageDerivative',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('source', models.CharField(help_text='Storage name of the original image', max_length=255, unique=True)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('widths', models.JSONField(default=list, help_text='Widths of the generated variants')),
+                ('placeholder', models.TextField(blank=True, help_text='Tiny blurred preview as a data URI')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.16 on 2026-10-18 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_job_queue'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_due_idx',
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='queue',
+            field=models.CharField(default='default', help_text="Workers claim from 'default' and from their own host's queue (jobs needing local files)", max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['queue', 'run_after', 'created_at'], name='job_due_idx'),
+        ),
+    ]
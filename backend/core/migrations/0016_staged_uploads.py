@@ -0,0 +1,44 @@
+# Generated by Django 4.2.16 on 2026-10-18 15:07
+
+from django.db import migrations, models
+from django.utils import timezone
+import uuid
+
+
+def fail_host_queue_jobs(apps, schema_editor):
+    # Uploads used to be staged on the web machine's disk and stored from a
+    # per-host queue; those files don't survive a deploy, so the jobs can't run
+    Job = apps.get_model('core', 'Job')
+    Job.objects.filter(queue__startswith='host:', status__in=['pending', 'running']).update(
+        status='failed', finished_at=timezone.now(),
+        message='Staged file was on a replaced machine\'s disk; the upload has to be sent again',
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_job_queues'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StagedUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(help_text='Original file name', max_length=255)),
+                ('data', models.BinaryField()),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='queue',
+            field=models.CharField(default='default', help_text="Workers claim from the queues they are started with ('default' unless told otherwise)", max_length=100),
+        ),
+        migrations.RunPython(fail_host_queue_jobs, migrations.RunPython.noop),
+    ]
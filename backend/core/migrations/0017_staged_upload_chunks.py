@@ -0,0 +1,50 @@
+# Generated by Django 4.2.16 on 2026-10-18 15:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def move_data_to_chunks(apps, schema_editor):
+    # Uploads staged before the split still wait for their store jobs
+    StagedUpload = apps.get_model('core', 'StagedUpload')
+    StagedUploadChunk = apps.get_model('core', 'StagedUploadChunk')
+    for upload in StagedUpload.objects.iterator(chunk_size=1):
+        data = bytes(upload.data)
+        StagedUploadChunk.objects.create(upload=upload, index=0, data=data)
+        StagedUpload.objects.filter(pk=upload.pk).update(size=len(data))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_staged_uploads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stagedupload',
+            name='size',
+            field=models.PositiveBigIntegerField(default=0, help_text='Bytes staged so far'),
+        ),
+        migrations.CreateModel(
+            name='StagedUploadChunk',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('index', models.PositiveIntegerField()),
+                ('data', models.BinaryField()),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='core.stagedupload')),
+            ],
+            options={
+                'ordering': ['index'],
+                'unique_together': {('upload', 'index')},
+            },
+        ),
+        migrations.RunPython(move_data_to_chunks, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='stagedupload',
+            name='data',
+        ),
+    ]
@@ -54,6 +54,25 @@ class BlogPost(BaseModel):
 
     class Meta:
         ordering = ['-created_at']
+        # Partial indexes on the public filters: booleans are compared as bare
+        # columns, which SQLite can only match against an index condition
+        indexes = [
+            # published=True [featured=True] [category=...] ORDER BY -created_at
+            models.Index(fields=['-created_at'], name='blog_published_created_idx', condition=models.Q(published=True)),
+            models.Index(
+                fields=['-created_at'], name='blog_featured_created_idx',
+                condition=models.Q(published=True, featured=True)
+            ),
+            models.Index(
+                fields=['category', '-created_at'], name='blog_category_created_idx',
+                condition=models.Q(published=True)
+            ),
+            # Keyset pages (?cursor=) seek on (published_date, id)
+            models.Index(
+                fields=['-published_date', '-id'], name='blog_published_date_id_idx',
+                condition=models.Q(published=True)
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -105,6 +124,19 @@ class Event(BaseModel):
 
     class Meta:
         ordering = ['start_date']
+        indexes = [
+            # published=True [featured=True] [event_type=...] [start_date >= now] ORDER BY start_date
+            # Includes id so keyset pages (?cursor=) seek on (start_date, id)
+            models.Index(fields=['start_date', 'id'], name='event_published_start_idx', condition=models.Q(published=True)),
+            models.Index(
+                fields=['start_date'], name='event_featured_start_idx',
+                condition=models.Q(published=True, featured=True)
+            ),
+            models.Index(
+                fields=['event_type', 'start_date'], name='event_type_start_idx',
+                condition=models.Q(published=True)
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -117,9 +149,19 @@ class Gallery(BaseModel):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='galleries')
     cover_image = models.ImageField(upload_to='gallery_covers/', blank=True, null=True)
 
+    # Denormalized from the images (see core.signals) so gallery listings
+    # need no per-gallery count or image lookup
+    image_count = models.PositiveIntegerField(default=0, editable=False)
+    cover_thumbnail = models.ImageField(
+        blank=True, editable=False, help_text="Cover image, or the newest image when no cover is set"
+    )
+
     class Meta:
         verbose_name_plural = "Galleries"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='gallery_published_created_idx', condition=models.Q(published=True)),
+        ]
 
     def __str__(self):
         return self.title
@@ -187,6 +229,11 @@ class Submission(BaseModel):
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            # Staff review queue, optionally by status, keyset paginated on (submitted_at, id)
+            models.Index(fields=['-submitted_at', '-id'], name='submission_queue_idx'),
+            models.Index(fields=['status', '-submitted_at', '-id'], name='submission_status_queue_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author_name}"
@@ -217,6 +264,11 @@ class Internship(BaseModel):
 
     class Meta:
         ordering = ['-applied_at']
+        indexes = [
+            # Staff review queue, optionally by status, keyset paginated on (applied_at, id)
+            models.Index(fields=['-applied_at', '-id'], name='internship_queue_idx'),
+            models.Index(fields=['status', '-applied_at', '-id'], name='internship_status_queue_idx'),
+        ]
 
     def __str__(self):
         return f"{self.applicant_name} - {self.university}"
@@ -249,6 +301,9 @@ class TeamMember(BaseModel):
 
     class Meta:
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['order', 'name'], name='team_active_order_idx', condition=models.Q(active=True)),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.get_role_display()}"
@@ -289,6 +344,13 @@ class Announcement(BaseModel):
 
     class Meta:
         ordering = ['-is_featured', '-published_date', 'order']
+        indexes = [
+            # Column directions match the default ordering so it is a plain index scan
+            models.Index(
+                fields=['-is_featured', '-published_date', 'order'], name='announcement_active_order_idx',
+                condition=models.Q(is_active=True)
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -304,6 +366,12 @@ class CarouselImage(BaseModel):
 
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(
+                fields=['order', '-created_at'], name='carousel_active_order_idx',
+                condition=models.Q(is_active=True)
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -323,3 +391,104 @@ class NewsletterArchive(BaseModel):
 
     def __str__(self):
         return f"{self.title} - {self.issue_number}"
+
+
+class SearchDocument(BaseModel):
+    """
+    Denormalized, searchable text for one piece of public content. Kept in
+    sync by the signal handlers in ``core.search.signals``; the database
+    specific full-text index over it is managed by ``core.search.backends``.
+    """
+    DOCUMENT_TYPES = [
+        ('blog', 'Blog Post'),
+        ('event', 'Event'),
+        ('announcement', 'Announcement'),
+        ('newsletter', 'Newsletter'),
+    ]
+
+    document_type = models.CharField(max_length=20, choices=DOCUMENT_TYPES)
+    object_id = models.UUIDField()
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    is_public = models.BooleanField(default=True)
+
+    class Meta:
+        unique_together = [('document_type', 'object_id')]
+
+    def __str__(self):
+        return f"{self.get_document_type_display()}: {self.title}"
+
+
+class ImageDerivative(BaseModel):
+    """Resized WebP/JPEG variants and blur placeholder of one uploaded image (see core.images)"""
+    source = models.CharField(max_length=255, unique=True, help_text="Storage name of the original image")
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    widths = models.JSONField(default=list, help_text="Widths of the generated variants")
+    placeholder = models.TextField(blank=True, help_text="Tiny blurred preview as a data URI")
+
+    def __str__(self):
+        return self.source
+
+
+class StagedUpload(BaseModel):
+    """A form upload waiting for a job worker to copy it to media storage (see core.uploads)"""
+    name = models.CharField(max_length=255, help_text="Original file name")
+    size = models.PositiveBigIntegerField(default=0, help_text="Bytes staged so far")
+
+    def __str__(self):
+        return self.name
+
+
+class StagedUploadChunk(BaseModel):
+    """One piece of a StagedUpload's bytes, so no single write holds the whole file"""
+    upload = models.ForeignKey(StagedUpload, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    data = models.BinaryField()
+
+    class Meta:
+        ordering = ['index']
+        unique_together = ['upload', 'index']
+
+
+class Job(BaseModel):
+    """A unit of background work (see core.jobs), run by the run_jobs worker"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    task = models.CharField(max_length=100)
+    queue = models.CharField(
+        max_length=100, default='default',
+        help_text="Workers claim from the queues they are started with ('default' unless told otherwise)"
+    )
+    arguments = models.JSONField(default=dict, blank=True)
+    dedup_key = models.CharField(max_length=64, help_text="Hash of task and arguments")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    message = models.CharField(max_length=255, blank=True)
+    log = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    worker = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The worker's "next due job" query
+            models.Index(fields=['queue', 'run_after', 'created_at'], name='job_due_idx', condition=models.Q(status='pending')),
+        ]
+        constraints = [
+            # At most one identical job waiting at a time
+            models.UniqueConstraint(fields=['dedup_key'], condition=models.Q(status='pending'), name='job_pending_dedup'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} ({self.get_status_display()})"
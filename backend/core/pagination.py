@@ -0,0 +1,202 @@
+"""
+Keyset pagination for the long listings.
+
+``PageNumberPagination`` counts every row and then OFFSETs through the
+previous pages, so deep pages get slower the further in they are. Passing
+``?cursor=`` switches a list to keyset mode: the page is the next
+``page_size`` rows after the last one seen, found by seeking the
+``(ordering field, id)`` index, so every page costs the same. Add
+``count=false`` to skip the total count as well; the ETag is then computed
+from the page's rows rather than the whole listing. ``page_size`` (up to
+100) sets the page length in keyset mode.
+
+Without ``cursor`` the page number API keeps working unchanged.
+"""
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """Page numbers by default, keyset pages on ``ordering`` when ``cursor`` is given"""
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    # Sort field, e.g. '-published_date'; ties are broken on the primary key
+    ordering = '-created_at'
+
+    def get_page_size(self, request):
+        # Client page sizes only in keyset mode; page numbers stay as they were
+        if self.cursor_query_param not in request.query_params:
+            return self.page_size
+        return super().get_page_size(request)
+
+    def get_validator_queryset(self, queryset, request):
+        """
+        Rows the conditional GET validators of ``request`` are computed
+        from: the page window (plus the row that decides ``next``) for an
+        uncounted keyset page, so no query scans past the page
+        """
+        if self.cursor_query_param not in request.query_params:
+            return queryset
+        try:
+            window, _position, _reverse = self.keyset_window(queryset, request)
+        except NotFound:
+            # The view answers with the 404
+            return queryset
+        if self.counted:
+            return queryset
+        return window[:self.page_size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        window, position, reverse = self.keyset_window(queryset, request)
+        self.count = queryset.count() if self.counted else None
+        # One extra row tells whether there is another page in this direction
+        return self.keyset_page(list(window[:self.page_size + 1]), position, reverse)
+
+    async def apaginate_keyset(self, queryset, request):
+        """Keyset branch of ``paginate_queryset`` on the async ORM"""
+        window, position, reverse = self.keyset_window(queryset, request)
+        self.count = await queryset.acount() if self.counted else None
+        return self.keyset_page([row async for row in window[:self.page_size + 1]], position, reverse)
+
+    def keyset_window(self, queryset, request):
+        """``(rows after the cursor in page order, cursor position, reverse)``; runs no query"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field = self.ordering.lstrip('-')
+        self.descending = self.ordering.startswith('-')
+        self.counted = request.query_params.get(self.count_query_param, '').lower() not in ('false', '0')
+
+        position, reverse = self.decode_cursor(request, queryset.model)
+        descending = self.descending != reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.field}', f'{prefix}pk')
+        if position is not None:
+            queryset = queryset.filter(self.after(position, descending))
+        return queryset, position, reverse
+
+    def keyset_page(self, rows, position, reverse):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.rows = rows
+        return rows
+
+    def after(self, position, descending):
+        value, pk = position
+        lookup = 'lt' if descending else 'gt'
+        return Q(**{f'{self.field}__{lookup}': value}) | Q(**{self.field: value, f'pk__{lookup}': pk})
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            value, pk, reverse = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position = (
+                model._meta.get_field(self.field).to_python(value),
+                model._meta.pk.to_python(pk),
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound('Invalid cursor.')
+        return position, bool(reverse)
+
+    def encode_cursor(self, row, reverse):
+        # Rows are model instances, or values() dicts from the fast serializers
+        if isinstance(row, dict):
+            value, pk = row[self.field], row['id']
+        else:
+            value, pk = getattr(row, self.field), row.pk
+        data = json.dumps([value.isoformat(), str(pk), reverse])
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def cursor_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, reverse))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.rows:
+            return None
+        return self.cursor_link(self.rows[-1], False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        if not self.rows:
+            return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, '')
+        return self.cursor_link(self.rows[0], True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+async def apaginate_queryset(paginator, queryset, request):
+    """
+    ``paginator.paginate_queryset()`` for async views: the same page, links
+    and errors, with the count and the rows read through the async ORM
+    """
+    if isinstance(paginator, KeysetPagination):
+        paginator.keyset = paginator.cursor_query_param in request.query_params
+        if paginator.keyset:
+            return await paginator.apaginate_keyset(queryset, request)
+
+    paginator.request = request
+    page_size = paginator.get_page_size(request)
+    if not page_size:
+        return None
+    django_paginator = paginator.django_paginator_class(queryset, page_size)
+    # Paginator.count is a cached property, so the sync count() never runs
+    django_paginator.count = await queryset.acount()
+    page_number = paginator.get_page_number(request, django_paginator)
+    try:
+        paginator.page = django_paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+    if django_paginator.num_pages > 1 and paginator.template is not None:
+        paginator.display_page_controls = True
+    paginator.page.object_list = [row async for row in paginator.page.object_list]
+    return list(paginator.page)
+
+
+class BlogPostPagination(KeysetPagination):
+    ordering = '-published_date'
+
+
+class EventPagination(KeysetPagination):
+    ordering = 'start_date'
+
+
+class SubmissionPagination(KeysetPagination):
+    ordering = '-submitted_at'
+
+
+class InternshipPagination(KeysetPagination):
+    ordering = '-applied_at'
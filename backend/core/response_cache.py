@@ -0,0 +1,188 @@
+"""
+Versioned response cache for the public read endpoints.
+
+Each cached response is keyed by the request path, its normalized query
+parameters and the current generation of every model the response is built
+from. Saving or deleting one of those models bumps its generation, so stale
+entries are never read again and simply expire from the cache.
+"""
+import functools
+import hashlib
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework.response import Response
+from .models import (
+    Category, Tag, BlogPost, Event, Gallery, Image, TeamMember, Leadership,
+    Announcement, CarouselImage, NewsletterArchive, ImageDerivative
+)
+
+CACHED_MODELS = [
+    Category, Tag, BlogPost, Event, Gallery, Image, TeamMember, Leadership,
+    Announcement, CarouselImage, NewsletterArchive, User, ImageDerivative
+]
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def generation_key(model):
+    return f'generation:{model._meta.label_lower}'
+
+
+def get_generations(models):
+    """Current generation of each model, in the order given"""
+    cache = get_cache()
+    keys = [generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # Seed from the clock so an evicted counter never comes back
+            # at a value that older entries were cached under
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+async def aget_generations(models):
+    """``get_generations`` on the cache's async API, for async views"""
+    cache = get_cache()
+    keys = [generation_key(model) for model in models]
+    generations = await cache.aget_many(keys)
+    for key in keys:
+        if key not in generations:
+            await cache.aadd(key, time.time_ns(), None)
+            generations[key] = await cache.aget(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generations(*models):
+    cache = get_cache()
+    for model in models:
+        key = generation_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate(*models):
+    """Bump now, and again once the surrounding transaction commits"""
+    bump_generations(*models)
+    # A request that read the old rows before commit may have cached them
+    # under the new generation; the second bump retires that entry
+    transaction.on_commit(lambda: bump_generations(*models))
+
+
+def response_cache_key(request, models):
+    return make_cache_key(request, get_generations(models))
+
+
+async def aresponse_cache_key(request, models):
+    return make_cache_key(request, await aget_generations(models))
+
+
+def make_cache_key(request, generations):
+    params = sorted((key, sorted(request.GET.getlist(key))) for key in request.GET)
+    # Host is part of the key because file fields render as absolute URLs
+    raw = f'{request.build_absolute_uri(request.path)}|{params}|{generations}'
+    return f'response:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def cache_timeout(request, uncached_params=()):
+    """Seconds to cache the response to ``request``; 0 when one of ``uncached_params`` is given"""
+    if any(param in request.GET for param in uncached_params):
+        return 0
+    return settings.RESPONSE_CACHE_TIMEOUT
+
+
+def cached_get(view_func, request, models, uncached_params=()):
+    """Serve ``view_func(request)`` from the cache, storing successful responses"""
+    timeout = cache_timeout(request, uncached_params)
+    if not timeout:
+        return view_func(request)
+
+    cache = get_cache()
+    key = response_cache_key(request, models)
+    cached = cache.get(key)
+    if cached is not None:
+        return Response(cached)
+
+    response = view_func(request)
+    if response.status_code == 200:
+        cache.set(key, response.data, timeout)
+    return response
+
+
+async def acached_data(request, models, get_data, uncached_params=()):
+    """
+    Async views' counterpart of ``cached_get``: the response data from the
+    cache, or ``await get_data()`` stored for next time. Keys are the same,
+    so sync and async views share entries. The cache is only used through
+    its async API: a database cache can't be queried from the event loop.
+    """
+    timeout = cache_timeout(request, uncached_params)
+    if not timeout:
+        return await get_data()
+
+    cache = get_cache()
+    key = await aresponse_cache_key(request, models)
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
+
+    data = await get_data()
+    await cache.aset(key, data, timeout)
+    return data
+
+
+class CachedResponseMixin:
+    """
+    Cache GET responses of a generic view; set ``cache_models`` to its
+    dependencies and ``uncached_params`` to query parameters whose results
+    change with the clock rather than with the models
+    """
+    cache_models = ()
+    uncached_params = ()
+
+    def get(self, request, *args, **kwargs):
+        parent = super().get
+        return cached_get(
+            lambda request: parent(request, *args, **kwargs), request, self.cache_models, self.uncached_params
+        )
+
+
+def cache_response(*models):
+    """Decorator for ``api_view`` functions, applied below ``@api_view``"""
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view_func(request, *args, **kwargs)
+            return cached_get(lambda request: view_func(request, *args, **kwargs), request, models)
+        return wrapper
+    return decorator
+
+
+# Signal handlers
+
+def model_changed(sender, instance=None, raw=False, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no endpoint exposes
+    if raw or (sender is User and update_fields and set(update_fields) == {'last_login'}):
+        return
+    invalidate(sender)
+
+
+def blog_tags_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate(BlogPost, Tag)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(model_changed, sender=model, dispatch_uid=f'response_cache_save_{model.__name__}')
+    post_delete.connect(model_changed, sender=model, dispatch_uid=f'response_cache_delete_{model.__name__}')
+m2m_changed.connect(blog_tags_changed, sender=BlogPost.tags.through, dispatch_uid='response_cache_blog_tags')
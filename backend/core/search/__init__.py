@@ -0,0 +1,6 @@
+"""
+Full-text search over blog posts, events, announcements and newsletters.
+
+Each searchable object has a ``SearchDocument`` row (see ``documents``)
+that is indexed by a database specific backend (see ``backends``).
+"""
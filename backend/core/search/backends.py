@@ -0,0 +1,221 @@
+import os
+import re
+import threading
+import uuid
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from core.models import SearchDocument
+from core.search.inverted_index import InvertedIndex
+
+TABLE = SearchDocument._meta.db_table
+FTS_TABLE = f'{TABLE}_fts'
+
+
+def tokenize(query):
+    """Split a user query into lowercase word terms"""
+    return re.findall(r'\w+', query.lower())
+
+
+class BaseSearchBackend:
+    """
+    Interface for search backends. ``search`` returns the ids of public
+    objects of ``document_type`` matching every term of ``query`` as a
+    prefix (so partially typed words match), best first.
+    """
+
+    def search(self, query, document_type, limit=5):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        return self.search_terms(terms, document_type, limit)
+
+    def search_terms(self, terms, document_type, limit):
+        raise NotImplementedError
+
+    @classmethod
+    def install(cls, schema_editor):
+        """Create the index structures this backend needs, if missing (run by migrations)"""
+
+    @classmethod
+    def uninstall(cls, schema_editor):
+        """Drop structures that do not go away with the ``SearchDocument`` table"""
+
+    @classmethod
+    def rebuild(cls):
+        """Re-populate the index from the ``SearchDocument`` table, reinstalling it if needed"""
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Portable fallback: unindexed ``icontains`` matching, title hits first"""
+
+    def search_terms(self, terms, document_type, limit):
+        documents = SearchDocument.objects.filter(document_type=document_type, is_public=True)
+        for term in terms:
+            documents = documents.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        ranked = sorted(documents.values_list('object_id', 'title'), key=lambda row: not all(
+            term in row[1].lower() for term in terms
+        ))
+        return [object_id for object_id, _title in ranked[:limit]]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    ``tsvector`` search: a stored generated column (title weighted above
+    body) with a GIN index, ranked by ``ts_rank``.
+    """
+
+    def search_terms(self, terms, document_type, limit):
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT object_id FROM {TABLE}, to_tsquery('english', %s) AS query "
+                f"WHERE document_type = %s AND is_public AND search_vector @@ query "
+                f"ORDER BY ts_rank(search_vector, query) DESC LIMIT %s",
+                [tsquery, document_type, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    def install(cls, schema_editor):
+        schema_editor.execute(
+            f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {TABLE}_search_vector_idx ON {TABLE} USING GIN (search_vector)"
+        )
+
+    @classmethod
+    def rebuild(cls):
+        # The generated column fills itself in once it exists
+        with connection.schema_editor() as schema_editor:
+            cls.install(schema_editor)
+
+
+class SQLiteFTSSearchBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 search over an external-content virtual table kept in sync
+    with ``SearchDocument`` by triggers, ranked by ``bm25`` with title
+    matches weighted above body matches. Tokens are not stemmed: FTS5
+    prefix queries are matched against stored tokens, so stemming would
+    stop partially typed words from matching.
+    """
+
+    def search_terms(self, terms, document_type, limit):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT d.object_id FROM {FTS_TABLE} f JOIN {TABLE} d ON d.rowid = f.rowid "
+                    f"WHERE {FTS_TABLE} MATCH %s AND d.document_type = %s AND d.is_public "
+                    f"ORDER BY bm25({FTS_TABLE}, 10.0, 1.0) LIMIT %s",
+                    [match, document_type, limit]
+                )
+                rows = cursor.fetchall()
+        except DatabaseError:
+            # SQLite built without FTS5, or the index was never installed
+            return SimpleSearchBackend().search_terms(terms, document_type, limit)
+        field = SearchDocument._meta.get_field('object_id')
+        return [field.to_python(row[0]) for row in rows]
+
+    @classmethod
+    def install(cls, schema_editor):
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"title, body, content='{TABLE}', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.rowid, new.title, new.body); END",
+            f"CREATE TRIGGER IF NOT EXISTS {TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) "
+            f"VALUES ('delete', old.rowid, old.title, old.body); END",
+            f"CREATE TRIGGER IF NOT EXISTS {TABLE}_au AFTER UPDATE ON {TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) "
+            f"VALUES ('delete', old.rowid, old.title, old.body); "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.rowid, new.title, new.body); END",
+        ]
+        try:
+            for statement in statements:
+                schema_editor.execute(statement)
+        except DatabaseError:
+            # No FTS5 in this SQLite build; searches use the simple fallback
+            pass
+
+    @classmethod
+    def uninstall(cls, schema_editor):
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    @classmethod
+    def rebuild(cls):
+        # Table rebuilds by later migrations drop the triggers and renumber rowids
+        with connection.schema_editor() as schema_editor:
+            cls.install(schema_editor)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+class InvertedIndexSearchBackend(BaseSearchBackend):
+    """
+    Serve blog and event search from the static inverted index written by
+    ``export_static_content`` (``settings.STATIC_SEARCH_INDEX_DIR``), held
+    in memory and reloaded when meta.json changes; it carries a digest of
+    the other index files and is written after them. Other document types
+    fall back to ``SimpleSearchBackend``.
+    """
+    indexed_types = ('blog', 'event')
+    _lock = threading.Lock()
+    _loaded = (None, None)
+
+    @classmethod
+    def get_index(cls):
+        directory = settings.STATIC_SEARCH_INDEX_DIR
+        meta_path = os.path.join(directory, 'meta.json')
+        key = (meta_path, os.stat(meta_path).st_mtime_ns)
+        with cls._lock:
+            if cls._loaded[0] != key:
+                cls._loaded = (key, InvertedIndex.from_files(directory))
+            return cls._loaded[1]
+
+    def search(self, query, document_type, limit=5):
+        if document_type not in self.indexed_types:
+            return SimpleSearchBackend().search(query, document_type, limit)
+        try:
+            index = self.get_index()
+        except (OSError, ValueError):
+            # No export yet; answer from the database instead
+            return SimpleSearchBackend().search(query, document_type, limit)
+        return [uuid.UUID(doc[1]) for doc in index.search(query, document_type, limit)]
+
+
+VENDOR_BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteFTSSearchBackend,
+}
+
+
+def vendor_backend_class(vendor=None):
+    """
+    The native backend for the database vendor. Migrations install its
+    index whatever ``settings.SEARCH_BACKEND`` says, so that setting can be
+    changed without migrating again.
+    """
+    return VENDOR_BACKENDS.get(vendor or connection.vendor, SimpleSearchBackend)
+
+
+def get_backend_class():
+    """
+    The backend named by ``settings.SEARCH_BACKEND`` (a dotted path), or
+    the native one for the database vendor.
+    """
+    path = getattr(settings, 'SEARCH_BACKEND', '')
+    if path:
+        return import_string(path)
+    return vendor_backend_class()
+
+
+def get_search_backend():
+    return get_backend_class()()
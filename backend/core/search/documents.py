@@ -0,0 +1,77 @@
+from core.models import BlogPost, Event, Announcement, NewsletterArchive, SearchDocument
+
+
+def blog_document(post):
+    tags = ' '.join(tag.name for tag in post.tags.all())
+    category = post.category.name if post.category_id else ''
+    return {
+        'title': post.title,
+        'body': '\n'.join([post.excerpt, post.content, category, tags, post.get_author_name()]),
+        'is_public': post.published,
+    }
+
+
+def event_document(event):
+    return {
+        'title': event.title,
+        'body': '\n'.join([event.description, event.content, event.location, event.get_event_type_display()]),
+        'is_public': event.published,
+    }
+
+
+def announcement_document(announcement):
+    return {
+        'title': announcement.title,
+        'body': announcement.content,
+        'is_public': announcement.is_active,
+    }
+
+
+def newsletter_document(newsletter):
+    return {
+        'title': newsletter.title,
+        'body': '\n'.join([newsletter.description, newsletter.issue_number]),
+        'is_public': True,
+    }
+
+
+# model -> (document type, builder, queryset prefetching what the builder reads)
+DOCUMENT_TYPES = {
+    BlogPost: ('blog', blog_document, lambda: BlogPost.objects.select_related('author', 'category').prefetch_related('tags')),
+    Event: ('event', event_document, lambda: Event.objects.select_related('author')),
+    Announcement: ('announcement', announcement_document, lambda: Announcement.objects.all()),
+    NewsletterArchive: ('newsletter', newsletter_document, lambda: NewsletterArchive.objects.all()),
+}
+
+
+def update_document(instance):
+    """Create or refresh the search document for a single object"""
+    document_type, build, _ = DOCUMENT_TYPES[type(instance)]
+    SearchDocument.objects.update_or_create(
+        document_type=document_type, object_id=instance.pk, defaults=build(instance)
+    )
+
+
+def delete_documents(model, object_ids):
+    document_type = DOCUMENT_TYPES[model][0]
+    SearchDocument.objects.filter(document_type=document_type, object_id__in=object_ids).delete()
+
+
+def index_objects(model, object_ids=None):
+    """
+    Rebuild search documents for ``model`` in bulk (all rows, or only
+    ``object_ids``): one query to load the objects plus their relations,
+    one delete and one bulk insert.
+    """
+    document_type, build, queryset = DOCUMENT_TYPES[model]
+    objects = queryset()
+    documents = SearchDocument.objects.filter(document_type=document_type)
+    if object_ids is not None:
+        objects = objects.filter(pk__in=object_ids)
+        documents = documents.filter(object_id__in=object_ids)
+    documents.delete()
+    created = SearchDocument.objects.bulk_create([
+        SearchDocument(document_type=document_type, object_id=obj.pk, **build(obj))
+        for obj in objects
+    ])
+    return len(created)
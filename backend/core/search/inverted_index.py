@@ -0,0 +1,198 @@
+"""
+Compact inverted index for search without a database.
+
+The static exporter builds it over published blog posts and events and
+writes it as a small set of JSON files (see ``InvertedIndex.to_files``):
+
+* ``meta.json``   - format version, document count, average length, shards
+  and a digest of the other files
+* ``docs.json``   - ``[type, id, slug, title, length]`` per document number
+* ``terms-<shard>.json`` - ``{term: postings}`` for terms starting with
+  ``<shard>``; postings are base64 little-endian uint32 arrays of
+  ``[doc delta, term frequency, doc delta, term frequency, ...]``
+
+``InvertedIndex.from_files`` loads the same files so the Django search
+view can answer queries from memory.
+"""
+import base64
+import bisect
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from array import array
+from collections import Counter, defaultdict
+
+INDEX_VERSION = 1
+TITLE_WEIGHT = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has in is it its of on or that the this to was were will with'.split()
+)
+
+# Longest suffixes first; a suffix is only stripped if at least 3 letters remain
+SUFFIXES = (
+    'ations', 'ation', 'ments', 'ment', 'ness', 'ings', 'ing', 'ies', 'ers', 'ed', 'er', 'es', 'ly', 's',
+)
+MAX_SUFFIX = max(len(suffix) for suffix in SUFFIXES)
+
+
+def stem(word):
+    """Light suffix-stripping stemmer shared by indexing and querying"""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            return word + 'y' if suffix == 'ies' else word
+    return word
+
+
+def tokenize(text):
+    """Lowercase word tokens with stopwords removed (not stemmed)"""
+    return [token for token in re.findall(r'\w+', text.lower()) if token not in STOPWORDS]
+
+
+def shard_for(term):
+    first = term[0]
+    return first if first.isascii() and first.isalnum() else '_'
+
+
+def pack(values):
+    packed = array('I', values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode('ascii')
+
+
+def unpack(encoded):
+    values = array('I')
+    values.frombytes(base64.b64decode(encoded))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class InvertedIndex:
+    def __init__(self, docs, postings):
+        # docs: [(type, id, slug, title, length)]; postings: {term: (doc numbers, frequencies)}
+        self.docs = docs
+        self.postings = postings
+        self.terms = sorted(postings)
+        self.avg_length = (sum(doc[4] for doc in docs) / len(docs)) if docs else 0
+
+    @classmethod
+    def build(cls, documents):
+        """
+        Build an index from ``(type, id, slug, title, body)`` tuples. Title
+        terms count ``TITLE_WEIGHT`` times.
+        """
+        docs = []
+        postings = defaultdict(lambda: ([], []))
+        for number, (doc_type, doc_id, slug, title, body) in enumerate(documents):
+            frequencies = Counter()
+            for token in tokenize(title):
+                frequencies[stem(token)] += TITLE_WEIGHT
+            for token in tokenize(body):
+                frequencies[stem(token)] += 1
+            docs.append((doc_type, str(doc_id), slug, title, sum(frequencies.values())))
+            for term, frequency in frequencies.items():
+                numbers, counts = postings[term]
+                numbers.append(number)
+                counts.append(frequency)
+        return cls(docs, dict(postings))
+
+    def to_files(self):
+        """Return ``{filename: data}`` for the sharded static file set"""
+        shards = defaultdict(dict)
+        for term in self.terms:
+            numbers, counts = self.postings[term]
+            values, previous = [], 0
+            for number, count in zip(numbers, counts):
+                values.extend((number - previous, count))
+                previous = number
+            shards[shard_for(term)][term] = pack(values)
+        files = {f'terms-{shard}.json': terms for shard, terms in sorted(shards.items())}
+        files['docs.json'] = [list(doc) for doc in self.docs]
+        # Hash of every other file, so meta.json changes whenever any of them does
+        digest = hashlib.sha256()
+        for filename, data in sorted(files.items()):
+            digest.update(f'{filename}\n{json.dumps(data, sort_keys=True)}\n'.encode())
+        files['meta.json'] = {
+            'version': INDEX_VERSION,
+            'documents': len(self.docs),
+            'average_length': self.avg_length,
+            'title_weight': TITLE_WEIGHT,
+            'shards': sorted(shards),
+            'digest': digest.hexdigest(),
+        }
+        return files
+
+    @classmethod
+    def from_files(cls, directory):
+        """Load an index written by ``to_files`` into memory"""
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != INDEX_VERSION:
+            raise ValueError(f'Unsupported search index version {meta.get("version")}')
+        with open(os.path.join(directory, 'docs.json'), encoding='utf-8') as f:
+            docs = [tuple(doc) for doc in json.load(f)]
+        postings = {}
+        for shard in meta['shards']:
+            with open(os.path.join(directory, f'terms-{shard}.json'), encoding='utf-8') as f:
+                for term, encoded in json.load(f).items():
+                    values = unpack(encoded)
+                    numbers, number = [], 0
+                    for delta in values[0::2]:
+                        number += delta
+                        numbers.append(number)
+                    postings[term] = (numbers, list(values[1::2]))
+        return cls(docs, postings)
+
+    def expand(self, token, prefix):
+        """Index terms matched by a query token"""
+        term = stem(token)
+        if not prefix:
+            return [term] if term in self.postings else []
+        # Completions of what was typed, plus stored stems the typed word
+        # could still stem to (e.g. "arbitrat" -> "arbitr")
+        matches = set()
+        start = bisect.bisect_left(self.terms, term)
+        while start < len(self.terms) and self.terms[start].startswith(term):
+            matches.add(self.terms[start])
+            start += 1
+        for length in range(max(len(token) - MAX_SUFFIX, 3), len(token)):
+            if token[:length] in self.postings:
+                matches.add(token[:length])
+        return sorted(matches)
+
+    def search(self, query, doc_type=None, limit=5):
+        """
+        Return matching docs as ``(type, id, slug, title)`` ranked by BM25.
+        Every token must match; the last one is treated as a prefix.
+        """
+        tokens = tokenize(query)
+        if not tokens or not self.docs:
+            return []
+        scores = None
+        for position, token in enumerate(tokens):
+            token_scores = defaultdict(float)
+            for term in self.expand(token, prefix=position == len(tokens) - 1):
+                numbers, counts = self.postings[term]
+                idf = math.log(1 + (len(self.docs) - len(numbers) + 0.5) / (len(numbers) + 0.5))
+                for number, count in zip(numbers, counts):
+                    length_norm = 1 - BM25_B + BM25_B * self.docs[number][4] / self.avg_length
+                    token_scores[number] += idf * count * (BM25_K1 + 1) / (count + BM25_K1 * length_norm)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {n: s + token_scores[n] for n, s in scores.items() if n in token_scores}
+            if not scores:
+                return []
+        ranked = sorted(
+            (number for number in scores if doc_type is None or self.docs[number][0] == doc_type),
+            key=lambda number: (-scores[number], number)
+        )
+        return [self.docs[number][:4] for number in ranked[:limit]]
@@ -0,0 +1,59 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from core.models import BlogPost, Category, Tag
+from core.search.documents import DOCUMENT_TYPES, delete_documents, index_objects, update_document
+
+
+def document_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_document(instance)
+
+
+def document_deleted(sender, instance, **kwargs):
+    delete_documents(sender, [instance.pk])
+
+
+for model in DOCUMENT_TYPES:
+    post_save.connect(document_saved, sender=model, dispatch_uid=f'search_save_{model.__name__}')
+    post_delete.connect(document_deleted, sender=model, dispatch_uid=f'search_delete_{model.__name__}')
+
+
+@receiver(m2m_changed, sender=BlogPost.tags.through, dispatch_uid='search_blog_tags')
+def blog_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        update_document(instance)
+    elif pk_set:
+        index_objects(BlogPost, pk_set)
+    elif action == 'post_clear':
+        # Clearing from the tag side does not report which posts were affected
+        index_objects(BlogPost)
+
+
+@receiver(post_save, sender=Category, dispatch_uid='search_category_saved')
+def category_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_objects(BlogPost, BlogPost.objects.filter(category=instance).values('pk'))
+
+
+@receiver(post_save, sender=Tag, dispatch_uid='search_tag_saved')
+def tag_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_objects(BlogPost, BlogPost.objects.filter(tags=instance).values('pk'))
+
+
+@receiver(pre_delete, sender=Category, dispatch_uid='search_category_deleting')
+@receiver(pre_delete, sender=Tag, dispatch_uid='search_tag_deleting')
+def taxonomy_deleting(sender, instance, **kwargs):
+    # The relation is gone by post_delete, so remember the affected posts now
+    lookup = 'category' if sender is Category else 'tags'
+    instance._search_post_ids = list(BlogPost.objects.filter(**{lookup: instance}).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category, dispatch_uid='search_category_deleted')
+@receiver(post_delete, sender=Tag, dispatch_uid='search_tag_deleted')
+def taxonomy_deleted(sender, instance, **kwargs):
+    post_ids = getattr(instance, '_search_post_ids', None)
+    if post_ids:
+        index_objects(BlogPost, post_ids)
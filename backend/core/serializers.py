@@ -1,4 +1,7 @@
 from rest_framework import serializers
+from .direct_uploads import UploadTokenField
+from .images import ImageVariantsField, ImageVariantsListSerializer
+from .uploads import ATTACHMENT_TYPES, DOCUMENT_TYPES, StagedUploadMixin, UploadValidator
 from .models import (
     Category, Tag, BlogPost, Event, Gallery, Image, Newsletter,
     Contact, Submission, Internship, TeamMember, Leadership, Announcement, CarouselImage, NewsletterArchive
@@ -15,18 +18,21 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'created_at']
 
 class BlogPostListSerializer(serializers.ModelSerializer):
+    featured_image_variants = ImageVariantsField(source='featured_image')
     author_display_name = serializers.CharField(source='get_author_name', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
     tags = TagSerializer(many=True, read_only=True)
 
     class Meta:
         model = BlogPost
+        list_serializer_class = ImageVariantsListSerializer
         fields = [
             'id', 'title', 'slug', 'excerpt', 'published', 'featured',
-            'author_display_name', 'category_name', 'tags', 'featured_image', 'created_at'
+            'author_display_name', 'category_name', 'tags', 'featured_image', 'featured_image_variants', 'created_at'
         ]
 
 class BlogPostDetailSerializer(serializers.ModelSerializer):
+    featured_image_variants = ImageVariantsField(source='featured_image')
     author_display_name = serializers.CharField(source='get_author_name', read_only=True)
     author_email = serializers.CharField(source='get_author_email', read_only=True)
     category = CategorySerializer(read_only=True)
@@ -34,59 +40,70 @@ class BlogPostDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BlogPost
+        list_serializer_class = ImageVariantsListSerializer
         fields = [
             'id', 'title', 'slug', 'content', 'excerpt', 'published', 'featured',
             'author_display_name', 'author_bio', 'author_email', 'category', 'tags',
-            'featured_image', 'created_at', 'updated_at'
+            'featured_image', 'featured_image_variants', 'created_at', 'updated_at'
         ]
 
 class EventListSerializer(serializers.ModelSerializer):
+    featured_image_variants = ImageVariantsField(source='featured_image')
     author_display_name = serializers.CharField(source='get_author_name', read_only=True)
 
     class Meta:
         model = Event
+        list_serializer_class = ImageVariantsListSerializer
         fields = [
             'id', 'title', 'slug', 'description', 'start_date', 'end_date',
             'location', 'event_type', 'published', 'featured', 'author_display_name',
-            'featured_image', 'registration_link', 'created_at'
+            'featured_image', 'featured_image_variants', 'registration_link', 'created_at'
         ]
 
 class EventDetailSerializer(serializers.ModelSerializer):
+    featured_image_variants = ImageVariantsField(source='featured_image')
     author_display_name = serializers.CharField(source='get_author_name', read_only=True)
 
     class Meta:
         model = Event
+        list_serializer_class = ImageVariantsListSerializer
         fields = [
             'id', 'title', 'slug', 'description', 'content', 'start_date', 'end_date',
             'location', 'event_type', 'published', 'featured', 'author_display_name',
-            'featured_image', 'registration_link', 'created_at', 'updated_at'
+            'featured_image', 'featured_image_variants', 'registration_link', 'created_at', 'updated_at'
         ]
 
 class ImageSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField(source='image')
+
     class Meta:
         model = Image
-        fields = ['id', 'title', 'image', 'alt_text', 'caption', 'created_at']
+        list_serializer_class = ImageVariantsListSerializer
+        fields = ['id', 'title', 'image', 'image_variants', 'alt_text', 'caption', 'created_at']
 
 class GalleryListSerializer(serializers.ModelSerializer):
+    cover_thumbnail_variants = ImageVariantsField(source='cover_thumbnail')
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
-    image_count = serializers.IntegerField(source='images.count', read_only=True)
     
     class Meta:
         model = Gallery
+        list_serializer_class = ImageVariantsListSerializer
         fields = [
             'id', 'title', 'slug', 'description', 'published', 'author_name',
-            'cover_image', 'image_count', 'created_at'
+            'cover_image', 'cover_thumbnail', 'cover_thumbnail_variants', 'image_count', 'created_at'
         ]
 
 class GalleryDetailSerializer(serializers.ModelSerializer):
+    cover_image_variants = ImageVariantsField(source='cover_image')
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
     images = ImageSerializer(many=True, read_only=True)
     
     class Meta:
         model = Gallery
+        list_serializer_class = ImageVariantsListSerializer
         fields = [
             'id', 'title', 'slug', 'description', 'published', 'author_name',
-            'cover_image', 'images', 'created_at', 'updated_at'
+            'cover_image', 'cover_image_variants', 'images', 'created_at', 'updated_at'
         ]
 
 class NewsletterSerializer(serializers.ModelSerializer):
@@ -95,11 +112,14 @@ class NewsletterSerializer(serializers.ModelSerializer):
         fields = ['id', 'email', 'name', 'active', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(StagedUploadMixin, serializers.ModelSerializer):
+    staged_fields = ('attachment',)
+
     class Meta:
         model = Contact
         fields = ['id', 'name', 'email', 'subject', 'message', 'attachment', 'created_at']
         read_only_fields = ['id', 'created_at']
+        extra_kwargs = {'attachment': {'validators': [UploadValidator(ATTACHMENT_TYPES)]}}
 
 
 class AnnouncementSerializer(serializers.ModelSerializer):
@@ -110,9 +130,12 @@ class AnnouncementSerializer(serializers.ModelSerializer):
 
 
 class CarouselImageSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField(source='image')
+
     class Meta:
         model = CarouselImage
-        fields = ['id', 'title', 'description', 'image', 'link_url', 'is_active', 'order', 'created_at']
+        list_serializer_class = ImageVariantsListSerializer
+        fields = ['id', 'title', 'description', 'image', 'image_variants', 'link_url', 'is_active', 'order', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
@@ -131,7 +154,9 @@ class SubmissionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'submitted_at']
 
-class InternshipSerializer(serializers.ModelSerializer):
+class InternshipSerializer(StagedUploadMixin, serializers.ModelSerializer):
+    staged_fields = ('cv', 'writing_sample')
+
     class Meta:
         model = Internship
         fields = [
@@ -140,20 +165,48 @@ class InternshipSerializer(serializers.ModelSerializer):
             'interest_letter', 'cv', 'writing_sample', 'applied_at'
         ]
         read_only_fields = ['id', 'applied_at']
+        extra_kwargs = {
+            'cv': {'validators': [UploadValidator(DOCUMENT_TYPES)]},
+            'writing_sample': {'validators': [UploadValidator(DOCUMENT_TYPES)]},
+        }
+
+class InternshipFinalizeSerializer(InternshipSerializer):
+    """Files given as direct upload tokens, already in storage"""
+    staged_fields = ()
+    cv = UploadTokenField('internship.cv')
+    writing_sample = UploadTokenField('internship.writing_sample')
+
+class ContactFinalizeSerializer(ContactSerializer):
+    """The attachment given as a direct upload token, already in storage"""
+    staged_fields = ()
+    attachment = UploadTokenField('contact.attachment', required=False, allow_blank=True)
+
+class SubmissionReviewSerializer(SubmissionSerializer):
+    class Meta(SubmissionSerializer.Meta):
+        fields = SubmissionSerializer.Meta.fields + ['status', 'review_notes', 'reviewed_at']
+
+class InternshipReviewSerializer(InternshipSerializer):
+    class Meta(InternshipSerializer.Meta):
+        fields = InternshipSerializer.Meta.fields + ['status', 'review_notes', 'reviewed_at']
 
 class TeamMemberSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField(source='image')
     role_display = serializers.CharField(source='get_role_display', read_only=True)
     
     class Meta:
         model = TeamMember
+        list_serializer_class = ImageVariantsListSerializer
         fields = [
             'id', 'name', 'role', 'role_display', 'batch', 'email', 'linkedin_url',
-            'bio', 'image', 'active', 'order'
+            'bio', 'image', 'image_variants', 'active', 'order'
         ]
 
 class LeadershipSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField(source='image')
+
     class Meta:
         model = Leadership
+        list_serializer_class = ImageVariantsListSerializer
         fields = [
-            'id', 'name', 'position', 'bio', 'email', 'image', 'order'
+            'id', 'name', 'position', 'bio', 'email', 'image', 'image_variants', 'order'
         ]
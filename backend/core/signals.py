@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from core.images import RESPONSIVE_IMAGE_FIELDS
+from core.jobs import enqueue
+from core.models import Gallery, Image
+
+
+def refresh_gallery_stats(gallery_ids):
+    """Recompute ``image_count`` and ``cover_thumbnail`` in one UPDATE"""
+    gallery_ids = [pk for pk in gallery_ids if pk is not None]
+    if not gallery_ids:
+        return
+    images = Image.objects.filter(gallery=OuterRef('pk')).order_by()
+    Gallery.objects.filter(pk__in=gallery_ids).update(
+        image_count=Coalesce(Subquery(images.values('gallery').annotate(count=Count('pk')).values('count')), 0),
+        cover_thumbnail=Coalesce(
+            NullIf('cover_image', Value('')),
+            Subquery(images.order_by('-created_at').values('image')[:1]),
+            Value(''),
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_init, sender=Image, dispatch_uid='gallery_stats_image_loaded')
+def image_loaded(sender, instance, **kwargs):
+    # Remember the gallery so moving an image refreshes both galleries
+    instance._loaded_gallery_id = instance.gallery_id
+
+
+@receiver(post_save, sender=Image, dispatch_uid='gallery_stats_image_saved')
+def image_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_gallery_stats({instance._loaded_gallery_id, instance.gallery_id})
+        instance._loaded_gallery_id = instance.gallery_id
+
+
+@receiver(post_delete, sender=Image, dispatch_uid='gallery_stats_image_deleted')
+def image_deleted(sender, instance, **kwargs):
+    refresh_gallery_stats([instance.gallery_id])
+
+
+@receiver(post_save, sender=Gallery, dispatch_uid='gallery_stats_gallery_saved')
+def gallery_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    # The cover may have changed
+    if not raw:
+        refresh_gallery_stats([instance.pk])
+
+
+def image_model_saved(sender, instance, raw=False, **kwargs):
+    # Resizing is slow, so the run_jobs worker does it; the job commits with the object
+    if raw or not settings.IMAGE_DERIVATIVES_ON_SAVE:
+        return
+    if any(getattr(instance, field_name) for field_name in RESPONSIVE_IMAGE_FIELDS[sender]):
+        enqueue('generate_image_derivatives', model=sender._meta.label, pk=str(instance.pk))
+
+
+for model in RESPONSIVE_IMAGE_FIELDS:
+    post_save.connect(image_model_saved, sender=model, dispatch_uid=f'image_derivatives_{model.__name__}')
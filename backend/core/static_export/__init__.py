@@ -0,0 +1 @@
+"""Helpers used by the ``export_static_content`` management command."""
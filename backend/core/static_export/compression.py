@@ -0,0 +1,48 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from core.fileutils import atomic_write
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def etag_for(digest):
+    """Strong ETag for a file with the given sha256 hex digest"""
+    return f'"{digest[:32]}"'
+
+
+def needs_compression(path):
+    """True if any precompressed sibling of ``path`` is missing"""
+    suffixes = COMPRESSED_SUFFIXES if brotli else ('.gz',)
+    return any(not os.path.exists(path + suffix) for suffix in suffixes)
+
+
+def compress_file(path):
+    """
+    Write ``path.gz`` (and ``path.br`` when the brotli package is
+    installed) next to ``path``. gzip output uses a fixed mtime so
+    unchanged input yields byte-identical siblings.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    atomic_write(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli:
+        atomic_write(path + '.br', brotli.compress(data, quality=11))
+
+
+def compress_files(paths, jobs=1):
+    """Precompress ``paths`` on a pool of ``jobs`` threads"""
+    with ThreadPoolExecutor(max(jobs, 1), thread_name_prefix='compress') as pool:
+        for future in [pool.submit(compress_file, path) for path in paths]:
+            future.result()
+
+
+def remove_compressed(path):
+    for suffix in COMPRESSED_SUFFIXES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
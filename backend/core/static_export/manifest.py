@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+from django.db.models import Count, Max
+from django.utils import timezone
+from core.conditional import model_version
+from core.fileutils import atomic_write
+from core.static_export.compression import etag_for, remove_compressed
+
+MANIFEST_FILENAME = '.export-manifest.json'
+MANIFEST_VERSION = 2
+
+
+def content_hash(data):
+    """Return the sha256 hex digest of ``data`` (bytes)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def model_watermark(model):
+    """
+    Return a watermark string for ``model`` built from the newest
+    ``updated_at`` and the row count, so edits, inserts and deletes all
+    move it. Many-to-many tables and users have no ``updated_at``; their
+    part before the ``|`` is left empty so it never counts as a modification
+    time, and ``model_version`` fingerprints the rows instead.
+    """
+    if 'updated_at' not in {field.name for field in model._meta.concrete_fields}:
+        return f'|{model_version(model)}'
+    stats = model._default_manager.aggregate(latest=Max('updated_at'), total=Count('pk'))
+    latest = stats['latest'].isoformat() if stats['latest'] else ''
+    return f"{latest}|{stats['total']}"
+
+
+class BuildManifest:
+    """
+    Persistent record of a static export run.
+
+    For every export it keeps the model watermarks it was generated from and
+    the files it produced; for every file it keeps the content hash that was
+    written. Incremental runs compare against it to skip unchanged work.
+    """
+
+    def __init__(self, output_dir, data=None):
+        self.output_dir = output_dir
+        self.data = data or {'version': MANIFEST_VERSION, 'exports': {}, 'files': {}}
+
+    @property
+    def path(self):
+        return os.path.join(self.output_dir, MANIFEST_FILENAME)
+
+    @classmethod
+    def load(cls, output_dir):
+        """Load the manifest from ``output_dir``, or start an empty one"""
+        manifest = cls(output_dir)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if data.get('version') == MANIFEST_VERSION:
+            manifest.data = data
+        return manifest
+
+    def save(self):
+        self.data['generated_at'] = timezone.now().isoformat()
+        atomic_write(self.path, json.dumps(self.data, indent=2, sort_keys=True))
+
+    def relpath(self, filepath):
+        return os.path.relpath(filepath, self.output_dir).replace(os.sep, '/')
+
+    def file_hash(self, filepath):
+        entry = self.data['files'].get(self.relpath(filepath))
+        return entry['sha256'] if entry else None
+
+    def record_file(self, filepath, digest, size, count):
+        self.data['files'][self.relpath(filepath)] = {
+            'sha256': digest, 'size': size, 'count': count
+        }
+
+    def file_paths(self):
+        return [os.path.normpath(os.path.join(self.output_dir, rel)) for rel in sorted(self.data['files'])]
+
+    def is_current(self, export_name, watermarks):
+        """
+        True when ``export_name`` was last generated from exactly these
+        watermarks and all of its files are still on disk.
+        """
+        entry = self.data['exports'].get(export_name)
+        if not entry or entry['watermarks'] != watermarks:
+            return False
+        return all(
+            os.path.exists(os.path.join(self.output_dir, rel))
+            for rel in entry['files']
+        )
+
+    def update_export(self, export_name, watermarks, filepaths):
+        """
+        Record a fresh run of ``export_name`` and delete files it produced
+        previously but no longer does (e.g. unpublished blog posts), along
+        with their precompressed siblings.
+        Returns the list of removed relative paths.
+        """
+        files = sorted({self.relpath(p) for p in filepaths})
+        previous = self.data['exports'].get(export_name, {}).get('files', [])
+        removed = [rel for rel in previous if rel not in files]
+        for rel in removed:
+            self.data['files'].pop(rel, None)
+            path = os.path.join(self.output_dir, rel)
+            if os.path.exists(path):
+                os.remove(path)
+            remove_compressed(path)
+        self.data['exports'][export_name] = {'watermarks': watermarks, 'files': files}
+        return removed
+
+    def public_manifest(self):
+        """
+        Build the client-facing manifest.json: for every exported file its
+        hash, ETag, size, record count and the newest ``updated_at`` of the
+        rows it was built from, grouped by content type.
+        """
+        generated = timezone.now().isoformat()
+        content_types = {}
+        files = {}
+        for name, entry in sorted(self.data['exports'].items()):
+            last_modified = max(
+                (mark.split('|')[0] for mark in entry['watermarks'].values()), default=''
+            ) or None
+            content_types[name] = {'files': entry['files'], 'last_modified': last_modified}
+            for rel in entry['files']:
+                info = self.data['files'].get(rel)
+                if info is None:
+                    continue
+                files[rel] = {
+                    'hash': f"sha256:{info['sha256']}",
+                    'etag': etag_for(info['sha256']),
+                    'size': info['size'],
+                    'count': info['count'],
+                    'last_modified': last_modified,
+                }
+        return {
+            'version': MANIFEST_VERSION,
+            'generated': generated,
+            'content_types': content_types,
+            'files': dict(sorted(files.items())),
+            'media_directory': '/media/',
+        }
@@ -0,0 +1,157 @@
+import errno
+import hashlib
+import os
+import shutil
+from dataclasses import dataclass
+
+try:
+    import fcntl
+    FICLONE = 0x40049409  # Linux ioctl for copy-on-write reflinks
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SyncStats:
+    copied: int = 0
+    linked: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    bytes_moved: int = 0
+
+    def __str__(self):
+        return (
+            f'{self.copied} copied, {self.linked} linked, {self.unchanged} unchanged, '
+            f'{self.deleted} deleted, {self.bytes_moved} bytes moved'
+        )
+
+
+def file_digest(path):
+    """Return the sha256 hex digest of the file at ``path``"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collect_files(sources):
+    """
+    Map relative path -> absolute source path for every file under
+    ``sources``. Later sources win when the same relative path exists in
+    more than one of them.
+    """
+    files = {}
+    for source in sources:
+        if not os.path.isdir(source):
+            continue
+        for root, _dirs, filenames in os.walk(source):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                files[os.path.relpath(path, source)] = path
+    return files
+
+
+def is_unchanged(src_stat, src, dest):
+    """Compare size and mtime first, and only hash when mtimes disagree"""
+    try:
+        dest_stat = os.stat(dest)
+    except FileNotFoundError:
+        return False
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if (src_stat.st_dev, src_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino):
+        return True
+    if int(src_stat.st_mtime) == int(dest_stat.st_mtime):
+        return True
+    if file_digest(src) == file_digest(dest):
+        # Same bytes, different mtime: fix the mtime so next run skips hashing
+        shutil.copystat(src, dest)
+        return True
+    return False
+
+
+def reflink(src, dest):
+    """Clone ``src`` into ``dest`` with a copy-on-write reflink when supported"""
+    if fcntl is None:
+        return False
+    with open(src, 'rb') as s, open(dest, 'wb') as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            return False
+    shutil.copystat(src, dest)
+    return True
+
+
+def place_file(src, dest, link):
+    """
+    Put ``src`` at ``dest`` via a temporary sibling and an atomic rename.
+    Returns True when the bytes were shared (reflink/hardlink) rather than
+    copied.
+    """
+    tmp = f'{dest}.sync-tmp'
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    shared = False
+    if link:
+        if reflink(src, tmp):
+            shared = True
+        else:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            try:
+                os.link(src, tmp)
+                shared = True
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                    raise
+    if not shared:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dest)
+    return shared
+
+
+def remove_orphans(dest, keep, stats):
+    """Delete files under ``dest`` that are not in ``keep`` and prune empty dirs"""
+    for root, dirs, filenames in os.walk(dest, topdown=False):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            if os.path.relpath(path, dest) not in keep:
+                os.remove(path)
+                stats.deleted += 1
+        if root != dest and not os.listdir(root):
+            os.rmdir(root)
+
+
+def sync_media(sources, dest, link=True, delete=True):
+    """
+    Mirror the files under ``sources`` into ``dest``.
+
+    Only new or changed files are transferred, hardlinking or reflinking
+    them when possible so nothing is duplicated on the same filesystem.
+    Unchanged files keep their mtime, and with ``delete`` files no longer
+    present in any source are removed.
+    """
+    stats = SyncStats()
+    files = collect_files(sources)
+    os.makedirs(dest, exist_ok=True)
+
+    for rel, src in files.items():
+        target = os.path.join(dest, rel)
+        src_stat = os.stat(src)
+        if is_unchanged(src_stat, src, target):
+            stats.unchanged += 1
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if place_file(src, target, link):
+            stats.linked += 1
+        else:
+            stats.copied += 1
+            stats.bytes_moved += src_stat.st_size
+
+    if delete:
+        remove_orphans(dest, set(files), stats)
+    return stats
@@ -0,0 +1,47 @@
+import math
+
+
+class PageShardWriter:
+    """
+    Split a stream of items into ``pages/N.json`` files shaped like DRF's
+    ``PageNumberPagination`` responses (``count``, ``next``, ``previous``,
+    ``results``). ``next``/``previous`` are paths relative to the export
+    root. The total ``count`` must be known up front so every page can
+    carry it without buffering the whole stream. Pages get their own
+    directory so they can't collide with a ``<prefix>/<slug>.json`` detail
+    file.
+    """
+
+    def __init__(self, output_dir, prefix, page_size, count, write):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.page_size = page_size
+        self.count = count
+        self.num_pages = max(math.ceil(count / page_size), 1)
+        self.write = write
+        self.page = 1
+        self.buffer = []
+
+    def page_path(self, number):
+        return f'{self.prefix}/pages/{number}.json'
+
+    def add(self, item):
+        self.buffer.append(item)
+        if len(self.buffer) == self.page_size:
+            self.flush()
+
+    def flush(self):
+        number = self.page
+        self.write(f'{self.output_dir}/{self.page_path(number)}', {
+            'count': self.count,
+            'next': self.page_path(number + 1) if number < self.num_pages else None,
+            'previous': self.page_path(number - 1) if number > 1 else None,
+            'results': self.buffer,
+        })
+        self.page += 1
+        self.buffer = []
+
+    def close(self):
+        """Write the last partial page (or an empty first page)"""
+        if self.buffer or self.page == 1:
+            self.flush()
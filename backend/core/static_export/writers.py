@@ -0,0 +1,86 @@
+import hashlib
+import os
+from django.core.serializers.json import DjangoJSONEncoder
+from core.fileutils import make_temp_file, replace_file
+
+
+def json_encoder(compact=False):
+    """Return the encoder used for every exported file"""
+    if compact:
+        return DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    return DjangoJSONEncoder(ensure_ascii=False, indent=2)
+
+
+def dump_json(data, compact=False):
+    """Encode ``data`` to UTF-8 JSON bytes"""
+    return json_encoder(compact).encode(data).encode('utf-8')
+
+
+class StreamingJSONWriter:
+    """
+    Write a ``{"results": [...], "count": N}`` document one item at a time.
+
+    Items are encoded and flushed as they arrive, so peak memory is one
+    item rather than the whole list, and the count is written once the
+    last item is known. Output goes to a temporary file next to
+    ``filepath``; the caller decides whether to ``commit`` it (rename over
+    the target atomically) or ``discard`` it, using ``digest`` to detect unchanged
+    content. The bytes match ``dump_json({'results': items, 'count': n})``.
+    """
+
+    def __init__(self, filepath, compact=False):
+        self.filepath = filepath
+        self.compact = compact
+        self.encoder = json_encoder(compact)
+        self.count = 0
+        self.size = 0
+        self.digest = None
+        self._hash = hashlib.sha256()
+        self._file = None
+        self.tmp_path = None
+
+    def __enter__(self):
+        fd, self.tmp_path = make_temp_file(self.filepath)
+        self._file = os.fdopen(fd, 'wb')
+        self._write('{"results":[' if self.compact else '{\n  "results": [')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._file.close()
+            self.discard()
+            return False
+        if self.compact:
+            self._write(f'],"count":{self.count}}}')
+        else:
+            closing = '\n  ]' if self.count else ']'
+            self._write(f'{closing},\n  "count": {self.count}\n}}')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self.digest = self._hash.hexdigest()
+        return False
+
+    def _write(self, text):
+        data = text.encode('utf-8')
+        self.size += len(data)
+        self._hash.update(data)
+        self._file.write(data)
+
+    def write(self, item):
+        encoded = self.encoder.encode(item)
+        separator = ',' if self.count else ''
+        if not self.compact:
+            # Items sit two levels deep in the indented document
+            encoded = '\n    ' + encoded.replace('\n', '\n    ')
+        self._write(separator + encoded)
+        self.count += 1
+
+    def commit(self):
+        replace_file(self.tmp_path, self.filepath)
+        self.tmp_path = None
+
+    def discard(self):
+        if self.tmp_path and os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        self.tmp_path = None
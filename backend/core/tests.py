@@ -1,3 +1,1274 @@
-from django.test import TestCase
+import base64
+import gzip
+import hashlib
+import importlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image as PILImage
+from rest_framework.renderers import JSONRenderer
+from . import async_views
+from .autobuild import REBUILD_TASK, paused
+from .jobs import TASKS, enqueue, run_pending, task
+from .management.commands.benchmark_serializers import ENDPOINTS
+from .models import (
+    Announcement, BlogPost, CarouselImage, Category, Contact, Tag, Event, Gallery, Image, ImageDerivative, Internship, Job,
+    SearchDocument, StagedUpload, StagedUploadChunk, Submission, TeamMember
+)
+from .fileutils import NEW_FILE_MODE, atomic_write
+from .search.inverted_index import InvertedIndex
+from .static_export.media_sync import sync_media
+from .static_export.writers import StreamingJSONWriter
+from .direct_uploads import S3UploadBackend, load_token, sweep_unfinalized_uploads
+from .uploads import STORE_TASK, purge_staged_uploads
 
-# Create your tests here.
+
+class ExportHelpers:
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.author = User.objects.create_user('author', first_name='Ada', last_name='Author')
+
+    def create_content(self, count):
+        category = Category.objects.create(name=f'Category {count}', slug=f'category-{count}')
+        tags = [Tag.objects.create(name=f'Tag {count}-{i}', slug=f'tag-{count}-{i}') for i in range(2)]
+        for i in range(count):
+            post = BlogPost.objects.create(
+                title=f'Post {count}-{i}', slug=f'post-{count}-{i}', content='Body',
+                published=True, author=self.author, category=category,
+            )
+            post.tags.set(tags)
+            gallery = Gallery.objects.create(
+                title=f'Gallery {count}-{i}', slug=f'gallery-{count}-{i}',
+                published=True, author=self.author,
+            )
+            for j in range(3):
+                Image.objects.create(title=f'Image {j}', image=f'gallery_images/{j}.jpg', gallery=gallery)
+
+    def export(self, **options):
+        stdout = io.StringIO()
+        options.setdefault('output_dir', self.output_dir)
+        options.setdefault('media_sources', [os.path.join(self.output_dir, 'no-media')])
+        call_command('export_static_content', stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def read_json(self, relpath):
+        with open(os.path.join(self.output_dir, relpath), encoding='utf-8') as f:
+            return json.load(f)
+
+    def read_tree(self, directory):
+        """Relative path -> bytes of every exported file, minus the ones stamped with the build time"""
+        files = {}
+        for root, _dirs, filenames in os.walk(directory):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                rel = os.path.relpath(path, directory)
+                # Precompressed siblings included
+                name = rel.removesuffix('.gz').removesuffix('.br')
+                if name not in ('manifest.json', 'status.json', '.export-manifest.json'):
+                    with open(path, 'rb') as f:
+                        files[rel] = f.read()
+        return files
+
+
+class ExportStaticContentTests(ExportHelpers, TestCase):
+    def test_query_count_does_not_grow_with_rows(self):
+        # Image derivatives, 14 model watermarks, blogs (posts, tags, 3 shard counts),
+        # events (rows, count), featured (blogs, events), home (5 sections),
+        # search (posts, tags, events), galleries (2) and 5 single-query exports
+        self.create_content(2)
+        with self.assertNumQueries(39):
+            self.export()
+
+        self.create_content(5)
+        with self.assertNumQueries(39):
+            self.export()
+
+        blogs = self.read_json('blogs.json')
+        self.assertEqual(blogs['count'], 7)
+        self.assertEqual(self.read_json('blogs/post-5-0.json')['author_display_name'], 'Ada Author')
+        self.assertEqual(len(self.read_json('galleries.json')['results'][0]['images']), 3)
+        self.assertEqual(self.read_json('home.json')['featured_blogs'], [])
+
+    def test_manifest_describes_exported_files(self):
+        self.create_content(2)
+        self.export()
+
+        manifest = self.read_json('manifest.json')
+        entry = manifest['files']['blogs.json']
+        with open(os.path.join(self.output_dir, 'blogs.json'), 'rb') as f:
+            data = f.read()
+        self.assertEqual(entry['hash'], f'sha256:{hashlib.sha256(data).hexdigest()}')
+        self.assertEqual((entry['size'], entry['count']), (len(data), 2))
+        self.assertEqual(entry['last_modified'], manifest['content_types']['blogs']['last_modified'])
+        self.assertIn('/api/blogs.json', self.read_json('status.json')['endpoints'])
+
+    def test_incremental_export_skips_unchanged_and_removes_stale(self):
+        self.create_content(2)
+        self.export()
+        blogs = os.path.join(self.output_dir, 'blogs.json')
+        mtime = os.stat(blogs).st_mtime_ns
+
+        output = self.export(incremental=True)
+        self.assertIn('⏭️ Skipped blogs (unchanged)', output)
+        self.assertIn('⏭️ Skipped galleries (unchanged)', output)
+        self.assertEqual(os.stat(blogs).st_mtime_ns, mtime)
+
+        post = BlogPost.objects.get(slug='post-2-0')
+        post.published = False
+        post.save()
+        output = self.export(incremental=True)
+        self.assertIn('🗑️ Removed stale blogs/post-2-0.json', output)
+        self.assertIn('⏭️ Skipped galleries (unchanged)', output)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'blogs', 'post-2-0.json')))
+        self.assertEqual(self.read_json('blogs.json')['count'], 1)
+
+    def test_incremental_export_follows_tag_links_and_authors(self):
+        self.create_content(2)
+        self.export()
+
+        # Nothing changed: only the watermarks are read, not the derivatives
+        with self.assertNumQueries(14):
+            self.export(incremental=True)
+
+        post = BlogPost.objects.get(slug='post-2-0')
+        post.tags.remove(*post.tags.all()[:1])
+        output = self.export(incremental=True)
+        self.assertNotIn('Skipped blogs', output)
+        self.assertEqual(len(self.read_json('blogs/post-2-0.json')['tags']), 1)
+
+        self.author.first_name, self.author.last_name = 'Grace', 'Hopper'
+        self.author.save()
+        output = self.export(incremental=True)
+        self.assertNotIn('Skipped blogs', output)
+        self.assertIn('⏭️ Skipped team (unchanged)', output)
+        self.assertEqual(self.read_json('blogs/post-2-0.json')['author_display_name'], 'Grace Hopper')
+
+    def test_compact_export(self):
+        self.create_content(2)
+        self.export()
+        indented = self.read_json('blogs.json'), self.read_json('blogs/post-2-0.json')
+        self.export(compact=True)
+        with open(os.path.join(self.output_dir, 'blogs.json'), 'rb') as f:
+            self.assertNotIn(b'\n', f.read())
+        self.assertEqual((self.read_json('blogs.json'), self.read_json('blogs/post-2-0.json')), indented)
+
+    def test_full_export_removes_files_no_longer_produced(self):
+        self.create_content(2)
+        self.export()
+        stale = os.path.join(self.output_dir, 'blogs', 'post-2-0.json')
+        self.assertTrue(os.path.exists(stale))
+
+        BlogPost.objects.filter(slug='post-2-0').update(published=False)
+        self.export()
+        self.assertFalse(os.path.exists(stale))
+        self.assertNotIn('blogs/post-2-0.json', self.read_json('manifest.json')['files'])
+        self.assertIn('blogs/post-2-1.json', self.read_json('manifest.json')['files'])
+
+        # Files removed by hand are written again: a full export doesn't trust the manifest's hashes
+        os.remove(os.path.join(self.output_dir, 'blogs', 'post-2-1.json'))
+        with open(os.path.join(self.output_dir, 'team.json'), 'w') as f:
+            f.write('{}')
+        self.export()
+        self.assertEqual(self.read_json('blogs/post-2-1.json')['slug'], 'post-2-1')
+        self.assertIn('results', self.read_json('team.json'))
+
+    def test_precompressed_siblings_match_their_files(self):
+        self.create_content(2)
+        self.export()
+        for name in ('blogs.json', 'etags.json', 'manifest.json', 'status.json'):
+            path = os.path.join(self.output_dir, name)
+            with open(path, 'rb') as f, gzip.open(path + '.gz') as compressed:
+                self.assertEqual(compressed.read(), f.read())
+
+        # Rewritten with --no-precompress: the old siblings must not be served
+        BlogPost.objects.filter(slug='post-2-0').update(title='Renamed', updated_at=timezone.now())
+        self.export(incremental=True, precompress=False)
+        for name in ('blogs.json', 'manifest.json'):
+            path = os.path.join(self.output_dir, name)
+            self.assertFalse(os.path.exists(path + '.gz'))
+            self.assertFalse(os.path.exists(path + '.br'))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'team.json.gz')))
+
+    def test_paginated_shards(self):
+        self.create_content(3)
+        # A slug that looks like a page must not clobber one
+        BlogPost.objects.filter(slug='post-3-0').update(slug='page-1')
+        self.export(page_size=2)
+
+        first = self.read_json('blogs/pages/1.json')
+        self.assertEqual((first['count'], first['next'], first['previous']), (3, 'blogs/pages/2.json', None))
+        last = self.read_json('blogs/pages/2.json')
+        self.assertEqual((len(last['results']), last['next']), (1, None))
+        self.assertEqual(self.read_json('blogs/category/category-3/pages/1.json')['count'], 3)
+        self.assertEqual(self.read_json('blogs/tag/tag-3-0/pages/2.json')['previous'], 'blogs/tag/tag-3-0/pages/1.json')
+        self.assertEqual(self.read_json('events/pages/1.json')['results'], [])
+        self.assertEqual(self.read_json('blogs/page-1.json')['slug'], 'page-1')
+
+
+class ParallelExportTests(ExportHelpers, TransactionTestCase):
+    # Committed rows, since the export threads read them over their own connections
+    def test_parallel_export_matches_serial_export(self):
+        self.create_content(3)
+        Event.objects.create(
+            title='Moot', slug='moot', description='Finals', event_type='workshop', location='Hall',
+            start_date=timezone.now(), end_date=timezone.now() + timedelta(hours=2), published=True,
+        )
+        parallel_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, parallel_dir)
+        self.export(jobs=1, page_size=2)
+        self.export(jobs=4, page_size=2, output_dir=parallel_dir)
+
+        serial = self.read_tree(self.output_dir)
+        self.assertIn('blogs/post-3-0.json', serial)
+        self.assertEqual(self.read_tree(parallel_dir), serial)
+
+
+class AtomicWriteTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'blogs.json')
+
+    def mode(self):
+        return os.stat(self.path).st_mode & 0o777
+
+    def test_identical_content_is_left_untouched(self):
+        self.assertTrue(atomic_write(self.path, '{"count": 1}'))
+        inode = os.stat(self.path).st_ino
+        self.assertFalse(atomic_write(self.path, b'{"count": 1}'))
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+        self.assertTrue(atomic_write(self.path, '{"count": 2}'))
+        with open(self.path) as f:
+            self.assertEqual(f.read(), '{"count": 2}')
+        self.assertEqual(os.listdir(self.directory), ['blogs.json'])
+
+    def test_file_mode_is_kept(self):
+        atomic_write(self.path, 'new')
+        self.assertEqual(self.mode(), NEW_FILE_MODE)
+
+        os.chmod(self.path, 0o644)
+        atomic_write(self.path, 'rewritten')
+        self.assertEqual(self.mode(), 0o644)
+
+        with StreamingJSONWriter(self.path) as writer:
+            writer.write({'id': 1})
+        writer.commit()
+        self.assertEqual(self.mode(), 0o644)
+
+
+class StreamingJSONWriterTests(TestCase):
+    ITEMS = [
+        {'title': 'Café ⚖️', 'tags': ['adr', 'moot'], 'meta': {'nested': {'empty': [], 'none': None}}},
+        {'date': timezone.now(), 'fee': Decimal('12.50'), 'id': uuid.uuid4(), 'blank': {}},
+        [1, 2.5, True, 'x'],
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'blogs.json')
+
+    def stream(self, items, compact=False):
+        with StreamingJSONWriter(self.path, compact=compact) as writer:
+            for item in items:
+                writer.write(item)
+        writer.commit()
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_output_matches_json_dump(self):
+        for items in (self.ITEMS, self.ITEMS[:1], []):
+            expected = json.dumps(
+                {'results': items, 'count': len(items)}, cls=DjangoJSONEncoder, indent=2, ensure_ascii=False
+            ).encode('utf-8')
+            self.assertEqual(self.stream(items), expected)
+
+    def test_compact_output(self):
+        for items in (self.ITEMS, []):
+            expected = json.dumps(
+                {'results': items, 'count': len(items)}, cls=DjangoJSONEncoder, separators=(',', ':'), ensure_ascii=False
+            ).encode('utf-8')
+            self.assertEqual(self.stream(items, compact=True), expected)
+
+
+class MediaSyncTests(TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.dest = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.dest)
+        for rel, data in (('blog_images/a.jpg', b'a'), ('gallery_images/b.jpg', b'bb')):
+            os.makedirs(os.path.join(self.source, os.path.dirname(rel)), exist_ok=True)
+            with open(os.path.join(self.source, rel), 'wb') as f:
+                f.write(data)
+
+    def read(self, rel):
+        with open(os.path.join(self.dest, rel), 'rb') as f:
+            return f.read()
+
+    def test_copy_mode_transfers_only_changes(self):
+        stats = sync_media([self.source], self.dest, link=False)
+        self.assertEqual((stats.copied, stats.linked, stats.bytes_moved), (2, 0, 3))
+        self.assertEqual(self.read('gallery_images/b.jpg'), b'bb')
+        source_inode = os.stat(os.path.join(self.source, 'blog_images', 'a.jpg')).st_ino
+        self.assertNotEqual(os.stat(os.path.join(self.dest, 'blog_images', 'a.jpg')).st_ino, source_inode)
+
+        with open(os.path.join(self.source, 'blog_images', 'a.jpg'), 'wb') as f:
+            f.write(b'changed')
+        stats = sync_media([self.source], self.dest, link=False)
+        self.assertEqual((stats.copied, stats.unchanged), (1, 1))
+        self.assertEqual(self.read('blog_images/a.jpg'), b'changed')
+
+    def test_link_mode_shares_the_source_files(self):
+        stats = sync_media([self.source], self.dest, link=True)
+        # Hardlinked, or reflinked on copy-on-write filesystems; nothing copied either way
+        self.assertEqual((stats.copied, stats.linked, stats.bytes_moved), (0, 2, 0))
+        self.assertEqual(self.read('blog_images/a.jpg'), b'a')
+        self.assertEqual(sync_media([self.source], self.dest, link=True).unchanged, 2)
+
+    def test_orphans_are_deleted_and_empty_directories_pruned(self):
+        sync_media([self.source], self.dest)
+        os.remove(os.path.join(self.source, 'gallery_images', 'b.jpg'))
+        stats = sync_media([self.source], self.dest)
+        self.assertEqual((stats.deleted, stats.unchanged), (1, 1))
+        self.assertEqual(os.listdir(self.dest), ['blog_images'])
+
+        os.remove(os.path.join(self.source, 'blog_images', 'a.jpg'))
+        self.assertEqual(sync_media([self.source], self.dest, delete=False).deleted, 0)
+        self.assertTrue(os.path.exists(os.path.join(self.dest, 'blog_images', 'a.jpg')))
+
+
+class ImportMarkdownBlogsTests(TestCase):
+    def setUp(self):
+        self.content_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.content_dir)
+
+    def write_post(self, slug, tags, category='Commentary', author='Guest Writer'):
+        with open(os.path.join(self.content_dir, f'{slug}.md'), 'w', encoding='utf-8') as f:
+            f.write(
+                f'---\ntitle: {slug.title()}\nslug: {slug}\nauthor: {author}\n'
+                f'category: {category}\ntags: [{", ".join(tags)}]\ndate: "2024-03-15T00:00:00+00:00"\n---\n\nBody of {slug}'
+            )
+
+    def run_import(self):
+        call_command('import_markdown_blogs', content_dir=self.content_dir, stdout=io.StringIO())
+
+    def test_bulk_import_creates_and_updates(self):
+        for i in range(20):
+            self.write_post(f'post-{i}', [f'tag-{i % 3}', 'shared'])
+
+        # default user get_or_create (4), then in one transaction: categories and
+        # tags (select + insert each), posts lookup and insert, through delete + insert,
+        # search documents (posts, tags, delete, insert)
+        with self.assertNumQueries(18):
+            self.run_import()
+
+        self.assertEqual(BlogPost.objects.count(), 20)
+        post = BlogPost.objects.get(slug='post-4')
+        self.assertEqual(post.author_name, 'Guest Writer')
+        self.assertEqual(post.category.name, 'Commentary')
+        self.assertEqual(sorted(post.tags.values_list('name', flat=True)), ['shared', 'tag-1'])
+
+        self.write_post('post-4', ['fresh'], category='Analysis')
+        old_updated_at = post.updated_at
+        self.run_import()
+
+        post.refresh_from_db()
+        self.assertEqual(BlogPost.objects.count(), 20)
+        self.assertEqual(post.category.name, 'Analysis')
+        self.assertEqual(list(post.tags.values_list('name', flat=True)), ['fresh'])
+        self.assertGreater(post.updated_at, old_updated_at)
+
+    def test_names_differing_only_in_case_share_a_slug(self):
+        Tag.objects.create(name='adr', slug='adr')
+        Category.objects.create(name='commentary', slug='commentary')
+        self.write_post('first', ['ADR', 'Adr'])
+        self.write_post('second', ['New Tag', 'new tag'], category='Commentary')
+        self.run_import()
+
+        self.assertEqual(BlogPost.objects.count(), 2)
+        first = BlogPost.objects.get(slug='first')
+        self.assertEqual(list(first.tags.values_list('slug', flat=True)), ['adr'])
+        self.assertEqual(first.category.slug, 'commentary')
+        self.assertEqual(Category.objects.count(), 1)
+        self.assertEqual(list(Tag.objects.filter(slug='new-tag').values_list('name', flat=True)), ['New Tag'])
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.tag = Tag.objects.create(name='Mediation', slug='mediation')
+        self.post = BlogPost.objects.create(
+            title='Arbitration in India', slug='arbitration-india', published=True,
+            content='Seat and venue of international commercial arbitration.',
+        )
+        BlogPost.objects.create(
+            title='Notes', slug='notes', published=True, content='Passing mention of arbitration.'
+        )
+        BlogPost.objects.create(title='Arbitration draft', slug='draft', content='Unpublished')
+        Event.objects.create(
+            title='Moot Court', slug='moot', description='An arbitration moot', published=True,
+            start_date=timezone.now(), event_type='competition',
+        )
+
+    def search(self, query):
+        return self.client.get('/api/search/', {'q': query}).json()
+
+    def test_ranked_prefix_search_across_types(self):
+        results = self.search('arbitrat')
+        self.assertEqual([post['slug'] for post in results['blogs']], ['arbitration-india', 'notes'])
+        self.assertEqual([event['slug'] for event in results['events']], ['moot'])
+        self.assertEqual(results['announcements'], [])
+
+    def test_documents_follow_saves_tags_and_deletes(self):
+        self.assertEqual(self.search('mediation')['blogs'], [])
+
+        self.post.tags.add(self.tag)
+        self.assertEqual([post['slug'] for post in self.search('mediation')['blogs']], ['arbitration-india'])
+
+        self.tag.delete()
+        self.assertEqual(self.search('mediation')['blogs'], [])
+
+        self.post.delete()
+        self.assertFalse(SearchDocument.objects.filter(object_id=self.post.pk).exists())
+
+
+class SearchIndexInstallTests(TransactionTestCase):
+    # The SQLite schema editor can't run inside a test case's transaction
+    migration = importlib.import_module('core.migrations.0009_searchdocument')
+    fts_table = f'{SearchDocument._meta.db_table}_fts'
+
+    def uninstall(self):
+        with connection.schema_editor() as schema_editor:
+            self.migration.uninstall_search_index(None, schema_editor)
+        self.addCleanup(call_command, 'rebuild_search_index', stdout=io.StringIO())
+        self.assertNotIn(self.fts_table, connection.introspection.table_names())
+
+    @override_settings(SEARCH_BACKEND='core.search.backends.InvertedIndexSearchBackend')
+    def test_database_index_does_not_depend_on_the_search_backend_setting(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Checks the SQLite FTS5 table')
+        self.uninstall()
+        with connection.schema_editor() as schema_editor:
+            self.migration.install_search_index(None, schema_editor)
+        self.assertIn(self.fts_table, connection.introspection.table_names())
+
+        # rebuild_search_index puts back an index that went missing
+        BlogPost.objects.create(title='Seat and venue', slug='venue', published=True, content='Body')
+        self.uninstall()
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        with override_settings(SEARCH_BACKEND=''):
+            results = self.client.get('/api/search/', {'q': 'venu'}).json()
+        self.assertEqual([post['slug'] for post in results['blogs']], ['venue'])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {self.fts_table} WHERE {self.fts_table} MATCH 'venue'")
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+class InvertedIndexTests(TestCase):
+    def test_round_trip_through_static_files(self):
+        index = InvertedIndex.build([
+            ('blog', uuid.uuid4(), 'seat', 'Arbitration seat', 'The seat of arbitrations in India'),
+            ('blog', uuid.uuid4(), 'notes', 'Notes', 'A passing mention of arbitration'),
+            ('event', uuid.uuid4(), 'moot', 'Moot court', 'Mediation and arbitration moot'),
+        ])
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        for filename, data in index.to_files().items():
+            with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        loaded = InvertedIndex.from_files(directory)
+
+        for candidate in (index, loaded):
+            self.assertEqual([doc[2] for doc in candidate.search('arbitrat')], ['seat', 'notes', 'moot'])
+            self.assertEqual([doc[2] for doc in candidate.search('arbitration', doc_type='event')], ['moot'])
+            self.assertEqual([doc[2] for doc in candidate.search('mediation moo')], ['moot'])
+            self.assertEqual(candidate.search('seat mediation'), [])
+
+    def test_search_view_uses_exported_index(self):
+        post = BlogPost.objects.create(title='Arbitration seat', slug='seat', published=True, content='Venue')
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+
+        def export():
+            call_command(
+                'export_static_content', output_dir=output_dir, incremental=True,
+                media_sources=[os.path.join(output_dir, 'no-media')], stdout=io.StringIO(),
+            )
+            # Drop the database documents so only the static index can answer
+            SearchDocument.objects.all().delete()
+
+        def search(query):
+            return [blog['id'] for blog in self.client.get('/api/search/', {'q': query}).json()['blogs']]
+
+        export()
+        with override_settings(
+            SEARCH_BACKEND='core.search.backends.InvertedIndexSearchBackend',
+            STATIC_SEARCH_INDEX_DIR=os.path.join(output_dir, 'search'),
+        ):
+            self.assertEqual(search('arbit'), [str(post.pk)])
+
+            # Same length and shard, so only terms-v.json changes
+            post.content = 'Verdict'
+            post.save()
+            export()
+            self.assertEqual(search('venue'), [])
+            self.assertEqual(search('verdict'), [str(post.pk)])
+
+
+@override_settings(SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=3600)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.category = Category.objects.create(name='Commentary', slug='commentary')
+        self.post = BlogPost.objects.create(
+            title='Cached', slug='cached', published=True, content='Body', category=self.category
+        )
+
+    def assert_cached(self, url, params=None):
+        first = self.client.get(url, params).json()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, params).json(), first)
+        return first
+
+    def test_hits_skip_the_database_and_edits_show_immediately(self):
+        self.assert_cached('/api/blogs/', {'category': 'commentary', 'page': 1})
+        self.assert_cached('/api/blogs/cached/')
+
+        self.category.name = 'Analysis'
+        self.category.save()
+        self.assertEqual(self.client.get('/api/blogs/').json()['results'][0]['category_name'], 'Analysis')
+
+        self.post.tags.add(Tag.objects.create(name='Fresh', slug='fresh'))
+        self.assertEqual(self.client.get('/api/blogs/cached/').json()['tags'][0]['name'], 'Fresh')
+
+        self.post.delete()
+        self.assertEqual(self.client.get('/api/blogs/').json()['count'], 0)
+
+    def test_upcoming_events_follow_the_clock(self):
+        event = Event.objects.create(
+            title='Soon', slug='soon', description='Event', published=True, event_type='seminar',
+            start_date=timezone.now() + timedelta(hours=1),
+        )
+        response = self.client.get('/api/events/', {'upcoming': 1})
+        self.assertEqual(response.json()['count'], 1)
+        # The event starting is no save, so no generation changes
+        Event.objects.filter(pk=event.pk).update(start_date=timezone.now() - timedelta(hours=1))
+        response = self.client.get('/api/events/', {'upcoming': 1}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual((response.status_code, response.json()['count']), (200, 0))
+
+    def test_file_based_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory,
+        }}):
+            TeamMember.objects.create(name='Ada', role='convenor', batch='2024')
+            self.assertEqual(len(self.assert_cached('/api/team/')['results']), 1)
+
+            TeamMember.objects.create(name='Grace', role='convenor', batch='2024')
+            self.assertEqual(len(self.client.get('/api/team/').json()['results']), 2)
+
+
+@override_settings(SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=3600)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.post = BlogPost.objects.create(title='Fresh', slug='fresh', published=True, content='Body')
+
+    def test_not_modified_before_serialization(self):
+        response = self.client.get('/api/blogs/', {'page': 1})
+        etag = response['ETag']
+        self.assertIn('stale-while-revalidate=', response['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/blogs/', {'page': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response['ETag']), (304, etag))
+
+        with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+            # Without the response cache a revalidation is one aggregate query
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/blogs/', {'page': 1}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+        self.post.title = 'Edited'
+        self.post.save()
+        response = self.client.get('/api/blogs/', {'page': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_no_last_modified(self):
+        # Deletions and related renames don't move the newest updated_at
+        response = self.client.get('/api/blogs/fresh/')
+        self.assertNotIn('Last-Modified', response)
+        response = self.client.get('/api/blogs/fresh/', HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(SHARED_CACHE=False, RESPONSE_CACHE_TIMEOUT=0)
+    def test_etag_without_a_shared_cache_follows_related_rows(self):
+        # As if made by another process: these fire no signals, so no generation
+        # here is bumped and the ETag has to come from the rows
+        author = User.objects.create_user('author', first_name='Ada')
+        category = Category.objects.create(name='Commentary', slug='commentary')
+        tag = Tag.objects.create(name='ADR', slug='adr')
+        BlogPost.objects.filter(pk=self.post.pk).update(author=author, category=category)
+
+        def etag():
+            return self.client.get('/api/blogs/', {'page': 1})['ETag']
+
+        seen = [etag()]
+        for change in (
+            lambda: Category.objects.filter(pk=category.pk).update(name='Analysis', updated_at=timezone.now()),
+            lambda: User.objects.filter(pk=author.pk).update(first_name='Grace'),
+            lambda: BlogPost.tags.through.objects.create(blogpost=self.post, tag=tag),
+        ):
+            change()
+            seen.append(etag())
+        self.assertEqual(len(set(seen)), 4)
+        self.assertEqual(etag(), seen[-1])
+
+
+class ListIndexTests(TestCase):
+    INDEXES = {
+        BlogPost: ['blog_published_created_idx', 'blog_featured_created_idx', 'blog_category_created_idx'],
+        Event: ['event_published_start_idx', 'event_featured_start_idx', 'event_type_start_idx'],
+        Gallery: ['gallery_published_created_idx'],
+        TeamMember: ['team_active_order_idx'],
+        Announcement: ['announcement_active_order_idx'],
+        CarouselImage: ['carousel_active_order_idx'],
+    }
+
+    def test_list_filter_indexes_are_migrated(self):
+        with connection.cursor() as cursor:
+            for model, names in self.INDEXES.items():
+                constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+                for name in names:
+                    self.assertTrue(constraints.get(name, {}).get('index'), f'{name} missing')
+        call_command('makemigrations', 'core', check=True, dry_run=True, stdout=io.StringIO())
+
+    def test_published_blog_list_uses_its_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Reads the SQLite query plan')
+        queryset = BlogPost.objects.filter(published=True).order_by('-created_at')
+        self.assertIn('blog_published_created_idx', queryset.explain())
+
+
+# Query budgets as deployed, with a shared cache
+@override_settings(SHARED_CACHE=True)
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        start = timezone.now()
+        for i in range(5):
+            # Posts 1 and 2 share a date, so ties are broken on the id
+            BlogPost.objects.create(
+                title=f'Post {i}', slug=f'post-{i}', published=True, content='Body',
+                published_date=start - timezone.timedelta(days=min(i, 2) if i < 3 else i),
+            )
+        self.expected = list(
+            BlogPost.objects.order_by('-published_date', '-id').values_list('slug', flat=True)
+        )
+
+    def test_walks_forwards_and_backwards(self):
+        url, slugs, pages = '/api/blogs/?cursor=&page_size=2&count=false', [], []
+        while url:
+            # ETag rows, page rows and the tag prefetch, however deep the page is
+            with CaptureQueriesContext(connection) as queries:
+                page = self.client.get(url).json()
+            self.assertEqual(len(queries), 3)
+            # The ETag reads the page window, not the whole listing
+            self.assertIn('LIMIT 3', queries[0]['sql'])
+            self.assertIsNone(page['count'])
+            slugs += [post['slug'] for post in page['results']]
+            pages.append(page)
+            url = page['next']
+        self.assertEqual(slugs, self.expected)
+        self.assertEqual(len(pages), 3)
+
+        previous = self.client.get(pages[-1]['previous'].replace('count=false', 'count=true')).json()
+        self.assertEqual(previous['results'], pages[1]['results'])
+        self.assertEqual(previous['count'], 5)
+        first = self.client.get(previous['previous']).json()
+        self.assertEqual((first['results'], first['previous']), (pages[0]['results'], None))
+
+        self.assertEqual(self.client.get('/api/blogs/', {'cursor': 'bogus'}).status_code, 404)
+        self.assertEqual(self.client.get('/api/blogs/', {'page': 1})['Content-Type'], 'application/json')
+
+        # page_size is a keyset mode option; page numbers keep the default size
+        self.assertEqual(len(self.client.get('/api/blogs/', {'page': 1, 'page_size': 2}).json()['results']), 5)
+
+    def test_staff_queues(self):
+        self.assertEqual(self.client.get('/api/staff/submissions/', {'cursor': ''}).status_code, 403)
+
+        for i, status in enumerate(['pending', 'accepted', 'pending']):
+            Submission.objects.create(
+                submission_type='blog_article', title=f'Draft {i}', author_name='Ada',
+                author_email='ada@example.com', content='Body', status=status,
+            )
+        self.client.force_login(User.objects.create_user('editor', is_staff=True))
+        page = self.client.get('/api/staff/submissions/', {'cursor': '', 'status': 'pending'}).json()
+        self.assertEqual([item['title'] for item in page['results']], ['Draft 2', 'Draft 0'])
+        self.assertEqual((page['count'], page['next']), (2, None))
+
+
+class FastSerializerTests(TestCase):
+    def test_matches_drf_serializers_byte_for_byte(self):
+        author = User.objects.create_user('writer', first_name='Ada')
+        category = Category.objects.create(name='Commentary', slug='commentary')
+        tag = Tag.objects.create(name='Mediation', slug='mediation')
+        for i, (post_author, post_category) in enumerate([(author, category), (None, None)]):
+            post = BlogPost.objects.create(
+                title=f'Post {i}', slug=f'post-{i}', published=True, content='Body', author=post_author,
+                category=post_category, featured_image='blog_images/cover.jpg' if i else '',
+            )
+            post.tags.add(tag)
+        Event.objects.create(
+            title='Moot', slug='moot', description='Moot', published=True,
+            start_date=timezone.now(), event_type='competition', author=author,
+        )
+        TeamMember.objects.create(name='Ada', role='co_convenor', batch='2024', image='team_images/ada.jpg')
+
+        request = RequestFactory().get('/api/', HTTP_HOST='localhost')
+        for queryset, serializer_class, fast_class in ENDPOINTS.values():
+            expected = JSONRenderer().render(serializer_class(queryset(), many=True, context={'request': request}).data)
+            fast = fast_class({'request': request})
+            self.assertEqual(JSONRenderer().render(fast.serialize(fast.values(queryset()))), expected)
+
+        caches['default'].clear()
+        self.assertNotIn('category_name', self.client.get('/api/blogs/').json()['results'][0])
+
+
+# Query budgets as deployed, with a shared cache
+@override_settings(SHARED_CACHE=True)
+class GalleryStatsTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.author = User.objects.create_user('photographer')
+        self.first, self.second = [
+            Gallery.objects.create(title=f'Gallery {i}', slug=f'gallery-{i}', published=True, author=self.author)
+            for i in range(2)
+        ]
+
+    def test_image_count_and_cover_follow_images(self):
+        old = Image.objects.create(title='Old', image='gallery_images/old.jpg', gallery=self.first)
+        new = Image.objects.create(title='New', image='gallery_images/new.jpg', gallery=self.first)
+        self.first.refresh_from_db()
+        self.assertEqual((self.first.image_count, self.first.cover_thumbnail.name), (2, 'gallery_images/new.jpg'))
+
+        new.gallery = self.second
+        new.save()
+        old.delete()
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.image_count, self.first.cover_thumbnail.name), (0, ''))
+        self.assertEqual(self.second.image_count, 1)
+
+        self.second.cover_image = 'gallery_covers/cover.jpg'
+        self.second.save()
+        self.second.refresh_from_db()
+        self.assertEqual(self.second.cover_thumbnail.name, 'gallery_covers/cover.jpg')
+
+    def test_list_query_count_is_flat(self):
+        for gallery in (self.first, self.second):
+            Image.objects.create(title='Photo', image='gallery_images/photo.jpg', gallery=gallery)
+        # ETag aggregate, page count, the galleries with their authors and their image variants
+        with self.assertNumQueries(4):
+            results = self.client.get('/api/galleries/').json()['results']
+        self.assertEqual([gallery['image_count'] for gallery in results], [1, 1])
+        self.assertTrue(results[0]['cover_thumbnail'].endswith('/media/gallery_images/photo.jpg'))
+
+
+@override_settings(SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=3600)
+class HomeBundleTests(TestCase):
+    def test_sections_in_one_request(self):
+        caches['default'].clear()
+        author = User.objects.create_user('editor', first_name='Ada')
+        for i in range(4):
+            post = BlogPost.objects.create(
+                title=f'Featured {i}', slug=f'featured-{i}', published=True, featured=True,
+                content='Body', author=author,
+            )
+            post.tags.add(Tag.objects.create(name=f'Tag {i}', slug=f'tag-{i}'))
+            Event.objects.create(
+                title=f'Event {i}', slug=f'event-{i}', description='Event', published=True, featured=True,
+                start_date=timezone.now(), event_type='seminar', author=author,
+            )
+
+        # Five section validators, then one query per section plus the blog tags
+        with self.assertNumQueries(11):
+            response = self.client.get('/api/home/')
+        home = response.json()
+        self.assertEqual(list(home), ['carousel', 'announcements', 'featured_blogs', 'featured_events', 'leadership'])
+        self.assertEqual((len(home['featured_blogs']), len(home['featured_events'])), (3, 3))
+        self.assertEqual(home['featured_blogs'][0]['author_display_name'], 'Ada')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/home/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, IMAGE_DERIVATIVE_WIDTHS=[320, 640, 1600])
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+
+    def upload(self, name, size):
+        buffer = io.BytesIO()
+        PILImage.new('RGB', size, (200, 80, 40)).save(buffer, 'JPEG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+    def test_variants_generated_on_save_and_served_as_srcset(self):
+        member = TeamMember.objects.create(
+            name='Ada', role='convenor', batch='2024', image=self.upload('ada.jpg', (1000, 500))
+        )
+        self.assertFalse(ImageDerivative.objects.exists())
+        self.assertEqual(run_pending(), 1)
+
+        derivative = ImageDerivative.objects.get(source=member.image.name)
+        # Buckets wider than the original collapse to its own width
+        self.assertEqual((derivative.width, derivative.height, derivative.widths), (1000, 500, [320, 640, 1000]))
+        self.assertTrue(derivative.placeholder.startswith('data:image/jpeg;base64,'))
+        with PILImage.open(os.path.join(self.media_root, 'team_images', 'ada.320w.webp')) as variant:
+            self.assertEqual((variant.format, variant.size), ('WEBP', (320, 160)))
+
+        variants = self.client.get('/api/team/').json()['results'][0]['image_variants']
+        self.assertEqual(
+            variants['srcset']['jpg'],
+            ', '.join(f'http://testserver/media/team_images/ada.{width}w.jpg {width}w' for width in (320, 640, 1000))
+        )
+
+    @override_settings(SHARED_CACHE=True, RESPONSE_CACHE_TIMEOUT=3600)
+    def test_new_variants_invalidate_cached_responses(self):
+        BlogPost.objects.create(
+            title='Pictured', slug='pictured', published=True, featured=True, content='Body',
+            featured_image=self.upload('pictured.jpg', (800, 400)),
+        )
+        blogs = self.client.get('/api/blogs/')
+        self.assertIsNone(blogs.json()['results'][0]['featured_image_variants'])
+        self.assertIsNone(self.client.get('/api/home/').json()['featured_blogs'][0]['featured_image_variants'])
+
+        run_pending()
+        response = self.client.get('/api/blogs/', HTTP_IF_NONE_MATCH=blogs['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['featured_image_variants']['width'], 800)
+        self.assertEqual(self.client.get('/api/home/').json()['featured_blogs'][0]['featured_image_variants']['width'], 800)
+
+
+@task('test_flaky')
+def flaky_task(job, fail_times=0):
+    job.report(50, 'Halfway')
+    if job.job.attempts < fail_times:
+        raise RuntimeError('storage unavailable')
+
+
+class JobQueueTests(TestCase):
+    def test_identical_pending_jobs_are_deduplicated(self):
+        first = enqueue('test_flaky', fail_times=0)
+        self.assertEqual(enqueue('test_flaky', fail_times=0), first)
+        self.assertNotEqual(enqueue('test_flaky', fail_times=1), first)
+        run_pending()
+        # Once the first has run, the same work can be queued again
+        self.assertNotEqual(enqueue('test_flaky', fail_times=0), first)
+
+    def test_failed_jobs_retry_with_backoff_until_max_attempts(self):
+        job = enqueue('test_flaky', max_attempts=2, fail_times=5)
+        self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('pending', 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn('storage unavailable', job.error)
+
+        # Not due yet
+        self.assertEqual(run_pending(), 0)
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.message), ('failed', 2, 'Failed after 2 attempts'))
+
+    def test_retry_succeeds(self):
+        job = enqueue('test_flaky', fail_times=1)
+        run_pending()
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.progress, job.error), ('succeeded', 2, 100, ''))
+
+    def test_build_endpoint_queues_job_and_reports_progress(self):
+        staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        TASKS['build_static_content'], original = flaky_task, TASKS['build_static_content']
+        self.addCleanup(TASKS.__setitem__, 'build_static_content', original)
+
+        response = self.client.post('/content/build/')
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        self.assertEqual(data['job']['status'], 'pending')
+        # A second click while it waits reuses the queued build
+        self.assertEqual(self.client.post('/content/build/').json()['job']['id'], data['job']['id'])
+
+        call_command('run_jobs', once=True, stdout=io.StringIO())
+        job = self.client.get(data['status_url']).json()['job']
+        self.assertEqual((job['status'], job['progress'], job['message']), ('succeeded', 100, 'Done'))
+
+
+class StagedUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, STAGE_UPLOADS=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+
+    def apply(self, cv, writing_sample=b'%PDF-1.4 sample'):
+        return self.client.post('/api/internship/apply/', {
+            'applicant_name': 'Ada', 'applicant_email': 'ada@example.com', 'university': 'NLU', 'course': 'LLB',
+            'year': '3', 'proposed_start_date': '2026-01-05', 'proposed_end_date': '2026-02-05',
+            'interest_letter': 'Hello', 'cv': SimpleUploadedFile('cv.pdf', cv),
+            'writing_sample': SimpleUploadedFile('sample.pdf', writing_sample),
+        })
+
+    def test_files_are_stored_by_the_worker_after_the_response(self):
+        response = self.apply(b'%PDF-1.4 curriculum vitae')
+        self.assertEqual(response.status_code, 201)
+        internship = Internship.objects.get()
+        self.assertEqual((internship.cv.name, internship.writing_sample.name), ('', ''))
+        self.assertEqual(set(Job.objects.values_list('task', 'queue')), {(STORE_TASK, 'default')})
+        self.assertEqual(StagedUpload.objects.count(), 2)
+
+        # Staged in the database, so any machine's worker can store them
+        self.assertEqual(run_pending(queues=['default']), 2)
+        internship.refresh_from_db()
+        self.assertTrue(internship.cv.name.startswith('internship_cvs/cv'))
+        with open(os.path.join(self.media_root, internship.cv.name), 'rb') as f:
+            self.assertEqual(f.read(), b'%PDF-1.4 curriculum vitae')
+        self.assertFalse(StagedUpload.objects.exists())
+
+    def test_files_are_staged_and_stored_in_chunks(self):
+        cv = b'%PDF-1.4 ' + b'curriculum vitae ' * 10
+        with mock.patch('core.uploads.STAGE_CHUNK_SIZE', 64):
+            self.apply(cv)
+        staged = StagedUpload.objects.get(name='cv.pdf')
+        self.assertEqual(staged.size, len(cv))
+        self.assertEqual(staged.chunks.count(), 3)
+
+        run_pending()
+        with open(os.path.join(self.media_root, Internship.objects.get().cv.name), 'rb') as f:
+            self.assertEqual(f.read(), cv)
+        self.assertFalse(StagedUploadChunk.objects.exists())
+
+    def test_uploads_nobody_will_store_are_purged(self):
+        self.apply(b'%PDF-1.4 curriculum vitae')
+        orphan = StagedUpload.objects.create(name='orphan.pdf')
+        StagedUpload.objects.update(created_at=timezone.now() - timedelta(days=8))
+        Job.objects.filter(arguments__field='cv').update(status='failed')
+
+        # The writing sample's job is still pending, so its file stays
+        self.assertEqual(purge_staged_uploads(timedelta(days=7)), 2)
+        self.assertEqual(list(StagedUpload.objects.values_list('name', flat=True)), ['sample.pdf'])
+        self.assertFalse(StagedUpload.objects.filter(pk=orphan.pk).exists())
+
+    def test_missing_staged_upload_fails_with_a_clear_error(self):
+        self.apply(b'%PDF-1.4 curriculum vitae')
+        StagedUpload.objects.all().delete()
+        Job.objects.update(max_attempts=1)
+        run_pending()
+        job = Job.objects.filter(arguments__field='cv').get()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('is missing; the file has to be sent again', job.error)
+
+    def test_contact_without_attachment_queues_nothing(self):
+        response = self.client.post('/api/contact/submit/', {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hi'})
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(Contact.objects.get().attachment)
+        self.assertFalse(Job.objects.exists())
+
+    def test_wrong_type_and_oversized_files_are_rejected(self):
+        response = self.apply(b'MZ\x90\x00 not really a pdf')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Unsupported file type', response.json()['cv'][0])
+
+        with override_settings(UPLOAD_MAX_SIZE=1024):
+            response = self.apply(b'%PDF-1.4 ' + b'x' * 2048)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cv is larger than the', response.json()['detail'])
+
+        self.assertFalse(Internship.objects.exists())
+        self.assertFalse(StagedUpload.objects.exists())
+
+
+class DirectUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, DIRECT_UPLOAD_BACKEND='')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+        # Presign throttle history
+        caches['default'].clear()
+
+    def upload(self, target, content, filename='file.pdf'):
+        """Presign and POST ``content``; returns the token"""
+        response = self.client.post('/api/uploads/presign/', {
+            'target': target, 'filename': filename, 'content_type': 'application/pdf', 'size': len(content),
+        })
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['upload']['method'], 'POST')
+        response = self.client.post(data['upload']['url'], {
+            **data['upload']['fields'], 'file': SimpleUploadedFile(filename, content, 'application/pdf'),
+        })
+        self.assertEqual(response.status_code, 204)
+        return data['token']
+
+    def finalize(self, cv, writing_sample):
+        return self.client.post('/api/internship/finalize/', {
+            'applicant_name': 'Ada', 'applicant_email': 'ada@example.com', 'university': 'NLU', 'course': 'LLB',
+            'year': '3', 'proposed_start_date': '2026-01-05', 'proposed_end_date': '2026-02-05',
+            'interest_letter': 'Hello', 'cv': cv, 'writing_sample': writing_sample,
+        }, content_type='application/json')
+
+    def test_presign_upload_and_finalize(self):
+        cv = self.upload('internship.cv', b'%PDF-1.4 curriculum vitae', 'My CV.pdf')
+        sample = self.upload('internship.writing_sample', b'%PDF-1.4 sample')
+        response = self.finalize(cv, sample)
+        self.assertEqual(response.status_code, 201)
+
+        internship = Internship.objects.get()
+        self.assertRegex(internship.cv.name, r'^internship_cvs/[0-9a-f]{32}/My_CV.pdf$')
+        with open(os.path.join(self.media_root, internship.cv.name), 'rb') as f:
+            self.assertEqual(f.read(), b'%PDF-1.4 curriculum vitae')
+        # Already in storage: nothing left for the worker
+        self.assertFalse(Job.objects.exists())
+
+        # A token finalizes one row
+        self.assertEqual(self.finalize(cv, sample).json()['cv'], ['File has already been submitted.'])
+
+    def test_bad_tokens_and_files_are_rejected(self):
+        response = self.client.post('/api/uploads/presign/', {
+            'target': 'internship.cv', 'filename': 'cv.pdf', 'size': 100 * 1024 * 1024,
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('size', response.json())
+
+        executable = self.upload('internship.cv', b'MZ\x90\x00 not really a pdf')
+        sample = self.upload('internship.writing_sample', b'%PDF-1.4 sample')
+        errors = self.finalize(executable, sample).json()
+        self.assertIn('Unsupported file type', errors['cv'][0])
+        self.assertEqual(errors.keys(), {'cv'})
+        # Rejected objects are removed from storage
+        self.assertFalse(default_storage.exists(load_token(executable)['key']))
+
+        errors = self.finalize(sample, 'forged-token').json()
+        self.assertEqual(errors['cv'], ['Upload token is for another field.'])
+        self.assertEqual(errors['writing_sample'], ['Invalid or expired upload token.'])
+
+        response = self.client.post('/api/uploads/presign/', {'target': 'contact.attachment', 'filename': 'a.pdf', 'size': 10})
+        self.assertEqual(self.client.post('/api/contact/finalize/', {
+            'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hi', 'attachment': response.json()['token'],
+        }).json()['attachment'], ['File has not been uploaded yet.'])
+
+        with override_settings(UPLOAD_MAX_SIZE=1024):
+            response = self.client.post(response.json()['upload']['url'], {
+                'file': SimpleUploadedFile('a.pdf', b'x' * 2048),
+            })
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Internship.objects.exists())
+
+    @override_settings(DIRECT_UPLOAD_RATE='2/hour')
+    def test_presigning_is_throttled(self):
+        data = {'target': 'contact.attachment', 'filename': 'a.pdf', 'size': 10}
+        for _ in range(2):
+            self.assertEqual(self.client.post('/api/uploads/presign/', data).status_code, 201)
+        self.assertEqual(self.client.post('/api/uploads/presign/', data).status_code, 429)
+
+    def test_unfinalized_uploads_are_swept(self):
+        cv = self.upload('internship.cv', b'%PDF-1.4 curriculum vitae')
+        sample = self.upload('internship.writing_sample', b'%PDF-1.4 sample')
+        self.finalize(cv, sample)
+        abandoned = load_token(self.upload('internship.cv', b'%PDF-1.4 abandoned'))['key']
+
+        # Still within the token lifetime
+        self.assertEqual(sweep_unfinalized_uploads(), 0)
+        self.assertEqual(sweep_unfinalized_uploads(timedelta(0)), 1)
+        self.assertFalse(default_storage.exists(abandoned))
+        internship = Internship.objects.get()
+        self.assertTrue(default_storage.exists(internship.cv.name))
+        self.assertTrue(default_storage.exists(internship.writing_sample.name))
+
+    def test_s3_backend_presigns_bucket_urls(self):
+        from storages.backends.s3boto3 import S3Boto3Storage
+
+        storage = S3Boto3Storage(
+            access_key='key', secret_key='secret', bucket_name='media', endpoint_url='http://localhost:9000',
+            region_name='us-east-1',
+        )
+        request = RequestFactory().post('/api/uploads/presign/')
+        upload = S3UploadBackend(storage).upload_request(request, 'token', 'internship_cvs/abc/cv.pdf', 'application/pdf')
+        self.assertEqual(upload['method'], 'POST')
+        self.assertEqual(upload['url'], 'http://localhost:9000/media')
+        self.assertEqual(upload['fields']['key'], 'internship_cvs/abc/cv.pdf')
+        policy = json.loads(base64.b64decode(upload['fields']['policy']))
+        self.assertIn(['content-length-range', 1, 10 * 1024 * 1024], policy['conditions'])
+
+
+class AutoRebuildTests(ExportHelpers, TestCase):
+    def setUp(self):
+        super().setUp()
+        settings_override = override_settings(
+            STATIC_EXPORT_DIR=self.output_dir, AUTO_REBUILD_DELAY=10, AUTO_REBUILD_MAX_DELAY=60
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.export()
+
+    def test_edits_are_coalesced_into_one_delayed_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = BlogPost.objects.create(title='First', slug='first', content='Body', published=True)
+        job = Job.objects.get(task=REBUILD_TASK)
+        self.assertEqual(job.arguments, {'models': ['core.blogpost']})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tag = Tag.objects.create(name='News', slug='news')
+            post.tags.add(tag)
+        job.refresh_from_db()
+        self.assertEqual(Job.objects.filter(task=REBUILD_TASK).count(), 1)
+        self.assertEqual(job.arguments, {'models': ['core.blogpost', 'core.tag']})
+
+        # Still within the quiet period
+        self.assertEqual(run_pending(), 0)
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        self.assertEqual(run_pending(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertIn('Skipped team (not affected)', job.log)
+        self.assertEqual(self.read_json('blogs.json')['results'][0]['tags'][0]['name'], 'News')
+
+    def test_debounce_is_capped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Announcement.objects.create(title='Hello', content='Body')
+        job = Job.objects.get(task=REBUILD_TASK)
+        # Edits have kept coming for 55 of the allowed 60 seconds
+        first_edit = timezone.now() - timedelta(seconds=55)
+        Job.objects.filter(pk=job.pk).update(created_at=first_edit, run_after=first_edit + timedelta(seconds=10))
+        with self.captureOnCommitCallbacks(execute=True):
+            Announcement.objects.create(title='Again', content='Body')
+        job.refresh_from_db()
+        self.assertEqual(job.run_after, first_edit + timedelta(seconds=60))
+
+    def test_dashboard_build_does_not_queue_a_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with paused():
+                Announcement.objects.create(title='Hello', content='Body')
+        self.assertFalse(Job.objects.filter(task=REBUILD_TASK).exists())
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        author = User.objects.create_user('editor', first_name='Ada')
+        category = Category.objects.create(name='Arbitration', slug='arbitration')
+        tags = [Tag.objects.create(name=f'Tag {i}', slug=f'tag-{i}') for i in range(3)]
+        for i in range(5):
+            post = BlogPost.objects.create(
+                title=f'Arbitration {i}', slug=f'post-{i}', content='Body', published=True, featured=i < 2,
+                author=author if i % 2 else None, category=category if i % 3 else None,
+                featured_image=f'blog_images/{i}.jpg' if i % 2 else '',
+            )
+            post.tags.set(tags[:i % 3 + 1])
+            Event.objects.create(
+                title=f'Arbitration moot {i}', slug=f'event-{i}', description='Moot', published=True, featured=i < 2,
+                start_date=timezone.now() + timedelta(days=i), event_type='competition',
+            )
+        ImageDerivative.objects.create(
+            source='blog_images/1.jpg', width=800, height=400, widths=[320, 640, 800], placeholder='data:,'
+        )
+        gallery = Gallery.objects.create(title='Moot', slug='moot', published=True, author=author)
+        Image.objects.create(title='Stage', image='gallery_images/stage.jpg', gallery=gallery)
+        TeamMember.objects.create(name='Ada', role='convenor', batch='2024', image='team_images/ada.jpg')
+        for i in range(3):
+            Announcement.objects.create(title=f'Notice {i}', content='Arbitration notice')
+
+    def test_async_views_match_sync_views(self):
+        cursor = self.client.get('/api/blogs/?cursor=&page_size=2').json()['next'].split('cursor=')[1].split('&')[0]
+        cases = [
+            ('/api/blogs/', async_views.BlogPostListView, {}),
+            ('/api/blogs/?page=2&page_size=2', async_views.BlogPostListView, {}),
+            ('/api/blogs/?page=9', async_views.BlogPostListView, {}),
+            (f'/api/blogs/?cursor={cursor}&page_size=2&count=false', async_views.BlogPostListView, {}),
+            ('/api/blogs/?category=arbitration&featured=true', async_views.BlogPostListView, {}),
+            ('/api/blogs/post-1/', async_views.BlogPostDetailView, {'slug': 'post-1'}),
+            ('/api/blogs/missing/', async_views.BlogPostDetailView, {'slug': 'missing'}),
+            ('/api/events/?cursor=', async_views.EventListView, {}),
+            ('/api/events/event-2/', async_views.EventDetailView, {'slug': 'event-2'}),
+            ('/api/galleries/', async_views.GalleryListView, {}),
+            ('/api/galleries/moot/', async_views.GalleryDetailView, {'slug': 'moot'}),
+            ('/api/team/', async_views.TeamMemberListView, {}),
+            ('/api/leadership/', async_views.LeadershipListView, {}),
+            ('/api/announcements/?limit=2', async_views.AnnouncementListView, {}),
+            ('/api/carousel/', async_views.CarouselImageListView, {}),
+            ('/api/newsletter-archives/', async_views.NewsletterArchiveListView, {}),
+            ('/api/categories/', async_views.CategoryListView, {}),
+            ('/api/tags/', async_views.TagListView, {}),
+        ]
+        functions = [
+            ('/api/featured/', async_views.featured_content),
+            ('/api/home/', async_views.home),
+            ('/api/search/?q=arbitration', async_views.search),
+            ('/api/search/', async_views.search),
+        ]
+        cases = [(path, view_class.as_view(), kwargs) for path, view_class, kwargs in cases]
+        cases += [(path, view, {}) for path, view in functions]
+
+        for path, view, kwargs in cases:
+            with self.subTest(path):
+                expected = self.client.get(path)
+                response = async_to_sync(view)(RequestFactory().get(path), **kwargs)
+                self.assertEqual(
+                    (response.status_code, response.content, response.get('ETag')),
+                    (expected.status_code, expected.content, expected.get('ETag')),
+                )
+
+    def test_async_views_with_a_database_cache(self):
+        caches_setting = {'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'test_response_cache',
+        }}
+        with override_settings(CACHES=caches_setting, RESPONSE_CACHE_TIMEOUT=3600):
+            call_command('createcachetable', stdout=io.StringIO())
+            for path, view in [
+                ('/api/blogs/', async_views.BlogPostListView.as_view()),
+                ('/api/home/', async_views.home),
+                ('/api/featured/', async_views.featured_content),
+            ]:
+                with self.subTest(path):
+                    expected = self.client.get(path)
+                    # A miss, then a hit
+                    for _ in range(2):
+                        response = async_to_sync(view)(RequestFactory().get(path))
+                        self.assertEqual(
+                            (response.status_code, response.content, response['ETag']),
+                            (200, expected.content, expected['ETag']),
+                        )
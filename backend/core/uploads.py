@@ -0,0 +1,185 @@
+"""
+Form uploads kept out of the request cycle.
+
+The contact and internship endpoints parse multipart bodies with
+``StagingMultiPartParser``, which writes every file to a temporary file and
+stops reading one that passes ``settings.UPLOAD_MAX_SIZE``. Serializer
+validators check the size and sniff the leading bytes, so a renamed
+executable doesn't pass for a PDF. ``StagedUploadMixin`` then saves the row
+without its files and queues a ``store_staged_upload`` job per file: the
+response goes out as soon as the row is committed, and the copy to media
+storage (S3 in production) happens in the worker, retried on failure. The
+staged bytes are kept in the database rather than on the web machine's disk,
+which is replaced on deploy and may be stopped before a worker gets to it, so
+any worker can store them. They are written in ``STAGE_CHUNK_SIZE`` pieces
+(``StagedUploadChunk``) before the row's transaction opens, so neither the
+request nor the worker holds a whole file in memory.
+
+Staged uploads nobody will store (their job failed for good, or the request
+that staged them failed) are removed by ``purge_staged_uploads``, which the
+worker runs every hour.
+"""
+import tempfile
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
+from django.http.multipartparser import MultiPartParserError
+from django.utils import timezone
+from rest_framework import parsers, serializers
+from .jobs import enqueue, task
+from .models import Job, StagedUpload, StagedUploadChunk
+
+STORE_TASK = 'store_staged_upload'
+
+# Bytes per StagedUploadChunk row
+STAGE_CHUNK_SIZE = 1024 * 1024
+
+# Leading bytes of the accepted file types
+SIGNATURES = {
+    'PDF': (b'%PDF-',),
+    # .doc (OLE2 compound file), .docx and .odt (zip)
+    'Word': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', b'PK\x03\x04'),
+    'RTF': (b'{\\rtf',),
+    'JPEG': (b'\xff\xd8\xff',),
+    'PNG': (b'\x89PNG\r\n\x1a\n',),
+    'GIF': (b'GIF87a', b'GIF89a'),
+}
+
+DOCUMENT_TYPES = ('PDF', 'Word', 'RTF')
+ATTACHMENT_TYPES = DOCUMENT_TYPES + ('JPEG', 'PNG', 'GIF', 'WebP')
+
+
+def sniff(file):
+    """The type of ``file`` going by its first bytes, or None"""
+    file.seek(0)
+    head = file.read(16)
+    file.seek(0)
+    return file_type(head)
+
+
+def file_type(head):
+    """The type of a file starting with the bytes ``head`` (at least 16 of them), or None"""
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'WebP'
+    for kind, signatures in SIGNATURES.items():
+        if head.startswith(signatures):
+            return kind
+    return None
+
+
+def megabytes(size):
+    return f'{size / (1024 * 1024):g} MB'
+
+
+class UploadTooLarge(MultiPartParserError):
+    pass
+
+
+class StagingUploadHandler(TemporaryFileUploadHandler):
+    """Streams every file to disk, never memory, and gives up on one past UPLOAD_MAX_SIZE"""
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.UPLOAD_MAX_SIZE:
+            self.upload_interrupted()
+            raise UploadTooLarge(f'{self.field_name} is larger than the {megabytes(settings.UPLOAD_MAX_SIZE)} limit')
+        return super().receive_data_chunk(raw_data, start)
+
+
+class StagingMultiPartParser(parsers.MultiPartParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context['request']
+        request.upload_handlers = [StagingUploadHandler(request)]
+        return super().parse(stream, media_type, parser_context)
+
+
+class UploadValidator:
+    """Serializer field validator: within UPLOAD_MAX_SIZE and one of ``kinds`` by content"""
+
+    def __init__(self, kinds):
+        self.kinds = kinds
+
+    def __call__(self, file):
+        if file.size > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'File is larger than the {megabytes(settings.UPLOAD_MAX_SIZE)} limit.'
+            )
+        if sniff(file) not in self.kinds:
+            raise serializers.ValidationError(f'Unsupported file type. Upload {", ".join(self.kinds)}.')
+
+
+def stage_file(upload):
+    """Copy ``upload`` into a StagedUpload, one chunk row at a time"""
+    staged = StagedUpload.objects.create(name=upload.name)
+    for index, chunk in enumerate(upload.chunks(STAGE_CHUNK_SIZE)):
+        StagedUploadChunk.objects.create(upload=staged, index=index, data=chunk)
+        staged.size += len(chunk)
+    StagedUpload.objects.filter(pk=staged.pk).update(size=staged.size)
+    return staged
+
+
+def stage(instance, field_name, staged):
+    """Queue the job that stores the StagedUpload ``staged`` on ``instance``"""
+    return enqueue(
+        STORE_TASK, max_attempts=5,
+        model=instance._meta.label, pk=str(instance.pk), field=field_name, staged=str(staged.pk),
+    )
+
+
+def purge_staged_uploads(older_than):
+    """
+    Delete staged uploads older than ``older_than`` that no pending or
+    running store job will pick up; returns how many
+    """
+    waiting = {
+        arguments.get('staged') for arguments in Job.objects.filter(
+            task=STORE_TASK, status__in=['pending', 'running']
+        ).values_list('arguments', flat=True)
+    }
+    stale = StagedUpload.objects.filter(created_at__lt=timezone.now() - older_than).exclude(pk__in=waiting - {None})
+    return stale.delete()[1].get(StagedUpload._meta.label, 0)
+
+
+class StagedUploadMixin:
+    """ModelSerializer mixin: save the row now and its ``staged_fields`` files from a job"""
+    staged_fields = ()
+
+    def create(self, validated_data):
+        if not settings.STAGE_UPLOADS:
+            return super().create(validated_data)
+        uploads = {name: validated_data.pop(name) for name in self.staged_fields if validated_data.get(name)}
+        # The bytes go in first, outside the transaction; if the row then
+        # fails to save they are left for purge_staged_uploads
+        staged = {name: stage_file(upload) for name, upload in uploads.items()}
+        with transaction.atomic():
+            instance = super().create(validated_data)
+            for name, upload in staged.items():
+                stage(instance, name, upload)
+        return instance
+
+
+@task(STORE_TASK)
+def store_staged_upload(job, model, pk, field, staged):
+    """Copy a staged upload to media storage and point the row's file field at it"""
+    upload = StagedUpload.objects.filter(pk=staged).first()
+    if upload is None:
+        raise RuntimeError(f'Staged upload {staged} for {model} {pk} is missing; the file has to be sent again')
+    model_class = apps.get_model(model)
+    instance = model_class.objects.filter(pk=pk).first()
+    if instance is None:
+        # Deleted before the file got stored
+        upload.delete()
+        return
+
+    job.report(10, f'Storing {upload.name}')
+    fieldfile = getattr(instance, field)
+    with tempfile.TemporaryFile() as spool:
+        # One chunk in memory at a time
+        for data in upload.chunks.values_list('data', flat=True).iterator(chunk_size=1):
+            spool.write(data)
+        spool.seek(0)
+        fieldfile.save(upload.name, File(spool), save=False)
+    # Only this column, so review changes made meanwhile are kept
+    model_class.objects.filter(pk=pk).update(**{field: fieldfile.name, 'updated_at': timezone.now()})
+    upload.delete()
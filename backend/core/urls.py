@@ -1,43 +1,61 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Under ASGI the public read endpoints are served by their async variants
+if settings.ASYNC_API:
+    from . import async_views as read_views
+else:
+    read_views = views
+
 urlpatterns = [
     # Blog URLs
-    path('api/blogs/', views.BlogPostListView.as_view(), name='blog-list'),
-    path('api/blogs/<slug:slug>/', views.BlogPostDetailView.as_view(), name='blog-detail'),
+    path('api/blogs/', read_views.BlogPostListView.as_view(), name='blog-list'),
+    path('api/blogs/<slug:slug>/', read_views.BlogPostDetailView.as_view(), name='blog-detail'),
     
     # Event URLs
-    path('api/events/', views.EventListView.as_view(), name='event-list'),
-    path('api/events/<slug:slug>/', views.EventDetailView.as_view(), name='event-detail'),
+    path('api/events/', read_views.EventListView.as_view(), name='event-list'),
+    path('api/events/<slug:slug>/', read_views.EventDetailView.as_view(), name='event-detail'),
     
     # Gallery URLs
-    path('api/galleries/', views.GalleryListView.as_view(), name='gallery-list'),
-    path('api/galleries/<slug:slug>/', views.GalleryDetailView.as_view(), name='gallery-detail'),
+    path('api/galleries/', read_views.GalleryListView.as_view(), name='gallery-list'),
+    path('api/galleries/<slug:slug>/', read_views.GalleryDetailView.as_view(), name='gallery-detail'),
     
     # Team and Leadership URLs
-    path('api/team/', views.TeamMemberListView.as_view(), name='team-list'),
-    path('api/leadership/', views.LeadershipListView.as_view(), name='leadership-list'),
+    path('api/team/', read_views.TeamMemberListView.as_view(), name='team-list'),
+    path('api/leadership/', read_views.LeadershipListView.as_view(), name='leadership-list'),
 
     # Announcement URLs
-    path('api/announcements/', views.AnnouncementListView.as_view(), name='announcement-list'),
+    path('api/announcements/', read_views.AnnouncementListView.as_view(), name='announcement-list'),
 
     # Carousel URLs
-    path('api/carousel/', views.CarouselImageListView.as_view(), name='carousel-list'),
+    path('api/carousel/', read_views.CarouselImageListView.as_view(), name='carousel-list'),
 
     # Newsletter Archive URLs
-    path('api/newsletter-archives/', views.NewsletterArchiveListView.as_view(), name='newsletter-archive-list'),
+    path('api/newsletter-archives/', read_views.NewsletterArchiveListView.as_view(), name='newsletter-archive-list'),
     
     # Category and Tag URLs
-    path('api/categories/', views.CategoryListView.as_view(), name='category-list'),
-    path('api/tags/', views.TagListView.as_view(), name='tag-list'),
+    path('api/categories/', read_views.CategoryListView.as_view(), name='category-list'),
+    path('api/tags/', read_views.TagListView.as_view(), name='tag-list'),
     
     # Form Submission URLs
     path('api/newsletter/signup/', views.newsletter_signup, name='newsletter-signup'),
     path('api/contact/submit/', views.contact_submit, name='contact-submit'),
     path('api/submissions/submit/', views.submission_submit, name='submission-submit'),
     path('api/internship/apply/', views.internship_apply, name='internship-apply'),
+
+    # Direct-to-storage uploads: presign, POST the file, then finalize the form
+    path('api/uploads/presign/', views.presign_upload, name='presign-upload'),
+    path('api/uploads/local/<str:token>/', views.local_upload, name='local-upload'),
+    path('api/contact/finalize/', views.contact_finalize, name='contact-finalize'),
+    path('api/internship/finalize/', views.internship_finalize, name='internship-finalize'),
     
+    # Staff review queues
+    path('api/staff/submissions/', views.SubmissionQueueView.as_view(), name='submission-queue'),
+    path('api/staff/internships/', views.InternshipQueueView.as_view(), name='internship-queue'),
+
     # Utility URLs
-    path('api/featured/', views.featured_content, name='featured-content'),
-    path('api/search/', views.search, name='search'),
+    path('api/featured/', read_views.featured_content, name='featured-content'),
+    path('api/home/', read_views.home, name='home'),
+    path('api/search/', read_views.search, name='search'),
 ]
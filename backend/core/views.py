@@ -1,22 +1,44 @@
-from rest_framework import generics, status
+from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, parser_classes, throttle_classes
+from rest_framework.parsers import FormParser, JSONParser
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
-from django.db import models
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from django.contrib.auth.models import User
 from .models import (
     Category, Tag, BlogPost, Event, Gallery, Image, Newsletter,
-    Contact, Submission, Internship, TeamMember, Leadership, Announcement, CarouselImage, NewsletterArchive
+    Contact, Submission, Internship, TeamMember, Leadership, Announcement, CarouselImage, NewsletterArchive,
+    ImageDerivative
 )
 from .serializers import (
     CategorySerializer, TagSerializer, BlogPostListSerializer, BlogPostDetailSerializer,
     EventListSerializer, EventDetailSerializer, GalleryListSerializer, GalleryDetailSerializer,
     ImageSerializer, NewsletterSerializer, ContactSerializer, SubmissionSerializer,
-    InternshipSerializer, TeamMemberSerializer, LeadershipSerializer, AnnouncementSerializer, CarouselImageSerializer, NewsletterArchiveSerializer
+    InternshipSerializer, TeamMemberSerializer, LeadershipSerializer, AnnouncementSerializer, CarouselImageSerializer, NewsletterArchiveSerializer,
+    SubmissionReviewSerializer, InternshipReviewSerializer, ContactFinalizeSerializer, InternshipFinalizeSerializer
 )
+from .direct_uploads import (
+    LocalUploadBackend, PresignRateThrottle, PresignUploadSerializer, get_upload_backend, load_token, presign
+)
+from .search.backends import get_search_backend
+from .response_cache import CachedResponseMixin, cache_response
+from .conditional import ConditionalGetMixin, conditional_response
+from .fast_serializers import FastListMixin, BlogPostListFastSerializer, EventListFastSerializer, TeamMemberFastSerializer
+from .home import FEATURED_MODELS, HOME_MODELS, build_home, featured_blogs, featured_events, home_querysets
+from .pagination import BlogPostPagination, EventPagination, SubmissionPagination, InternshipPagination
+from .uploads import StagingMultiPartParser, StagingUploadHandler, UploadTooLarge, megabytes
 
 # Blog Views
-class BlogPostListView(generics.ListAPIView):
+class BlogPostListView(ConditionalGetMixin, CachedResponseMixin, FastListMixin, generics.ListAPIView):
+    cache_models = (BlogPost, Category, Tag, User, ImageDerivative)
+    fast_serializer_class = BlogPostListFastSerializer
     serializer_class = BlogPostListSerializer
+    pagination_class = BlogPostPagination
 
     def get_queryset(self):
         queryset = BlogPost.objects.filter(published=True).select_related('author', 'category').prefetch_related('tags')
@@ -30,7 +52,8 @@ class BlogPostListView(generics.ListAPIView):
 
         return queryset
 
-class BlogPostDetailView(generics.RetrieveAPIView):
+class BlogPostDetailView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_models = (BlogPost, Category, Tag, User, ImageDerivative)
     serializer_class = BlogPostDetailSerializer
     lookup_field = 'slug'
 
@@ -38,8 +61,13 @@ class BlogPostDetailView(generics.RetrieveAPIView):
         return BlogPost.objects.filter(published=True).select_related('author', 'category').prefetch_related('tags')
 
 # Event Views
-class EventListView(generics.ListAPIView):
+class EventListView(ConditionalGetMixin, CachedResponseMixin, FastListMixin, generics.ListAPIView):
+    cache_models = (Event, User, ImageDerivative)
+    # The upcoming list changes as events start, not when a row is saved
+    uncached_params = ('upcoming',)
+    fast_serializer_class = EventListFastSerializer
     serializer_class = EventListSerializer
+    pagination_class = EventPagination
 
     def get_queryset(self):
         queryset = Event.objects.filter(published=True).select_related('author')
@@ -57,7 +85,8 @@ class EventListView(generics.ListAPIView):
 
         return queryset
 
-class EventDetailView(generics.RetrieveAPIView):
+class EventDetailView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_models = (Event, User, ImageDerivative)
     serializer_class = EventDetailSerializer
     lookup_field = 'slug'
 
@@ -65,15 +94,16 @@ class EventDetailView(generics.RetrieveAPIView):
         return Event.objects.filter(published=True).select_related('author')
 
 # Gallery Views
-class GalleryListView(generics.ListAPIView):
+class GalleryListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_models = (Gallery, Image, User, ImageDerivative)
     serializer_class = GalleryListSerializer
 
     def get_queryset(self):
-        return Gallery.objects.filter(published=True).select_related('author').annotate(
-            image_count=models.Count('images')
-        )
+        # image_count and cover_thumbnail are stored on the gallery
+        return Gallery.objects.filter(published=True).select_related('author')
 
-class GalleryDetailView(generics.RetrieveAPIView):
+class GalleryDetailView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_models = (Gallery, Image, User, ImageDerivative)
     serializer_class = GalleryDetailSerializer
     lookup_field = 'slug'
 
@@ -81,20 +111,25 @@ class GalleryDetailView(generics.RetrieveAPIView):
         return Gallery.objects.filter(published=True).select_related('author').prefetch_related('images')
 
 # Team and Leadership Views
-class TeamMemberListView(generics.ListAPIView):
+class TeamMemberListView(ConditionalGetMixin, CachedResponseMixin, FastListMixin, generics.ListAPIView):
+    cache_models = (TeamMember, ImageDerivative)
+    fast_serializer_class = TeamMemberFastSerializer
     serializer_class = TeamMemberSerializer
     queryset = TeamMember.objects.filter(active=True)
 
-class LeadershipListView(generics.ListAPIView):
+class LeadershipListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_models = (Leadership, ImageDerivative)
     serializer_class = LeadershipSerializer
     queryset = Leadership.objects.all()
 
 # Category and Tag Views
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_models = (Category,)
     serializer_class = CategorySerializer
     queryset = Category.objects.all()
 
-class TagListView(generics.ListAPIView):
+class TagListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_models = (Tag,)
     serializer_class = TagSerializer
     queryset = Tag.objects.all()
 
@@ -108,6 +143,7 @@ def newsletter_signup(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['POST'])
+@parser_classes([JSONParser, FormParser, StagingMultiPartParser])
 def contact_submit(request):
     serializer = ContactSerializer(data=request.data)
     if serializer.is_valid():
@@ -124,6 +160,7 @@ def submission_submit(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['POST'])
+@parser_classes([JSONParser, FormParser, StagingMultiPartParser])
 def internship_apply(request):
     serializer = InternshipSerializer(data=request.data)
     if serializer.is_valid():
@@ -131,50 +168,149 @@ def internship_apply(request):
         return Response({'message': 'Internship application submitted successfully'}, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+# Direct-to-storage uploads (core.direct_uploads)
+@api_view(['POST'])
+@throttle_classes([PresignRateThrottle])
+def presign_upload(request):
+    serializer = PresignUploadSerializer(data=request.data)
+    if serializer.is_valid():
+        return Response(presign(request, **serializer.validated_data), status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@csrf_exempt
+@require_http_methods(['POST'])
+def local_upload(request, token):
+    """Stands in for a presigned bucket POST when media isn't on S3"""
+    if not isinstance(get_upload_backend(), LocalUploadBackend):
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    try:
+        key = load_token(token, max_age=settings.DIRECT_UPLOAD_EXPIRY)['key']
+    except signing.BadSignature:
+        return JsonResponse({'detail': 'Invalid or expired upload URL.'}, status=403)
+
+    # Streamed to a temporary file, giving up past UPLOAD_MAX_SIZE
+    request.upload_handlers = [StagingUploadHandler(request)]
+    try:
+        upload = request.FILES.get('file')
+    except UploadTooLarge:
+        return JsonResponse(
+            {'detail': f'File is larger than the {megabytes(settings.UPLOAD_MAX_SIZE)} limit.'}, status=413
+        )
+    if upload is None:
+        return JsonResponse({'detail': 'No file was sent.'}, status=400)
+    # A repeated POST replaces the object, as it would in a bucket
+    default_storage.delete(key)
+    default_storage.save(key, upload)
+    return HttpResponse(status=204)
+
+@api_view(['POST'])
+def contact_finalize(request):
+    serializer = ContactFinalizeSerializer(data=request.data)
+    if serializer.is_valid():
+        serializer.save()
+        return Response({'message': 'Contact form submitted successfully'}, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['POST'])
+def internship_finalize(request):
+    serializer = InternshipFinalizeSerializer(data=request.data)
+    if serializer.is_valid():
+        serializer.save()
+        return Response({'message': 'Internship application submitted successfully'}, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+# Staff Review Queues
+class SubmissionQueueView(generics.ListAPIView):
+    serializer_class = SubmissionReviewSerializer
+    pagination_class = SubmissionPagination
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_queryset(self):
+        queryset = Submission.objects.all()
+        status_filter = self.request.query_params.get('status', None)
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        return queryset
+
+class InternshipQueueView(generics.ListAPIView):
+    serializer_class = InternshipReviewSerializer
+    pagination_class = InternshipPagination
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_queryset(self):
+        queryset = Internship.objects.all()
+        status_filter = self.request.query_params.get('status', None)
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        return queryset
+
 # Featured Content View
+def featured_querysets():
+    return [featured_blogs(), featured_events()]
+
 @api_view(['GET'])
+@conditional_response(featured_querysets, *FEATURED_MODELS)
+@cache_response(*FEATURED_MODELS)
 def featured_content(request):
-    featured_blogs = BlogPost.objects.filter(published=True, featured=True)[:3]
-    featured_events = Event.objects.filter(published=True, featured=True)[:3]
-
-    blog_serializer = BlogPostListSerializer(featured_blogs, many=True)
-    event_serializer = EventListSerializer(featured_events, many=True)
+    blog_serializer = BlogPostListSerializer(featured_blogs(), many=True)
+    event_serializer = EventListSerializer(featured_events(), many=True)
 
     return Response({
         'featured_blogs': blog_serializer.data,
         'featured_events': event_serializer.data
     })
 
+# Homepage Bundle View
+@api_view(['GET'])
+@conditional_response(home_querysets, *HOME_MODELS)
+@cache_response(*HOME_MODELS)
+def home(request):
+    return Response(build_home({'request': request}))
+
 # Search View
+def ranked(queryset, object_ids):
+    """Load ``object_ids`` from ``queryset``, keeping the search ranking order"""
+    objects = queryset.in_bulk(object_ids)
+    return [objects[pk] for pk in object_ids if pk in objects]
+
 @api_view(['GET'])
 def search(request):
     query = request.query_params.get('q', '')
     if not query:
         return Response({'results': []})
 
-    # Search in blog posts
-    blog_results = BlogPost.objects.filter(
-        published=True,
-        title__icontains=query
-    ).select_related('author', 'category')[:5]
-
-    # Search in events
-    event_results = Event.objects.filter(
-        published=True,
-        title__icontains=query
-    ).select_related('author')[:5]
-
-    blog_serializer = BlogPostListSerializer(blog_results, many=True)
-    event_serializer = EventListSerializer(event_results, many=True)
+    backend = get_search_backend()
+
+    # Ranked ids from the full-text index, then one query per content type;
+    # the published/active filters guard against documents not yet refreshed
+    blog_results = ranked(
+        BlogPost.objects.filter(published=True).select_related('author', 'category').prefetch_related('tags'),
+        backend.search(query, 'blog')
+    )
+    event_results = ranked(
+        Event.objects.filter(published=True).select_related('author'),
+        backend.search(query, 'event')
+    )
+    announcement_results = ranked(
+        Announcement.objects.filter(is_active=True),
+        backend.search(query, 'announcement')
+    )
+    newsletter_results = ranked(
+        NewsletterArchive.objects.all(),
+        backend.search(query, 'newsletter')
+    )
 
     return Response({
-        'blogs': blog_serializer.data,
-        'events': event_serializer.data
+        'blogs': BlogPostListSerializer(blog_results, many=True).data,
+        'events': EventListSerializer(event_results, many=True).data,
+        'announcements': AnnouncementSerializer(announcement_results, many=True).data,
+        'newsletters': NewsletterArchiveSerializer(newsletter_results, many=True).data
     })
 
 
 # Announcement Views
-class AnnouncementListView(generics.ListAPIView):
+class AnnouncementListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_models = (Announcement,)
     serializer_class = AnnouncementSerializer
 
     def get_queryset(self):
@@ -203,12 +339,14 @@ class AnnouncementListView(generics.ListAPIView):
 
 
 # Carousel Views
-class CarouselImageListView(generics.ListAPIView):
+class CarouselImageListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_models = (CarouselImage, ImageDerivative)
     serializer_class = CarouselImageSerializer
     queryset = CarouselImage.objects.filter(is_active=True)
 
 
 # Newsletter Archive Views
-class NewsletterArchiveListView(generics.ListAPIView):
+class NewsletterArchiveListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_models = (NewsletterArchive,)
     serializer_class = NewsletterArchiveSerializer
     queryset = NewsletterArchive.objects.all()
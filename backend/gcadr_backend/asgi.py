@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gcadr_backend.settings')
+# Route the public read endpoints to their async variants (core.async_views)
+os.environ.setdefault('ASYNC_API', 'True')
 
 application = get_asgi_application()
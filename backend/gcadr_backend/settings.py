@@ -135,6 +135,15 @@ else:
             }
         }
 
+# Set by gcadr_backend/asgi.py: serve the public read endpoints with the
+# async views (core.async_views). Each ASGI request runs its database work
+# on its own thread, so persistent connections would pile up; close them
+# after every request instead. That makes every request open a connection,
+# which is why the deploy configs run gunicorn (WSGI) by default
+ASYNC_API = config('ASYNC_API', default=False, cast=bool)
+if ASYNC_API:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -167,6 +176,38 @@ USE_I18N = True
 USE_TZ = True
 
 
+# Responsive image variants (core.images): widths generated for every
+# uploaded image, and whether saving a model generates them right away
+IMAGE_DERIVATIVE_WIDTHS = [320, 640, 1024, 1600]
+IMAGE_DERIVATIVES_ON_SAVE = config('IMAGE_DERIVATIVES_ON_SAVE', default=True, cast=bool)
+
+# Content edits queue an incremental static export (core.autobuild) that runs
+# once edits have been quiet for AUTO_REBUILD_DELAY seconds, and at most
+# AUTO_REBUILD_MAX_DELAY seconds after the first of them
+AUTO_REBUILD_STATIC_CONTENT = config('AUTO_REBUILD_STATIC_CONTENT', default=True, cast=bool)
+AUTO_REBUILD_DELAY = config('AUTO_REBUILD_DELAY', default=10, cast=int)
+AUTO_REBUILD_MAX_DELAY = config('AUTO_REBUILD_MAX_DELAY', default=120, cast=int)
+
+# Where export_static_content writes the static API by default
+STATIC_EXPORT_DIR = config('STATIC_EXPORT_DIR', default=str(BASE_DIR.parent / 'public' / 'api'))
+
+# Files sent with the contact and internship forms (core.uploads) are
+# streamed to disk, capped at UPLOAD_MAX_SIZE bytes each and, with
+# STAGE_UPLOADS on, kept in the database until a job worker copies them to
+# media storage
+STAGE_UPLOADS = config('STAGE_UPLOADS', default=True, cast=bool)
+UPLOAD_MAX_SIZE = config('UPLOAD_MAX_SIZE', default=10 * 1024 * 1024, cast=int)
+
+# Direct-to-storage uploads (core.direct_uploads): dotted path to the backend
+# issuing upload URLs, empty picks presigned S3 URLs when media is on S3 and
+# the app's own local_upload view otherwise; URLs expire after
+# DIRECT_UPLOAD_EXPIRY seconds. Presigning is limited to DIRECT_UPLOAD_RATE
+# per user or client address, counted in the default cache (per process
+# unless SHARED_CACHE)
+DIRECT_UPLOAD_BACKEND = config('DIRECT_UPLOAD_BACKEND', default='')
+DIRECT_UPLOAD_EXPIRY = config('DIRECT_UPLOAD_EXPIRY', default=15 * 60, cast=int)
+DIRECT_UPLOAD_RATE = config('DIRECT_UPLOAD_RATE', default='30/hour')
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
@@ -224,6 +265,48 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20
 }
 
+# Search backend (dotted path to a core.search.backends class); empty picks
+# Postgres tsvector or SQLite FTS5 based on the database in use. Migrations
+# install that database index whatever this says, and rebuild_search_index
+# reinstalls it if missing, so this can be changed without migrating
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='')
+
+# Static inverted index written by export_static_content, used by
+# core.search.backends.InvertedIndexSearchBackend
+STATIC_SEARCH_INDEX_DIR = config('STATIC_SEARCH_INDEX_DIR', default=str(BASE_DIR.parent / 'public' / 'api' / 'search'))
+
+# Cache used for API responses and their model generations. Every web and
+# job worker process must see the same generations, so it has to be shared:
+# a database table (CACHE_TABLE, created by `manage.py createcachetable`) or
+# a directory on a volume all processes mount (CACHE_DIR). Per-process
+# memory is the fallback, with the response cache off unless asked for
+CACHE_TABLE = config('CACHE_TABLE', default='')
+CACHE_DIR = config('CACHE_DIR', default='')
+if CACHE_TABLE:
+    CACHE_BACKEND, CACHE_LOCATION = 'django.core.cache.backends.db.DatabaseCache', CACHE_TABLE
+elif CACHE_DIR:
+    CACHE_BACKEND, CACHE_LOCATION = 'django.core.cache.backends.filebased.FileBasedCache', CACHE_DIR
+else:
+    CACHE_BACKEND, CACHE_LOCATION = 'django.core.cache.backends.locmem.LocMemCache', 'gcadr-default'
+SHARED_CACHE = bool(CACHE_TABLE or CACHE_DIR)
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': CACHE_LOCATION,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+# Responses of the public read endpoints are cached per model generation
+# (see core.response_cache); 0 disables the cache
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=60 * 60 * 24 if SHARED_CACHE else 0, cast=int)
+
+# Cache-Control for the read endpoints (core.conditional): browsers and the
+# frontend reuse a response for max-age, then serve it stale while revalidating
+API_CACHE_MAX_AGE = config('API_CACHE_MAX_AGE', default=60, cast=int)
+API_STALE_WHILE_REVALIDATE = config('API_STALE_WHILE_REVALIDATE', default=600, cast=int)
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
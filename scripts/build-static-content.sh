@@ -116,20 +116,15 @@ if [ -d "../$CONTENT_DIR/config" ]; then
     python manage.py import_config_data --content-dir="../$CONTENT_DIR/config"
 fi
 
-# Export static content
-print_status "Exporting dynamic content to static JSON files..."
-python manage.py export_static_content --output-dir="../$API_DIR"
-
-# Copy media files from content directory
-print_status "Copying media files..."
-if [ -d "../$CONTENT_DIR/media" ]; then
-    cp -r "../$CONTENT_DIR/media/"* "../$MEDIA_DIR/" 2>/dev/null || true
-fi
+# Resized variants for uploaded images that do not have them yet
+print_status "Generating responsive image variants..."
+python manage.py generate_image_derivatives
 
-# Copy any existing backend media files
-if [ -d "media" ]; then
-    cp -r media/* "../$MEDIA_DIR/" 2>/dev/null || true
-fi
+# Export static content and sync media (content media first, backend uploads win)
+print_status "Exporting dynamic content to static JSON files..."
+python manage.py export_static_content --output-dir="../$API_DIR" \
+    --media-source="../$CONTENT_DIR/media" \
+    --media-source="media"
 
 # Return to root directory
 cd ..
@@ -145,58 +140,8 @@ cat > "$PUBLIC_DIR/build-info.json" << EOF
 }
 EOF
 
-# Create a simple API status endpoint
-cat > "$API_DIR/status.json" << EOF
-{
-  "status": "static",
-  "message": "Using static content files",
-  "build_date": "$(date -u +"%Y-%m-%dT%H:%M:%SZ")",
-  "endpoints": [
-    "/api/blogs.json",
-    "/api/team.json",
-    "/api/leadership.json",
-    "/api/announcements.json",
-    "/api/carousel.json",
-    "/api/galleries.json",
-    "/api/newsletters.json"
-  ]
-}
-EOF
-
-# Generate a content manifest
-print_status "Generating content manifest..."
-cat > "$API_DIR/manifest.json" << EOF
-{
-  "version": "1.0.0",
-  "generated": "$(date -u +"%Y-%m-%dT%H:%M:%SZ")",
-  "content_types": {
-    "blogs": {
-      "file": "blogs.json",
-      "individual_files": true,
-      "directory": "blogs/"
-    },
-    "team": {
-      "file": "team.json"
-    },
-    "leadership": {
-      "file": "leadership.json"
-    },
-    "announcements": {
-      "file": "announcements.json"
-    },
-    "carousel": {
-      "file": "carousel.json"
-    },
-    "galleries": {
-      "file": "galleries.json"
-    },
-    "newsletters": {
-      "file": "newsletters.json"
-    }
-  },
-  "media_directory": "/media/"
-}
-EOF
+# status.json and manifest.json (per-file hashes, sizes and record counts)
+# are generated by export_static_content above
 
 print_success "✅ Static content build completed successfully!"
 print_status "📁 Generated files:"